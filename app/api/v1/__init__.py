@@ -3,10 +3,20 @@ from fastapi import APIRouter
 from app.api.v1.auth import router as auth_router
 from app.api.v1.business import router as business_router
 from app.api.v1.delivery import router as delivery_router
+from app.api.v1.orders import router as orders_router
+from app.api.v1.payout import router as payout_router
+from app.api.v1.pricing import router as pricing_router
 from app.api.v1.products import router as products_router
+from app.api.v1.receipts import router as receipts_router
+from app.api.v1.webhooks import router as webhooks_router
 
 router = APIRouter(prefix="/api/v1", tags=["v1"])
 router.include_router(auth_router)
 router.include_router(business_router)
 router.include_router(products_router)
 router.include_router(delivery_router)
+router.include_router(payout_router)
+router.include_router(pricing_router)
+router.include_router(orders_router)
+router.include_router(receipts_router)
+router.include_router(webhooks_router)
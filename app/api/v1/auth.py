@@ -7,8 +7,7 @@ from sqlmodel import Session
 from app.core.auth import get_current_user
 from app.core.db import get_session
 from app.core.security import create_access_token
-from app.models.user import User
-from app.services.auth_service import authenticate_user, get_user_with_business, register_business_owner
+from app.services.auth_service import Principal, authenticate_user_async, register_business_owner_async
 
 router = APIRouter(tags=["auth"])
 
@@ -36,8 +35,8 @@ class MeResponse(BaseModel):
 
 
 @router.post("/auth/register", response_model=TokenResponse)
-def register(payload: RegisterRequest, session: Session = Depends(get_session)) -> TokenResponse:
-    user, _business = register_business_owner(
+async def register(payload: RegisterRequest, session: Session = Depends(get_session)) -> TokenResponse:
+    user, _business = await register_business_owner_async(
         session,
         business_name=payload.business_name,
         store_code=payload.store_code,
@@ -49,26 +48,25 @@ def register(payload: RegisterRequest, session: Session = Depends(get_session))
 
 
 @router.post("/auth/login", response_model=TokenResponse)
-def login(payload: LoginRequest, session: Session = Depends(get_session)) -> TokenResponse:
-    user = authenticate_user(session, email=payload.email, password=payload.password)
+async def login(payload: LoginRequest, session: Session = Depends(get_session)) -> TokenResponse:
+    user = await authenticate_user_async(session, email=payload.email, password=payload.password)
     token = create_access_token(user_id=user.id, business_id=user.business_id)
     return TokenResponse(access_token=token)
 
 
 @router.get("/me", response_model=MeResponse)
-def me(current_user: Annotated[User, Depends(get_current_user)], session: Session = Depends(get_session)) -> MeResponse:
-    user, business = get_user_with_business(session, user_id=current_user.id)
+def me(current_user: Annotated[Principal, Depends(get_current_user)]) -> MeResponse:
     return MeResponse(
         user={
-            "id": user.id,
-            "email": user.email,
-            "role": user.role,
-            "business_id": user.business_id,
+            "id": current_user.user_id,
+            "email": current_user.email,
+            "role": current_user.role,
+            "business_id": current_user.business_id,
         },
         business={
-            "id": business.id,
-            "name": business.name,
-            "store_code": business.store_code,
-            "currency": business.currency,
+            "id": current_user.business_id,
+            "name": current_user.business_name,
+            "store_code": current_user.store_code,
+            "currency": current_user.currency,
         },
     )
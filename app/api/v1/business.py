@@ -3,10 +3,12 @@ from typing import Annotated
 from fastapi import APIRouter, Depends
 from pydantic import BaseModel, Field
 from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from app.core.auth import get_current_business_id
-from app.core.db import get_session
-from app.services.business_service import get_business, patch_business
+from app.core.auth import get_current_business_id, get_current_business_id_async
+from app.core.config import get_settings
+from app.core.db import get_async_session, get_session
+from app.services.business_service import get_business, get_business_async, patch_business
 
 router = APIRouter(tags=["business"])
 
@@ -23,7 +25,6 @@ class BusinessPatchRequest(BaseModel):
     store_code: str | None = None
 
 
-@router.get("/business", response_model=BusinessResponse)
 def get_business_endpoint(
     session: Session = Depends(get_session),
     business_id: int = Depends(get_current_business_id),
@@ -37,6 +38,24 @@ def get_business_endpoint(
     )
 
 
+async def get_business_endpoint_async(
+    session: AsyncSession = Depends(get_async_session),
+    business_id: int = Depends(get_current_business_id_async),
+) -> BusinessResponse:
+    business = await get_business_async(session, business_id=business_id)
+    return BusinessResponse(
+        id=business.id,
+        name=business.name,
+        store_code=business.store_code,
+        currency=business.currency,
+    )
+
+
+router.get("/business", response_model=BusinessResponse)(
+    get_business_endpoint_async if get_settings().db_async_reads else get_business_endpoint
+)
+
+
 @router.patch("/business", response_model=BusinessResponse)
 def patch_business_endpoint(
     payload: BusinessPatchRequest,
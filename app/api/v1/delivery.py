@@ -1,12 +1,17 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Header, Query, Response
 from pydantic import BaseModel, Field
 from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from app.core.auth import get_current_business_id
-from app.core.db import get_session
+from app.core.auth import get_current_business_id, get_current_business_id_async
+from app.core.config import get_settings
+from app.core.db import get_async_session, get_session
+from app.core.http_cache import etag_matches, listing_headers
+from app.core.pagination import MAX_PAGE_SIZE
 from app.services.delivery_service import (
     create_delivery_zone_service,
     list_delivery_zones_service,
+    list_delivery_zones_service_async,
     soft_delete_delivery_zone_service,
     update_delivery_zone_service,
 )
@@ -50,13 +55,41 @@ def create_delivery_zone_endpoint(
     return _to_response(zone)
 
 
-@router.get("/delivery-zones", response_model=list[DeliveryZoneResponse])
 def list_delivery_zones_endpoint(
+    response: Response,
+    cursor: str | None = None,
+    limit: int | None = Query(default=None, ge=1, le=MAX_PAGE_SIZE),
+    if_none_match: str | None = Header(default=None),
     session: Session = Depends(get_session),
     business_id: int = Depends(get_current_business_id),
-) -> list[DeliveryZoneResponse]:
-    zones = list_delivery_zones_service(session, business_id=business_id)
-    return [_to_response(zone) for zone in zones]
+) -> list[DeliveryZoneResponse] | Response:
+    page = list_delivery_zones_service(session, business_id=business_id, cursor=cursor, limit=limit)
+    headers = listing_headers(page.etag, page.next_cursor)
+    if etag_matches(if_none_match, page.etag):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return [_to_response(zone) for zone in page.items]
+
+
+async def list_delivery_zones_endpoint_async(
+    response: Response,
+    cursor: str | None = None,
+    limit: int | None = Query(default=None, ge=1, le=MAX_PAGE_SIZE),
+    if_none_match: str | None = Header(default=None),
+    session: AsyncSession = Depends(get_async_session),
+    business_id: int = Depends(get_current_business_id_async),
+) -> list[DeliveryZoneResponse] | Response:
+    page = await list_delivery_zones_service_async(session, business_id=business_id, cursor=cursor, limit=limit)
+    headers = listing_headers(page.etag, page.next_cursor)
+    if etag_matches(if_none_match, page.etag):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return [_to_response(zone) for zone in page.items]
+
+
+router.get("/delivery-zones", response_model=list[DeliveryZoneResponse])(
+    list_delivery_zones_endpoint_async if get_settings().db_async_reads else list_delivery_zones_endpoint
+)
 
 
 @router.patch("/delivery-zones/{zone_id}", response_model=DeliveryZoneResponse)
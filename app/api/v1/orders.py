@@ -0,0 +1,97 @@
+from datetime import datetime
+from functools import partial
+
+from fastapi import APIRouter, BackgroundTasks, Depends
+from pydantic import BaseModel, Field
+from sqlmodel import Session
+
+from app.api.v1.pricing import CartLineRequest
+from app.core.auth import get_current_business_id
+from app.core.config import get_settings
+from app.core.db import get_session
+from app.services.order_service import reserve_order
+from app.services.payment_service import pay_order_service, preinitialize_payment
+from app.services.pricing_service import CartLine
+
+router = APIRouter(tags=["orders"])
+
+
+class OrderReserveRequest(BaseModel):
+    channel_type: str = Field(pattern="^(telegram|whatsapp)$")
+    channel_user_id: str = Field(min_length=1)
+    display_name: str | None = None
+    items: list[CartLineRequest] = Field(min_length=1, max_length=200)
+    delivery_zone_id: int | None = None
+    delivery_address: str | None = None
+
+
+class OrderReserveResponse(BaseModel):
+    order_id: int
+    customer_id: int
+    status: str
+    expires_at: datetime
+    subtotal_kobo: int
+    delivery_fee_kobo: int
+    total_kobo: int
+    platform_fee_kobo: int
+    business_payout_kobo: int
+
+
+class OrderPayResponse(BaseModel):
+    order_id: int
+    reference: str
+    authorization_url: str
+    preinitialized: bool
+
+
+@router.post("/orders/reserve", response_model=OrderReserveResponse)
+def reserve_order_endpoint(
+    payload: OrderReserveRequest,
+    background_tasks: BackgroundTasks,
+    session: Session = Depends(get_session),
+    business_id: int = Depends(get_current_business_id),
+) -> OrderReserveResponse:
+    order = reserve_order(
+        session,
+        business_id=business_id,
+        channel_type=payload.channel_type,
+        channel_user_id=payload.channel_user_id,
+        display_name=payload.display_name,
+        items=[CartLine(product_id=item.product_id, quantity=item.quantity) for item in payload.items],
+        delivery_zone_id=payload.delivery_zone_id,
+        delivery_address=payload.delivery_address,
+    )
+    if get_settings().payment_preinit_enabled:
+        # Runs after the response; the request session is closed by then.
+        background_tasks.add_task(
+            preinitialize_payment,
+            partial(Session, session.get_bind()),
+            business_id=business_id,
+            order_id=order.order_id,
+        )
+    return OrderReserveResponse(
+        order_id=order.order_id,
+        customer_id=order.customer_id,
+        status=order.status,
+        expires_at=order.expires_at,
+        subtotal_kobo=order.quote.subtotal_kobo,
+        delivery_fee_kobo=order.quote.delivery_fee_kobo,
+        total_kobo=order.quote.total_kobo,
+        platform_fee_kobo=order.quote.platform_fee_kobo,
+        business_payout_kobo=order.quote.business_payout_kobo,
+    )
+
+
+@router.post("/orders/{order_id}/pay", response_model=OrderPayResponse)
+async def pay_order_endpoint(
+    order_id: int,
+    session: Session = Depends(get_session),
+    business_id: int = Depends(get_current_business_id),
+) -> OrderPayResponse:
+    link = await pay_order_service(session, business_id=business_id, order_id=order_id)
+    return OrderPayResponse(
+        order_id=link.order_id,
+        reference=link.reference,
+        authorization_url=link.authorization_url,
+        preinitialized=link.preinitialized,
+    )
@@ -0,0 +1,89 @@
+from datetime import datetime
+
+from fastapi import APIRouter, Depends
+from fastapi.concurrency import run_in_threadpool
+from pydantic import BaseModel, Field
+from sqlmodel import Session
+
+from app.core.auth import get_current_business_id
+from app.core.config import get_settings
+from app.core.db import get_session
+from app.models.payout_profile import PAYOUT_STATUS_PENDING
+from app.services.payout_service import (
+    get_payout_status_service,
+    provision_payout_inline,
+    request_payout_setup_service,
+)
+
+router = APIRouter(tags=["payout"])
+
+
+class PayoutSetupRequest(BaseModel):
+    # Paystack settlement bank code, e.g. "058".
+    bank_name: str = Field(min_length=1)
+    account_number: str = Field(pattern=r"^\d{10}$")
+    account_name: str = Field(min_length=1)
+
+
+class PayoutStatusResponse(BaseModel):
+    bank_name: str
+    account_number: str
+    account_name: str
+    status: str
+    paystack_subaccount_code: str | None
+    attempts: int
+    next_attempt_at: datetime | None
+    last_error: str | None
+
+
+def _to_response(profile) -> PayoutStatusResponse:
+    return PayoutStatusResponse(
+        bank_name=profile.bank_name,
+        account_number=profile.account_number,
+        account_name=profile.account_name,
+        status=profile.status,
+        paystack_subaccount_code=profile.paystack_subaccount_code,
+        attempts=profile.attempts,
+        next_attempt_at=profile.next_attempt_at,
+        last_error=profile.last_error,
+    )
+
+
+async def _provision_unless_worker_runs(session: Session, business_id: int) -> None:
+    # Nothing else provisions pending profiles, so the business's own setup
+    # and status requests do; a retry waits for its backoff like the worker's.
+    if get_settings().payout_provisioning_enabled:
+        return
+    bind = session.get_bind()
+    await provision_payout_inline(lambda: Session(bind), business_id)
+    session.expire_all()
+
+
+@router.post("/payout/setup", response_model=PayoutStatusResponse, status_code=202)
+async def payout_setup_endpoint(
+    payload: PayoutSetupRequest,
+    session: Session = Depends(get_session),
+    business_id: int = Depends(get_current_business_id),
+) -> PayoutStatusResponse:
+    await run_in_threadpool(
+        request_payout_setup_service,
+        session,
+        business_id=business_id,
+        bank_name=payload.bank_name,
+        account_number=payload.account_number,
+        account_name=payload.account_name,
+    )
+    await _provision_unless_worker_runs(session, business_id)
+    return _to_response(await run_in_threadpool(get_payout_status_service, session, business_id=business_id))
+
+
+@router.get("/payout/status", response_model=PayoutStatusResponse)
+async def payout_status_endpoint(
+    session: Session = Depends(get_session),
+    business_id: int = Depends(get_current_business_id),
+) -> PayoutStatusResponse:
+    profile = await run_in_threadpool(get_payout_status_service, session, business_id=business_id)
+    if profile.status == PAYOUT_STATUS_PENDING:
+        await _provision_unless_worker_runs(session, business_id)
+        profile = await run_in_threadpool(get_payout_status_service, session, business_id=business_id)
+    return _to_response(profile)
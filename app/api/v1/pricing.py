@@ -0,0 +1,67 @@
+from fastapi import APIRouter, Depends
+from pydantic import BaseModel, Field
+from sqlmodel import Session
+
+from app.core.auth import get_current_business_id
+from app.core.db import get_session
+from app.services.pricing_service import MAX_LINE_QUANTITY, CartLine, quote_cart
+
+router = APIRouter(tags=["pricing"])
+
+
+class CartLineRequest(BaseModel):
+    product_id: int
+    quantity: int = Field(ge=1, le=MAX_LINE_QUANTITY)
+
+
+class QuoteRequest(BaseModel):
+    items: list[CartLineRequest] = Field(min_length=1, max_length=200)
+    delivery_zone_id: int | None = None
+
+
+class QuoteLineResponse(BaseModel):
+    product_id: int
+    name: str
+    unit_price_kobo: int
+    quantity: int
+    line_total_kobo: int
+
+
+class QuoteResponse(BaseModel):
+    lines: list[QuoteLineResponse]
+    subtotal_kobo: int
+    delivery_fee_kobo: int
+    total_kobo: int
+    platform_fee_kobo: int
+    business_payout_kobo: int
+
+
+@router.post("/pricing/quote", response_model=QuoteResponse)
+def quote_endpoint(
+    payload: QuoteRequest,
+    session: Session = Depends(get_session),
+    business_id: int = Depends(get_current_business_id),
+) -> QuoteResponse:
+    quote = quote_cart(
+        session,
+        business_id=business_id,
+        items=[CartLine(product_id=item.product_id, quantity=item.quantity) for item in payload.items],
+        delivery_zone_id=payload.delivery_zone_id,
+    )
+    return QuoteResponse(
+        lines=[
+            QuoteLineResponse(
+                product_id=line.product_id,
+                name=line.name,
+                unit_price_kobo=line.unit_price_kobo,
+                quantity=line.quantity,
+                line_total_kobo=line.line_total_kobo,
+            )
+            for line in quote.lines
+        ],
+        subtotal_kobo=quote.subtotal_kobo,
+        delivery_fee_kobo=quote.delivery_fee_kobo,
+        total_kobo=quote.total_kobo,
+        platform_fee_kobo=quote.platform_fee_kobo,
+        business_payout_kobo=quote.business_payout_kobo,
+    )
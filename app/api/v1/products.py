@@ -1,12 +1,30 @@
-from fastapi import APIRouter, Depends, UploadFile
+from contextlib import aclosing
+
+from fastapi import APIRouter, Depends, Header, Query, Request, Response
+from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel, Field
 from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
+from starlette.datastructures import UploadFile
+from starlette.formparsers import MultiPartException, MultiPartParser
 
-from app.core.auth import get_current_business_id
-from app.core.db import get_session
+from app.core.auth import get_current_business_id, get_current_business_id_async
+from app.core.config import get_settings
+from app.core.db import get_async_session, get_session
+from app.core.errors import PayloadTooLargeError, ValidationError
+from app.core.http_cache import etag_matches, listing_headers
+from app.core.pagination import MAX_PAGE_SIZE
+from app.core.streams import capped_stream
+from app.services.product_import_service import import_products_stream_service
+from app.services.image_derivative_service import derivative_urls
 from app.services.product_service import (
+    ProductSnapshot,
+    batch_update_products_service,
+    complete_product_image_upload_service,
     create_product_service,
     list_products_service,
+    list_products_service_async,
+    presign_product_image_upload_service,
     soft_delete_product_service,
     update_product_service,
     upload_product_image_service,
@@ -29,6 +47,16 @@ class ProductPatchRequest(BaseModel):
     image_url: str | None = None
 
 
+class ProductBatchPatchItem(ProductPatchRequest):
+    id: int
+    price_change_percent: int | None = Field(default=None, ge=-100, le=1000)
+    is_active: bool | None = None
+
+
+class ProductBatchPatchRequest(BaseModel):
+    items: list[ProductBatchPatchItem] = Field(min_length=1, max_length=1000)
+
+
 class ProductResponse(BaseModel):
     id: int
     name: str
@@ -36,12 +64,35 @@ class ProductResponse(BaseModel):
     base_price_kobo: int
     image_url: str | None
     is_active: bool
+    image_variants: dict[str, str] = Field(default_factory=dict)
 
 
 class ProductImageUploadResponse(BaseModel):
     image_url: str
 
 
+class PresignedImageUploadResponse(BaseModel):
+    key: str
+    url: str
+    fields: dict[str, str]
+    expires_in_seconds: int
+
+
+class CompleteImageUploadRequest(BaseModel):
+    key: str
+
+
+class ProductImportRowError(BaseModel):
+    row: int
+    message: str
+
+
+class ProductImportResponse(BaseModel):
+    created: int
+    failed: int
+    errors: list[ProductImportRowError]
+
+
 def _to_response(product) -> ProductResponse:
     return ProductResponse(
         id=product.id,
@@ -50,6 +101,11 @@ def _to_response(product) -> ProductResponse:
         base_price_kobo=product.base_price_kobo,
         image_url=product.image_url,
         is_active=product.is_active,
+        image_variants=(
+            product.image_variants
+            if isinstance(product, ProductSnapshot)
+            else derivative_urls(product.image_url)
+        ),
     )
 
 
@@ -70,12 +126,73 @@ def create_product_endpoint(
     return _to_response(product)
 
 
-@router.get("/products", response_model=list[ProductResponse])
 def list_products_endpoint(
+    response: Response,
+    cursor: str | None = None,
+    limit: int | None = Query(default=None, ge=1, le=MAX_PAGE_SIZE),
+    if_none_match: str | None = Header(default=None),
+    session: Session = Depends(get_session),
+    business_id: int = Depends(get_current_business_id),
+) -> list[ProductResponse] | Response:
+    page = list_products_service(session, business_id=business_id, cursor=cursor, limit=limit)
+    headers = listing_headers(page.etag, page.next_cursor)
+    if etag_matches(if_none_match, page.etag):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return [_to_response(product) for product in page.items]
+
+
+async def list_products_endpoint_async(
+    response: Response,
+    cursor: str | None = None,
+    limit: int | None = Query(default=None, ge=1, le=MAX_PAGE_SIZE),
+    if_none_match: str | None = Header(default=None),
+    session: AsyncSession = Depends(get_async_session),
+    business_id: int = Depends(get_current_business_id_async),
+) -> list[ProductResponse] | Response:
+    page = await list_products_service_async(session, business_id=business_id, cursor=cursor, limit=limit)
+    headers = listing_headers(page.etag, page.next_cursor)
+    if etag_matches(if_none_match, page.etag):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return [_to_response(product) for product in page.items]
+
+
+router.get("/products", response_model=list[ProductResponse])(
+    list_products_endpoint_async if get_settings().db_async_reads else list_products_endpoint
+)
+
+
+@router.post("/products/import", response_model=ProductImportResponse)
+async def import_products_endpoint(
+    request: Request,
+    session: Session = Depends(get_session),
+    business_id: int = Depends(get_current_business_id),
+) -> ProductImportResponse:
+    report = await import_products_stream_service(
+        session,
+        business_id=business_id,
+        body=request.stream(),
+        content_type=request.headers.get("content-type"),
+    )
+    return ProductImportResponse(
+        created=report.created,
+        failed=report.failed,
+        errors=[ProductImportRowError(row=error.row, message=error.message) for error in report.errors],
+    )
+
+
+@router.patch("/products", response_model=list[ProductResponse])
+def batch_patch_products_endpoint(
+    payload: ProductBatchPatchRequest,
     session: Session = Depends(get_session),
     business_id: int = Depends(get_current_business_id),
 ) -> list[ProductResponse]:
-    products = list_products_service(session, business_id=business_id)
+    products = batch_update_products_service(
+        session,
+        business_id=business_id,
+        changes=[item.model_dump(exclude_none=True) for item in payload.items],
+    )
     return [_to_response(product) for product in products]
 
 
@@ -108,10 +225,79 @@ def delete_product_endpoint(
     return {"ok": True}
 
 
-@router.post("/uploads/product-image", response_model=ProductImageUploadResponse)
-def upload_product_image_endpoint(
-    file: UploadFile,
-    _business_id: int = Depends(get_current_business_id),
+# Multipart slack allowed on top of max_upload_bytes before a declared
+# Content-Length is refused outright.
+UPLOAD_ENVELOPE_BYTES = 16 * 1024
+
+
+@router.post(
+    "/uploads/product-image",
+    response_model=ProductImageUploadResponse,
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                "multipart/form-data": {
+                    "schema": {
+                        "type": "object",
+                        "required": ["file"],
+                        "properties": {"file": {"type": "string", "format": "binary"}},
+                    }
+                }
+            },
+        }
+    },
+)
+async def upload_product_image_endpoint(
+    request: Request,
+    content_length: int | None = Header(default=None),
+    session: Session = Depends(get_session),
+    business_id: int = Depends(get_current_business_id),
+) -> ProductImageUploadResponse:
+    # Declaring ``file: UploadFile`` would make FastAPI spool the whole body
+    # before this handler (or any dependency) runs, so the form is parsed here,
+    # from a body that stops being read once it passes the limit; a declared
+    # Content-Length that is already too large is refused without reading.
+    max_bytes = get_settings().max_upload_bytes
+    too_large = f"Upload exceeds {max_bytes} bytes"
+    if content_length is not None and content_length > max_bytes + UPLOAD_ENVELOPE_BYTES:
+        raise PayloadTooLargeError(message=too_large)
+    if not request.headers.get("content-type", "").lower().startswith("multipart/form-data"):
+        raise ValidationError(message="file is required")
+
+    async with aclosing(capped_stream(request.stream(), max_bytes + UPLOAD_ENVELOPE_BYTES, too_large)) as body:
+        try:
+            form = await MultiPartParser(request.headers, body, max_files=1).parse()
+        except MultiPartException as exc:
+            raise ValidationError(message=exc.message) from exc
+    try:
+        file = form.get("file")
+        if not isinstance(file, UploadFile):
+            raise ValidationError(message="file is required")
+        image_url = await run_in_threadpool(upload_product_image_service, session, file.file, business_id)
+    finally:
+        await form.close()
+    return ProductImageUploadResponse(image_url=image_url)
+
+
+@router.post("/uploads/product-image/presign", response_model=PresignedImageUploadResponse)
+def presign_product_image_upload_endpoint(
+    business_id: int = Depends(get_current_business_id),
+) -> PresignedImageUploadResponse:
+    upload = presign_product_image_upload_service(business_id)
+    return PresignedImageUploadResponse(
+        key=upload.key,
+        url=upload.presigned.url,
+        fields=upload.presigned.fields,
+        expires_in_seconds=upload.expires_in_seconds,
+    )
+
+
+@router.post("/uploads/product-image/complete", response_model=ProductImageUploadResponse)
+def complete_product_image_upload_endpoint(
+    payload: CompleteImageUploadRequest,
+    session: Session = Depends(get_session),
+    business_id: int = Depends(get_current_business_id),
 ) -> ProductImageUploadResponse:
-    image_url = upload_product_image_service(file)
+    image_url = complete_product_image_upload_service(session, business_id=business_id, key=payload.key)
     return ProductImageUploadResponse(image_url=image_url)
@@ -0,0 +1,25 @@
+from fastapi import APIRouter, Depends
+from pydantic import BaseModel
+from sqlmodel import Session
+
+from app.core.auth import get_current_business_id
+from app.core.db import get_session
+from app.services.receipt_service import get_receipt_service
+
+router = APIRouter(tags=["receipts"])
+
+
+class ReceiptResponse(BaseModel):
+    order_id: int
+    receipt_number: str
+    pdf_url: str
+
+
+@router.get("/receipts/{order_id}", response_model=ReceiptResponse)
+async def receipt_endpoint(
+    order_id: int,
+    session: Session = Depends(get_session),
+    business_id: int = Depends(get_current_business_id),
+) -> ReceiptResponse:
+    receipt = await get_receipt_service(session, business_id=business_id, order_id=order_id)
+    return ReceiptResponse(order_id=receipt.order_id, receipt_number=receipt.receipt_number, pdf_url=receipt.pdf_url)
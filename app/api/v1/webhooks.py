@@ -0,0 +1,39 @@
+from functools import partial
+
+from fastapi import APIRouter, Depends, Request
+from fastapi.concurrency import run_in_threadpool
+from sqlmodel import Session
+
+from app.core.config import get_settings
+from app.core.db import get_session
+from app.core.errors import ServiceUnavailableError
+from app.services.paystack_service import PAYSTACK_SIGNATURE_HEADER
+from app.services.receipt_service import schedule_receipt
+from app.services.webhook_inbox_service import drain_webhook_inbox_inline, receive_paystack_webhook
+
+router = APIRouter(tags=["webhooks"])
+
+
+@router.post("/webhooks/paystack")
+async def paystack_webhook(request: Request, session: Session = Depends(get_session)) -> dict[str, bool]:
+    # The signature covers the bytes exactly as sent, so the body is read raw
+    # rather than through a Pydantic model.
+    raw_body = await request.body()
+    await run_in_threadpool(
+        receive_paystack_webhook,
+        session,
+        raw_body,
+        request.headers.get(PAYSTACK_SIGNATURE_HEADER),
+    )
+    if not get_settings().webhook_inbox_enabled:
+        # Nothing else drains the inbox, so settle before acknowledging. A 503
+        # makes Paystack redeliver, and each redelivery drains the retry again.
+        bind = session.get_bind()
+        result = await run_in_threadpool(
+            drain_webhook_inbox_inline,
+            session,
+            partial(schedule_receipt, lambda: Session(bind)),
+        )
+        if result.retried:
+            raise ServiceUnavailableError(message="Webhook stored but not applied yet, retry shortly")
+    return {"ok": True}
@@ -3,28 +3,42 @@ from typing import Annotated
 from fastapi import Depends
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from app.core.db import get_session
+from app.core.db import get_async_session, get_session
 from app.core.errors import AuthError
 from app.core.security import decode_access_token
-from app.models.user import User
-from app.services.auth_service import get_user_with_business
+from app.services.auth_service import Principal, get_principal, get_principal_async
 
 bearer_scheme = HTTPBearer(auto_error=False)
 
 
 SessionDep = Annotated[Session, Depends(get_session)]
+AsyncSessionDep = Annotated[AsyncSession, Depends(get_async_session)]
 BearerDep = Annotated[HTTPAuthorizationCredentials | None, Depends(bearer_scheme)]
 
 
-def get_current_user(session: SessionDep, credentials: BearerDep) -> User:
+def get_current_user(session: SessionDep, credentials: BearerDep) -> Principal:
     if credentials is None:
         raise AuthError(message="Authentication required")
 
     payload = decode_access_token(credentials.credentials)
-    user, _ = get_user_with_business(session, user_id=int(payload["user_id"]))
-    return user
+    return get_principal(session, user_id=int(payload["user_id"]))
 
 
-def get_current_business_id(current_user: Annotated[User, Depends(get_current_user)]) -> int:
+def get_current_business_id(current_user: Annotated[Principal, Depends(get_current_user)]) -> int:
+    return current_user.business_id
+
+
+async def get_current_user_async(session: AsyncSessionDep, credentials: BearerDep) -> Principal:
+    if credentials is None:
+        raise AuthError(message="Authentication required")
+
+    payload = decode_access_token(credentials.credentials)
+    return await get_principal_async(session, user_id=int(payload["user_id"]))
+
+
+async def get_current_business_id_async(
+    current_user: Annotated[Principal, Depends(get_current_user_async)],
+) -> int:
     return current_user.business_id
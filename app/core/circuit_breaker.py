@@ -0,0 +1,66 @@
+from threading import Lock
+from time import monotonic
+
+from app.core.errors import ServiceUnavailableError
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Fail fast once a dependency keeps failing, then probe it again after a cool-down.
+
+    ``failure_threshold`` consecutive failures open the circuit; calls are then
+    refused with ``ServiceUnavailableError`` for ``reset_timeout_seconds``. After
+    that one trial call is let through: success closes the circuit, failure
+    reopens it.
+    """
+
+    def __init__(self, failure_threshold: int, reset_timeout_seconds: float, name: str) -> None:
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout_seconds = reset_timeout_seconds
+        self.state = CLOSED
+        self.failures = 0
+        self.rejected = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self._lock = Lock()
+
+    def before_call(self) -> None:
+        with self._lock:
+            if self.state == OPEN and monotonic() - self._opened_at >= self.reset_timeout_seconds:
+                self.state = HALF_OPEN
+                self._trial_in_flight = False
+            if self.state == CLOSED:
+                return
+            if self.state == HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return
+            self.rejected += 1
+        raise ServiceUnavailableError(message=f"{self.name} is unavailable, retry shortly")
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.state = CLOSED
+            self.failures = 0
+            self._trial_in_flight = False
+
+    def release_trial(self) -> None:
+        """Free the half-open trial slot when a call ends without an outcome (cancelled, or a local error)."""
+        with self._lock:
+            if self.state == HALF_OPEN:
+                self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+                self.state = OPEN
+                self._opened_at = monotonic()
+                self._trial_in_flight = False
+
+    def stats(self) -> dict[str, int | str]:
+        with self._lock:
+            return {"state": self.state, "failures": self.failures, "rejected": self.rejected}
@@ -14,22 +14,77 @@ class Settings(BaseSettings):
     )
 
     database_url: str = "sqlite:///./app.db"
+    db_async_reads: bool = False
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout_seconds: float = 30.0
+    db_pool_recycle_seconds: int = -1
+    db_pool_pre_ping: bool = False
     test_database_url: str = ""
     use_external_test_db: bool = False
     jwt_secret: str = "change-me"
     paystack_secret_key: str = ""
     paystack_public_key: str = ""
     paystack_webhook_token: str = ""
+    paystack_base_url: str = "https://api.paystack.co"
+    paystack_max_retries: int = 2
+    paystack_breaker_failure_threshold: int = 5
+    paystack_breaker_reset_seconds: float = 30.0
+    # Chat customers have no email; Paystack requires one per transaction.
+    paystack_customer_email_domain: str = "customers.chatcommerce.ng"
+    payment_preinit_enabled: bool = False
+    # Off: setup and status requests provision the business's own profile.
+    payout_provisioning_enabled: bool = False
+    payout_provisioning_poll_interval_seconds: float = 5.0
+    payout_provisioning_batch_size: int = 20
+    payout_provisioning_lock_seconds: float = 120.0
+    payout_provisioning_max_attempts: int = 8
     telegram_webhook_token: str = ""
     whatsapp_verify_token: str = ""
     whatsapp_app_secret: str = ""
     gemini_api_key: str = ""
     media_dir: str = "media"
+    storage_backend: str = "local"
+    media_public_base_url: str = ""
+    presigned_upload_expires_seconds: int = 900
+    media_accel_redirect_prefix: str = ""
+    max_upload_bytes: int = 10 * 1024 * 1024
+    image_derivative_workers: int = 2
+    image_derivative_max_pending: int = 64
+    receipt_render_workers: int = 2
+    receipt_render_max_pending: int = 64
     cloudflare_account_id: str = ""
     r2_bucket_name: str = ""
     r2_access_key_id: str = ""
     r2_secret_access_key: str = ""
     r2_endpoint_url: str = ""
+    principal_cache_ttl_seconds: float = 60.0
+    principal_cache_max_entries: int = 10_000
+    product_import_batch_size: int = 1_000
+    product_import_max_reported_errors: int = 1_000
+    catalog_cache_ttl_seconds: float = 300.0
+    catalog_cache_max_entries: int = 5_000
+    token_cache_ttl_seconds: float = 300.0
+    token_cache_max_entries: int = 10_000
+    password_hash_workers: int = 4
+    password_hash_max_pending: int = 32
+    order_reservation_ttl_minutes: int = 60
+    order_sweeper_enabled: bool = False
+    order_sweep_interval_seconds: float = 30.0
+    order_sweep_batch_size: int = 500
+    order_sweep_max_batches: int = 20
+    order_sweep_lease_seconds: float = 90.0
+    # Off: each webhook request drains the inbox itself before answering.
+    webhook_inbox_enabled: bool = False
+    webhook_inbox_workers: int = 2
+    webhook_inbox_poll_interval_seconds: float = 1.0
+    webhook_inbox_batch_size: int = 50
+    webhook_inbox_lock_seconds: float = 60.0
+    webhook_inbox_max_attempts: int = 10
+    webhook_dedup_max_entries: int = 100_000
+    # Paystack keeps retrying an unacknowledged live event for up to 72 hours.
+    webhook_dedup_ttl_seconds: float = 72 * 3600.0
+    webhook_dedup_seed_on_startup: bool = False
 
 
 @lru_cache
@@ -1,13 +1,73 @@
-from collections.abc import Generator
+from collections.abc import AsyncGenerator, Generator
+from functools import lru_cache
+from typing import Any
 
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
 from sqlmodel import Session, create_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from app.core.config import get_settings
+from app.core.config import Settings, get_settings
+from app.core.db_pool import PoolStats, engine_pool_options
 
 settings = get_settings()
-engine = create_engine(settings.database_url, echo=False)
+pool_stats = PoolStats()
+async_pool_stats = PoolStats()
+
+
+def create_db_engine(database_url: str, settings: Settings, stats: PoolStats | None = None) -> Engine:
+    db_engine = create_engine(database_url, echo=False, **engine_pool_options(database_url, settings))
+    if stats is not None:
+        stats.attach(db_engine.pool)
+    return db_engine
+
+
+engine = create_db_engine(settings.database_url, settings, stats=pool_stats)
+
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "sqlite+pysqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+}
+
+
+def to_async_url(database_url: str) -> str:
+    url = make_url(database_url)
+    drivername = ASYNC_DRIVERS.get(url.drivername, url.drivername)
+    query = dict(url.query)
+    if drivername == "postgresql+asyncpg":
+        # asyncpg takes ``ssl`` rather than libpq's ``sslmode`` and has no channel_binding option.
+        if "sslmode" in query:
+            query["ssl"] = query.pop("sslmode")
+        query.pop("channel_binding", None)
+    return url.set(drivername=drivername, query=query).render_as_string(hide_password=False)
+
+
+@lru_cache
+def get_async_engine() -> AsyncEngine:
+    async_url = to_async_url(settings.database_url)
+    async_engine = create_async_engine(
+        async_url,
+        echo=False,
+        **engine_pool_options(async_url, settings, is_async=True),
+    )
+    async_pool_stats.attach(async_engine.sync_engine.pool)
+    return async_engine
+
+
+def get_pool_stats() -> dict[str, Any]:
+    stats = {"sync": pool_stats.snapshot(engine.pool)}
+    if get_async_engine.cache_info().currsize:
+        stats["async"] = async_pool_stats.snapshot(get_async_engine().sync_engine.pool)
+    return stats
 
 
 def get_session() -> Generator[Session, None, None]:
     with Session(engine) as session:
         yield session
+
+
+async def get_async_session() -> AsyncGenerator[AsyncSession, None]:
+    async with AsyncSession(get_async_engine(), expire_on_commit=False) as session:
+        yield session
@@ -0,0 +1,150 @@
+from bisect import bisect_left
+from threading import Lock
+from time import perf_counter
+from typing import Any
+
+from sqlalchemy import event, exc
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool, StaticPool
+
+from app.core.config import Settings
+
+WAIT_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+class PoolStats:
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.checked_out = 0
+            self.peak_checked_out = 0
+            self.checkouts = 0
+            self.connects = 0
+            self.invalidations = 0
+            self.timeouts = 0
+            self.wait_total_ms = 0.0
+            self.wait_max_ms = 0.0
+            self.wait_histogram = [0] * (len(WAIT_BUCKETS_MS) + 1)
+
+    def record_wait(self, wait_ms: float) -> None:
+        with self._lock:
+            self.wait_total_ms += wait_ms
+            self.wait_max_ms = max(self.wait_max_ms, wait_ms)
+            self.wait_histogram[bisect_left(WAIT_BUCKETS_MS, wait_ms)] += 1
+
+    def record_timeout(self) -> None:
+        with self._lock:
+            self.timeouts += 1
+
+    def on_connect(self, *_args: Any) -> None:
+        with self._lock:
+            self.connects += 1
+
+    def on_checkout(self, *_args: Any) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.checked_out += 1
+            self.peak_checked_out = max(self.peak_checked_out, self.checked_out)
+
+    def on_checkin(self, *_args: Any) -> None:
+        with self._lock:
+            self.checked_out = max(self.checked_out - 1, 0)
+
+    def on_invalidate(self, *_args: Any) -> None:
+        with self._lock:
+            self.invalidations += 1
+
+    def attach(self, pool: Pool) -> None:
+        event.listen(pool, "connect", self.on_connect)
+        event.listen(pool, "checkout", self.on_checkout)
+        event.listen(pool, "checkin", self.on_checkin)
+        event.listen(pool, "invalidate", self.on_invalidate)
+        if isinstance(pool, _TimedCheckoutMixin):
+            pool.stats = self
+
+    def snapshot(self, pool: Pool) -> dict[str, Any]:
+        with self._lock:
+            labels = [f"le_{bound}ms" for bound in WAIT_BUCKETS_MS] + ["gt_10000ms"]
+            snapshot = {
+                "pool_class": type(pool).__name__,
+                "checked_out": self.checked_out,
+                "peak_checked_out": self.peak_checked_out,
+                "checkouts": self.checkouts,
+                "connects": self.connects,
+                "invalidations": self.invalidations,
+                "timeouts": self.timeouts,
+                "wait_total_ms": round(self.wait_total_ms, 3),
+                "wait_max_ms": round(self.wait_max_ms, 3),
+                "wait_histogram": dict(zip(labels, self.wait_histogram)),
+            }
+        if isinstance(pool, QueuePool):
+            snapshot["size"] = pool.size()
+            snapshot["overflow"] = max(pool.overflow(), 0)
+            snapshot["idle"] = pool.checkedin()
+        return snapshot
+
+
+class _TimedCheckoutMixin:
+    # Pool events fire only after a connection is handed out, so the time spent
+    # queueing for one (and any TimeoutError) is measured around _do_get.
+    stats: PoolStats | None = None
+
+    def _do_get(self):
+        started = perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            if self.stats is not None:
+                self.stats.record_timeout()
+            raise
+
+        if self.stats is not None:
+            self.stats.record_wait((perf_counter() - started) * 1000)
+        return connection
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.stats = self.stats
+        return pool
+
+
+class InstrumentedQueuePool(_TimedCheckoutMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncAdaptedQueuePool(_TimedCheckoutMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def is_sqlite_memory(database_url: str) -> bool:
+    url = make_url(database_url)
+    return url.get_backend_name() == "sqlite" and (
+        url.database in (None, "", ":memory:") or url.query.get("mode") == "memory"
+    )
+
+
+def engine_pool_options(database_url: str, settings: Settings, is_async: bool = False) -> dict[str, Any]:
+    url = make_url(database_url)
+    options: dict[str, Any] = {}
+
+    if url.get_backend_name() == "sqlite":
+        # sqlite3 connections are shared across the threadpool, so the
+        # same-thread check has to go for every SQLite pool.
+        options["connect_args"] = {"check_same_thread": False}
+        if is_sqlite_memory(database_url):
+            # Every new connection to :memory: is a new, empty database.
+            options["poolclass"] = StaticPool
+            return options
+
+    options.update(
+        poolclass=InstrumentedAsyncAdaptedQueuePool if is_async else InstrumentedQueuePool,
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_timeout=settings.db_pool_timeout_seconds,
+        pool_recycle=settings.db_pool_recycle_seconds,
+        pool_pre_ping=settings.db_pool_pre_ping,
+    )
+    return options
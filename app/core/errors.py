@@ -32,3 +32,13 @@ class ConflictError(AppError):
 class ProviderError(AppError):
     def __init__(self, message: str = "Provider error", details: Any | None = None) -> None:
         super().__init__(message=message, code="PROVIDER_ERROR", details=details)
+
+
+class PayloadTooLargeError(AppError):
+    def __init__(self, message: str = "Payload too large", details: Any | None = None) -> None:
+        super().__init__(message=message, code="PAYLOAD_TOO_LARGE", details=details)
+
+
+class ServiceUnavailableError(AppError):
+    def __init__(self, message: str = "Service temporarily unavailable", details: Any | None = None) -> None:
+        super().__init__(message=message, code="SERVICE_UNAVAILABLE", details=details)
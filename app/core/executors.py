@@ -0,0 +1,38 @@
+from collections.abc import Callable
+from concurrent.futures import Executor, Future
+from threading import BoundedSemaphore
+from typing import Any
+
+from app.core.errors import ServiceUnavailableError
+
+
+class BoundedExecutor:
+    """Wrap an executor with a hard cap on running + queued work.
+
+    Submissions beyond ``max_workers + max_pending`` fail fast with
+    ``ServiceUnavailableError`` instead of growing an unbounded queue.
+    """
+
+    def __init__(self, executor: Executor, max_workers: int, max_pending: int, name: str) -> None:
+        self.name = name
+        self.capacity = max_workers + max_pending
+        self._executor = executor
+        self._slots = BoundedSemaphore(self.capacity)
+        self.rejected = 0
+
+    def submit(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Future:
+        if not self._slots.acquire(blocking=False):
+            self.rejected += 1
+            raise ServiceUnavailableError(message=f"{self.name} is busy, retry shortly")
+
+        try:
+            future = self._executor.submit(fn, *args, **kwargs)
+        except BaseException:
+            self._slots.release()
+            raise
+
+        future.add_done_callback(lambda _future: self._slots.release())
+        return future
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._executor.shutdown(wait=wait)
@@ -0,0 +1,19 @@
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Weak comparison per RFC 9110 section 13.1.2, as If-None-Match requires."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+
+    opaque = etag.removeprefix("W/")
+    return any(candidate.strip().removeprefix("W/") == opaque for candidate in if_none_match.split(","))
+
+
+def listing_headers(etag: str | None, next_cursor: str | None) -> dict[str, str]:
+    # Tenant data: browsers may keep it but must revalidate on every use.
+    headers = {"Cache-Control": "private, no-cache"}
+    if etag:
+        headers["ETag"] = etag
+    if next_cursor:
+        headers["X-Next-Cursor"] = next_cursor
+    return headers
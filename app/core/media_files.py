@@ -0,0 +1,121 @@
+import os
+import re
+from mimetypes import guess_type
+from urllib.parse import quote
+
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+from starlette.types import Scope
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE_CONTROL = "public, no-cache"
+
+# Public aliases and their derivatives have a random 128-bit hex name that is
+# never reused, so the bytes behind these paths never change.
+CONTENT_ADDRESSED_PATH = re.compile(r"^(products|receipts)/(derived/)?[0-9a-f]{32}(_[a-z]+)?\.[a-z0-9]+$")
+# Deduplicated blobs (and upload spool files) are named by their SHA-256, which
+# anyone holding a copy of the file can compute; they are only reachable
+# through an alias.
+PRIVATE_DIRS = ("blobs",)
+# Pre-compressed ``<file>.br`` / ``<file>.gz`` sidecars, in order of preference.
+SIDECAR_ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+# Images and PDFs are already compressed; only these are worth a sidecar lookup.
+COMPRESSIBLE_TYPES = ("text/", "application/json", "application/javascript", "image/svg+xml", "application/xml")
+
+
+class MediaFiles(StaticFiles):
+    """StaticFiles for ``media_dir`` with long-lived caching and optional proxy offload.
+
+    Content-addressed paths get ``Cache-Control: immutable``; every file gets a
+    strong ETag (inode/size/mtime, which hard-linked aliases share with their
+    blob), byte ranges via ``FileResponse``,
+    and ``.br``/``.gz`` sidecars for compressible types. With
+    ``accel_redirect_prefix`` set, the body is left to the front proxy through
+    ``X-Accel-Redirect`` and the worker only sends headers.
+    """
+
+    def __init__(self, *args, accel_redirect_prefix: str = "", **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.accel_redirect_prefix = accel_redirect_prefix.rstrip("/")
+
+    def lookup_path(self, path: str) -> tuple[str, os.stat_result | None]:
+        full_path, stat_result = super().lookup_path(path)
+        if stat_result is not None:
+            # Checked on the resolved path, so ``products/../blobs/...`` is caught too.
+            relative_path = os.path.relpath(full_path, os.path.realpath(self.directory))
+            if relative_path.split(os.sep, 1)[0] in PRIVATE_DIRS:
+                return "", None
+        return full_path, stat_result
+
+    def file_response(
+        self,
+        full_path: str | os.PathLike[str],
+        stat_result: os.stat_result,
+        scope: Scope,
+        status_code: int = 200,
+    ) -> Response:
+        request_headers = Headers(scope=scope)
+        relative_path = os.path.relpath(full_path, os.path.realpath(self.directory)).replace(os.sep, "/")
+        media_type = guess_type(relative_path)[0] or "application/octet-stream"
+        content_addressed = CONTENT_ADDRESSED_PATH.match(relative_path)
+
+        headers = {
+            "cache-control": IMMUTABLE_CACHE_CONTROL if content_addressed else REVALIDATE_CACHE_CONTROL,
+        }
+        serve_path, serve_stat, encoding = str(full_path), stat_result, None
+        if media_type.startswith(COMPRESSIBLE_TYPES):
+            headers["vary"] = "Accept-Encoding"
+            serve_path, serve_stat, encoding = _pick_sidecar(serve_path, stat_result, request_headers)
+            if encoding is not None:
+                headers["content-encoding"] = encoding
+                relative_path += serve_path[len(str(full_path)):]
+
+        headers["etag"] = _strong_etag(serve_stat, encoding)
+
+        if self.accel_redirect_prefix:
+            headers["x-accel-redirect"] = quote(f"{self.accel_redirect_prefix}/{relative_path}")
+            response = Response(status_code=status_code, headers=headers, media_type=media_type)
+        else:
+            response = FileResponse(
+                serve_path,
+                status_code=status_code,
+                headers=headers,
+                media_type=media_type,
+                stat_result=serve_stat,
+            )
+
+        if self.is_not_modified(response.headers, request_headers):
+            return NotModifiedResponse(response.headers)
+        return response
+
+
+def _pick_sidecar(
+    full_path: str,
+    stat_result: os.stat_result,
+    request_headers: Headers,
+) -> tuple[str, os.stat_result, str | None]:
+    accepted = {
+        token.split(";")[0].strip().lower()
+        for token in request_headers.get("accept-encoding", "").split(",")
+        if token.strip() and not token.replace(" ", "").endswith(";q=0")
+    }
+    for encoding, suffix in SIDECAR_ENCODINGS:
+        if encoding not in accepted:
+            continue
+        try:
+            sidecar_stat = os.stat(full_path + suffix)
+        except FileNotFoundError:
+            continue
+        # A sidecar older than its source is left over from a previous version.
+        if sidecar_stat.st_mtime >= stat_result.st_mtime:
+            return full_path + suffix, sidecar_stat, encoding
+    return full_path, stat_result, None
+
+
+def _strong_etag(stat_result: os.stat_result, encoding: str | None) -> str:
+    tag = f"{stat_result.st_ino:x}-{stat_result.st_size:x}-{stat_result.st_mtime_ns:x}"
+    if encoding is not None:
+        # Each encoding is a different representation and needs its own strong validator.
+        tag = f"{tag}.{encoding}"
+    return f'"{tag}"'
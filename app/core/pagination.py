@@ -0,0 +1,53 @@
+import base64
+import binascii
+import json
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+from typing import Generic, TypeVar
+
+from app.core.errors import ValidationError
+
+T = TypeVar("T")
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+
+@dataclass(frozen=True)
+class Page(Generic[T]):
+    items: list[T] = field(default_factory=list)
+    next_cursor: str | None = None
+    etag: str | None = None
+
+
+def encode_cursor(last_id: int) -> str:
+    raw = json.dumps({"id": last_id}, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> int:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        last_id = json.loads(base64.urlsafe_b64decode(padded.encode()))["id"]
+    except (binascii.Error, ValueError, KeyError, TypeError) as exc:
+        raise ValidationError(message="Invalid cursor") from exc
+
+    if isinstance(last_id, bool) or not isinstance(last_id, int):
+        raise ValidationError(message="Invalid cursor")
+    return last_id
+
+
+def resolve_page_request(cursor: str | None, limit: int | None) -> tuple[int | None, int | None]:
+    """Turn API paging params into (before_id, limit); (None, None) means the whole list."""
+    before_id = decode_cursor(cursor) if cursor is not None else None
+    if limit is None and before_id is not None:
+        limit = DEFAULT_PAGE_SIZE
+    return before_id, limit
+
+
+def build_page(rows: Sequence[T], limit: int | None) -> Page[T]:
+    """Rows must be fetched newest-first with ``limit + 1`` so we can tell whether more remain."""
+    if limit is None or len(rows) <= limit:
+        return Page(items=list(rows))
+    items = list(rows[:limit])
+    return Page(items=items, next_cursor=encode_cursor(items[-1].id))
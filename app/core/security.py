@@ -1,13 +1,29 @@
+import asyncio
+import hashlib
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from threading import Lock
 
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 
+from app.core.cache import TTLCache
 from app.core.config import get_settings
 from app.core.errors import AuthError
+from app.core.executors import BoundedExecutor
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+_settings = get_settings()
+token_cache = TTLCache(
+    maxsize=_settings.token_cache_max_entries,
+    ttl_seconds=_settings.token_cache_ttl_seconds,
+)
+_token_cache_secret = _settings.jwt_secret
+_token_cache_lock = Lock()
+
 
 def hash_password(password: str) -> str:
     return pwd_context.hash(password)
@@ -17,6 +33,27 @@ def verify_password(password: str, password_hash: str) -> bool:
     return pwd_context.verify(password, password_hash)
 
 
+@lru_cache
+def get_password_executor() -> BoundedExecutor:
+    # bcrypt releases the GIL, so a small dedicated thread pool keeps password
+    # work off Starlette's shared threadpool without process-pool overhead.
+    settings = get_settings()
+    return BoundedExecutor(
+        ThreadPoolExecutor(max_workers=settings.password_hash_workers, thread_name_prefix="password"),
+        max_workers=settings.password_hash_workers,
+        max_pending=settings.password_hash_max_pending,
+        name="Password service",
+    )
+
+
+async def hash_password_async(password: str) -> str:
+    return await asyncio.wrap_future(get_password_executor().submit(hash_password, password))
+
+
+async def verify_password_async(password: str, password_hash: str) -> bool:
+    return await asyncio.wrap_future(get_password_executor().submit(verify_password, password, password_hash))
+
+
 def create_access_token(user_id: int, business_id: int) -> str:
     settings = get_settings()
     payload = {
@@ -30,6 +67,13 @@ def create_access_token(user_id: int, business_id: int) -> str:
 
 def decode_access_token(token: str) -> dict:
     settings = get_settings()
+    _flush_token_cache_on_secret_change(settings.jwt_secret)
+
+    cache_key = hashlib.sha256(token.encode()).digest()
+    cached = token_cache.get(cache_key)
+    if cached is not None:
+        return dict(cached)
+
     try:
         payload = jwt.decode(token, settings.jwt_secret, algorithms=["HS256"])
     except JWTError as exc:
@@ -38,4 +82,18 @@ def decode_access_token(token: str) -> dict:
     if "user_id" not in payload or "business_id" not in payload:
         raise AuthError(message="Invalid authentication credentials")
 
+    # Never serve a cached payload past the token's own expiry.
+    if "exp" in payload:
+        token_cache.set(cache_key, dict(payload), ttl_seconds=payload["exp"] - time.time())
     return payload
+
+
+def _flush_token_cache_on_secret_change(jwt_secret: str) -> None:
+    global _token_cache_secret
+    if jwt_secret == _token_cache_secret:
+        return
+
+    with _token_cache_lock:
+        if jwt_secret != _token_cache_secret:
+            token_cache.clear()
+            _token_cache_secret = jwt_secret
@@ -0,0 +1,186 @@
+import os
+import shutil
+import tempfile
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from functools import lru_cache
+from pathlib import Path
+from typing import BinaryIO
+
+from app.core.config import Settings, get_settings
+from app.core.errors import ValidationError
+
+
+@dataclass(frozen=True)
+class PresignedUpload:
+    url: str
+    fields: dict[str, str] = field(default_factory=dict)
+
+
+class StorageBackend(ABC):
+    """Where media bytes live, addressed by ``/``-separated keys such as ``products/<name>.png``.
+
+    Keys are either content-addressed or random and never reused, so writing a
+    key that already exists may keep the existing bytes.
+    """
+
+    # Directory for temp files that ``put_file`` can take over cheaply.
+    spool_dir: Path
+
+    @abstractmethod
+    def put_file(self, path: Path, key: str, content_type: str) -> None: ...
+
+    @abstractmethod
+    def copy(self, source_key: str, destination_key: str) -> None: ...
+
+    @abstractmethod
+    def open(self, key: str) -> BinaryIO: ...
+
+    @abstractmethod
+    def exists(self, key: str) -> bool: ...
+
+    @abstractmethod
+    def delete(self, key: str) -> None: ...
+
+    @abstractmethod
+    def url(self, key: str) -> str: ...
+
+    def local_path(self, key: str) -> Path | None:
+        """Filesystem path of ``key`` when the bytes are on this node, else None."""
+        return None
+
+    def presign_upload(self, key: str, max_bytes: int, expires_seconds: int) -> PresignedUpload:
+        raise ValidationError(message="Direct uploads need an object-storage backend")
+
+
+class LocalStorage(StorageBackend):
+    """Keys are files under ``media_dir``, served by the ``/media`` mount except for ``blobs/``."""
+
+    def __init__(self, root: Path) -> None:
+        self.root = root
+        self.spool_dir = root / "blobs"
+
+    def _path(self, key: str) -> Path:
+        return self.root / key
+
+    def put_file(self, path: Path, key: str, content_type: str) -> None:
+        destination = self._path(key)
+        destination.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            os.link(path, destination)
+        except FileExistsError:
+            pass
+        except OSError:
+            shutil.copyfile(path, destination)
+
+    def copy(self, source_key: str, destination_key: str) -> None:
+        # Hard links cost no extra space and keep the bytes alive even if the
+        # source key is later deleted; fall back to a copy without them.
+        destination = self._path(destination_key)
+        destination.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            os.link(self._path(source_key), destination)
+        except FileExistsError:
+            pass
+        except OSError:
+            shutil.copyfile(self._path(source_key), destination)
+
+    def open(self, key: str) -> BinaryIO:
+        return self._path(key).open("rb")
+
+    def exists(self, key: str) -> bool:
+        return self._path(key).is_file()
+
+    def delete(self, key: str) -> None:
+        self._path(key).unlink(missing_ok=True)
+
+    def url(self, key: str) -> str:
+        return f"/media/{key}"
+
+    def local_path(self, key: str) -> Path | None:
+        return self._path(key)
+
+
+class S3Storage(StorageBackend):
+    """S3-compatible bucket (Cloudflare R2, MinIO, AWS); copies stay server-side."""
+
+    def __init__(
+        self,
+        bucket: str,
+        endpoint_url: str | None,
+        access_key_id: str | None,
+        secret_access_key: str | None,
+        public_base_url: str = "",
+    ) -> None:
+        import boto3
+
+        self.bucket = bucket
+        self.spool_dir = Path(tempfile.gettempdir())
+        self.public_base_url = (public_base_url or f"{endpoint_url or 'https://s3.amazonaws.com'}/{bucket}").rstrip("/")
+        self.client = boto3.client(
+            "s3",
+            endpoint_url=endpoint_url or None,
+            aws_access_key_id=access_key_id or None,
+            aws_secret_access_key=secret_access_key or None,
+            region_name="auto" if endpoint_url else None,
+        )
+
+    def put_file(self, path: Path, key: str, content_type: str) -> None:
+        self.client.upload_file(str(path), self.bucket, key, ExtraArgs={"ContentType": content_type})
+
+    def copy(self, source_key: str, destination_key: str) -> None:
+        self.client.copy_object(
+            Bucket=self.bucket,
+            Key=destination_key,
+            CopySource={"Bucket": self.bucket, "Key": source_key},
+        )
+
+    def open(self, key: str) -> BinaryIO:
+        return self.client.get_object(Bucket=self.bucket, Key=key)["Body"]
+
+    def exists(self, key: str) -> bool:
+        from botocore.exceptions import ClientError
+
+        try:
+            self.client.head_object(Bucket=self.bucket, Key=key)
+        except ClientError as exc:
+            if exc.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound"):
+                return False
+            raise
+        return True
+
+    def delete(self, key: str) -> None:
+        self.client.delete_object(Bucket=self.bucket, Key=key)
+
+    def url(self, key: str) -> str:
+        return f"{self.public_base_url}/{key}"
+
+    def presign_upload(self, key: str, max_bytes: int, expires_seconds: int) -> PresignedUpload:
+        # A presigned POST (unlike a presigned PUT) lets the bucket itself
+        # refuse bodies over the size limit.
+        presigned = self.client.generate_presigned_post(
+            Bucket=self.bucket,
+            Key=key,
+            Conditions=[["content-length-range", 1, max_bytes]],
+            ExpiresIn=expires_seconds,
+        )
+        return PresignedUpload(url=presigned["url"], fields=presigned["fields"])
+
+
+def create_storage(settings: Settings) -> StorageBackend:
+    if settings.storage_backend == "local":
+        return LocalStorage(Path(settings.media_dir))
+    if settings.storage_backend == "s3":
+        return S3Storage(
+            bucket=settings.r2_bucket_name,
+            endpoint_url=settings.r2_endpoint_url,
+            access_key_id=settings.r2_access_key_id,
+            secret_access_key=settings.r2_secret_access_key,
+            public_base_url=settings.media_public_base_url,
+        )
+    raise ValueError(f"Unknown storage_backend: {settings.storage_backend}")
+
+
+@lru_cache
+def get_storage() -> StorageBackend:
+    return create_storage(get_settings())
@@ -0,0 +1,50 @@
+import io
+from collections.abc import AsyncGenerator, AsyncIterator
+
+from anyio.from_thread import run as run_from_thread
+
+from app.core.errors import PayloadTooLargeError
+
+
+class BlockingByteStream(io.RawIOBase):
+    """Blocking, readable file object over an async byte iterator.
+
+    Only usable from a worker thread started by anyio (e.g. ``run_in_threadpool``):
+    each read hops back onto the event loop to pull the next chunk, so the body is
+    consumed incrementally and never buffered whole.
+    """
+
+    def __init__(self, chunks: AsyncIterator[bytes]) -> None:
+        super().__init__()
+        self._chunks = chunks
+        self._buffer = b""
+        self._exhausted = False
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        while not self._buffer and not self._exhausted:
+            try:
+                self._buffer = run_from_thread(self._chunks.__anext__)
+            except StopAsyncIteration:
+                self._exhausted = True
+
+        size = min(len(buffer), len(self._buffer))
+        buffer[:size] = self._buffer[:size]
+        self._buffer = self._buffer[size:]
+        return size
+
+
+async def capped_stream(chunks: AsyncIterator[bytes], max_bytes: int, message: str) -> AsyncGenerator[bytes, None]:
+    """Pass ``chunks`` through, failing with ``PayloadTooLargeError`` once more than ``max_bytes`` arrive.
+
+    Unlike a Content-Length check this also stops chunked bodies, and it stops
+    them while they are being read rather than after they have been spooled.
+    """
+    received = 0
+    async for chunk in chunks:
+        received += len(chunk)
+        if received > max_bytes:
+            raise PayloadTooLargeError(message=message)
+        yield chunk
@@ -0,0 +1,115 @@
+import hashlib
+import os
+import tempfile
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass
+from pathlib import Path
+from typing import BinaryIO
+
+from app.core.errors import PayloadTooLargeError, ValidationError
+
+UPLOAD_CHUNK_BYTES = 64 * 1024
+
+
+def sniff_image_suffix(head: bytes) -> str | None:
+    """File suffix for a JPEG, PNG or WebP signature, or None for anything else."""
+    if head.startswith(b"\xff\xd8\xff"):
+        return ".jpg"
+    if head.startswith(b"\x89PNG\r\n\x1a\n"):
+        return ".png"
+    if len(head) >= 12 and head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return ".webp"
+    return None
+
+
+def sniff_pdf_suffix(head: bytes) -> str | None:
+    """``.pdf`` for a PDF header, or None for anything else."""
+    if head.startswith(b"%PDF-"):
+        return ".pdf"
+    return None
+
+
+@dataclass(frozen=True)
+class StreamDigest:
+    sha256: str
+    size_bytes: int
+    suffix: str
+
+
+@dataclass(frozen=True)
+class SpooledUpload(StreamDigest):
+    path: Path
+
+
+def _checked_chunks(
+    source: BinaryIO,
+    max_bytes: int,
+    detect_suffix: Callable[[bytes], str | None],
+    chunk_size: int,
+) -> tuple[str, Iterator[bytes]]:
+    head = source.read(chunk_size)
+    suffix = detect_suffix(head)
+    if suffix is None:
+        raise ValidationError(message="Unsupported file type")
+
+    def chunks() -> Iterator[bytes]:
+        written = 0
+        chunk = head
+        while chunk:
+            written += len(chunk)
+            if written > max_bytes:
+                raise PayloadTooLargeError(message=f"Upload exceeds {max_bytes} bytes")
+            yield chunk
+            chunk = source.read(chunk_size)
+
+    return suffix, chunks()
+
+
+def digest_stream(
+    source: BinaryIO,
+    max_bytes: int,
+    detect_suffix: Callable[[bytes], str | None] = sniff_image_suffix,
+    chunk_size: int = UPLOAD_CHUNK_BYTES,
+) -> StreamDigest:
+    """Type-check, size-check and SHA-256 a stream without keeping any of it."""
+    suffix, chunks = _checked_chunks(source, max_bytes, detect_suffix, chunk_size)
+    digest = hashlib.sha256()
+    size_bytes = 0
+    for chunk in chunks:
+        digest.update(chunk)
+        size_bytes += len(chunk)
+    return StreamDigest(sha256=digest.hexdigest(), size_bytes=size_bytes, suffix=suffix)
+
+
+def spool_stream(
+    source: BinaryIO,
+    directory: Path,
+    max_bytes: int,
+    detect_suffix: Callable[[bytes], str | None] = sniff_image_suffix,
+    chunk_size: int = UPLOAD_CHUNK_BYTES,
+) -> SpooledUpload:
+    """Copy ``source`` into a temp file under ``directory`` in fixed-size chunks.
+
+    The suffix comes from the first chunk's magic bytes and the SHA-256 is
+    computed as the bytes are written, so the caller can file the result by
+    content without reading it back. The caller owns (and must move or delete)
+    the returned temp file.
+    """
+    suffix, chunks = _checked_chunks(source, max_bytes, detect_suffix, chunk_size)
+    directory.mkdir(parents=True, exist_ok=True)
+    fd, temp_name = tempfile.mkstemp(dir=directory, prefix=".upload-", suffix=".part")
+    digest = hashlib.sha256()
+    size_bytes = 0
+    try:
+        with os.fdopen(fd, "wb") as output:
+            for chunk in chunks:
+                digest.update(chunk)
+                size_bytes += len(chunk)
+                output.write(chunk)
+            output.flush()
+            os.fsync(output.fileno())
+    except BaseException:
+        Path(temp_name).unlink(missing_ok=True)
+        raise
+
+    return SpooledUpload(sha256=digest.hexdigest(), size_bytes=size_bytes, suffix=suffix, path=Path(temp_name))
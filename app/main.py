@@ -1,14 +1,26 @@
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from functools import partial
 from pathlib import Path
 
 from fastapi import FastAPI, Request
 from fastapi.exceptions import RequestValidationError
 from fastapi.responses import JSONResponse
-from fastapi.staticfiles import StaticFiles
+from sqlmodel import Session
 
 from app.api.v1 import router as api_v1_router
 from app.core.errors import AppError
 from app.core.config import get_settings
+from app.core.db import engine, get_pool_stats
+from app.core.media_files import MediaFiles
+from app.services.order_expiry_service import OrderExpirySweeper, sweeper_stats
+from app.services.payout_service import PayoutProvisioningWorker
+from app.services.paystack_service import close_paystack_client
+from app.services.receipt_service import schedule_receipt
+from app.services.webhook_inbox_service import WebhookInboxWorkers, seed_known_events
 
+logger = logging.getLogger(__name__)
 settings = get_settings()
 
 
@@ -16,8 +28,66 @@ media_root = Path(settings.media_dir)
 (media_root / "products").mkdir(parents=True, exist_ok=True)
 (media_root / "receipts").mkdir(parents=True, exist_ok=True)
 
-app = FastAPI(title="ChatCommerce v1")
-app.mount("/media", StaticFiles(directory=settings.media_dir), name="media")
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI):
+    if settings.webhook_dedup_seed_on_startup:
+        await asyncio.to_thread(_seed_known_webhook_events)
+    sweeper = None
+    if settings.order_sweeper_enabled:
+        sweeper = OrderExpirySweeper(
+            lambda: Session(engine),
+            interval_seconds=settings.order_sweep_interval_seconds,
+            batch_size=settings.order_sweep_batch_size,
+            max_batches=settings.order_sweep_max_batches,
+            lease_seconds=settings.order_sweep_lease_seconds,
+        )
+        sweeper.start()
+    inbox_workers = None
+    if settings.webhook_inbox_enabled:
+        inbox_workers = WebhookInboxWorkers(
+            lambda: Session(engine),
+            workers=settings.webhook_inbox_workers,
+            poll_interval_seconds=settings.webhook_inbox_poll_interval_seconds,
+            batch_size=settings.webhook_inbox_batch_size,
+            lock_seconds=settings.webhook_inbox_lock_seconds,
+            max_attempts=settings.webhook_inbox_max_attempts,
+            # Receipts render in the receipt pool once the payment is committed.
+            on_paid=partial(schedule_receipt, lambda: Session(engine)),
+        )
+        inbox_workers.start()
+    payout_worker = None
+    if settings.payout_provisioning_enabled:
+        payout_worker = PayoutProvisioningWorker(
+            lambda: Session(engine),
+            poll_interval_seconds=settings.payout_provisioning_poll_interval_seconds,
+            batch_size=settings.payout_provisioning_batch_size,
+            lock_seconds=settings.payout_provisioning_lock_seconds,
+            max_attempts=settings.payout_provisioning_max_attempts,
+        )
+        payout_worker.start()
+    yield
+    if payout_worker is not None:
+        await payout_worker.stop()
+    if inbox_workers is not None:
+        await inbox_workers.stop()
+    if sweeper is not None:
+        await sweeper.stop()
+    await close_paystack_client()
+
+
+def _seed_known_webhook_events() -> None:
+    with Session(engine) as session:
+        seeded = seed_known_events(session)
+    logger.info("Seeded %d settled Paystack references into the webhook filter", seeded)
+
+
+app = FastAPI(title="ChatCommerce v1", lifespan=lifespan)
+app.mount(
+    "/media",
+    MediaFiles(directory=settings.media_dir, accel_redirect_prefix=settings.media_accel_redirect_prefix),
+    name="media",
+)
 app.include_router(api_v1_router)
 
 
@@ -30,6 +100,12 @@ async def app_error_handler(_request: Request, exc: AppError) -> JSONResponse:
         status_code = 404
     elif exc.code == "CONFLICT":
         status_code = 409
+    elif exc.code == "PROVIDER_ERROR":
+        status_code = 502
+    elif exc.code == "PAYLOAD_TOO_LARGE":
+        status_code = 413
+    elif exc.code == "SERVICE_UNAVAILABLE":
+        status_code = 503
 
     return JSONResponse(
         status_code=status_code,
@@ -60,3 +136,13 @@ async def request_validation_error_handler(_request: Request, exc: RequestValida
 @app.get("/api/v1/health")
 def health() -> dict[str, bool]:
     return {"ok": True}
+
+
+@app.get("/api/v1/health/db-pool")
+def db_pool_health() -> dict:
+    return get_pool_stats()
+
+
+@app.get("/api/v1/health/order-sweeper")
+def order_sweeper_health() -> dict:
+    return sweeper_stats.snapshot()
@@ -2,6 +2,8 @@ from app.models.business import Business
 from app.models.conversation import Conversation
 from app.models.customer import Customer
 from app.models.delivery_zone import DeliveryZone
+from app.models.media_alias import MediaAlias
+from app.models.media_blob import MediaBlob
 from app.models.message_log import MessageLog
 from app.models.order import Order
 from app.models.order_item import OrderItem
@@ -10,6 +12,8 @@ from app.models.payout_profile import PayoutProfile
 from app.models.product import Product
 from app.models.receipt import Receipt
 from app.models.user import User
+from app.models.webhook_event import WebhookEvent
+from app.models.worker_lease import WorkerLease
 
 __all__ = [
     "Business",
@@ -24,4 +28,8 @@ __all__ = [
     "Payment",
     "Receipt",
     "MessageLog",
+    "MediaBlob",
+    "MediaAlias",
+    "WorkerLease",
+    "WebhookEvent",
 ]
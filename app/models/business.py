@@ -10,4 +10,8 @@ class Business(SQLModel, table=True):
     name: str = Field(index=True)
     store_code: str = Field(index=True, unique=True)
     currency: str = Field(default="NGN")
+    # Bumped in every write transaction that changes the listing, so each
+    # worker's ListingCache sees the change on its next read.
+    catalog_version: int = Field(default=0)
+    delivery_zone_version: int = Field(default=0)
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
@@ -1,8 +1,18 @@
+from sqlalchemy import Index, text
 from sqlmodel import Field, SQLModel
 
 
 class DeliveryZone(SQLModel, table=True):
     __tablename__ = "delivery_zone"
+    __table_args__ = (
+        Index(
+            "ix_delivery_zone_business_active_id",
+            "business_id",
+            "id",
+            sqlite_where=text("is_active IS 1"),
+            postgresql_where=text("is_active IS true"),
+        ),
+    )
 
     id: int | None = Field(default=None, primary_key=True)
     business_id: int = Field(foreign_key="business.id", index=True)
@@ -0,0 +1,12 @@
+from datetime import datetime, timezone
+
+from sqlmodel import Field, SQLModel
+
+
+class MediaAlias(SQLModel, table=True):
+    __tablename__ = "media_alias"
+
+    public_path: str = Field(primary_key=True)
+    sha256: str = Field(foreign_key="media_blob.sha256", index=True)
+    business_id: int | None = Field(default=None, foreign_key="business.id", index=True)
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
@@ -0,0 +1,13 @@
+from datetime import datetime, timezone
+
+from sqlmodel import Field, SQLModel
+
+
+class MediaBlob(SQLModel, table=True):
+    __tablename__ = "media_blob"
+
+    sha256: str = Field(primary_key=True, max_length=64)
+    suffix: str
+    size_bytes: int
+    ref_count: int = 0
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
@@ -1,16 +1,26 @@
 from datetime import datetime, timezone
 
+from sqlalchemy import Index
 from sqlmodel import Field, SQLModel
 
+ORDER_STATUS_RESERVED = "reserved"
+ORDER_STATUS_PAYMENT_PENDING = "payment_pending"
+ORDER_STATUS_PAID = "paid"
+ORDER_STATUS_EXPIRED = "expired"
+
 
 class Order(SQLModel, table=True):
     __tablename__ = "order"
+    __table_args__ = (
+        # Serves the expiry sweep: status equality, then oldest expires_at first.
+        Index("ix_order_status_expires_at", "status", "expires_at"),
+    )
 
     id: int | None = Field(default=None, primary_key=True)
     business_id: int = Field(foreign_key="business.id", index=True)
     customer_id: int = Field(foreign_key="customer.id", index=True)
     channel_type: str = Field(index=True)
-    status: str = Field(default="reserved", index=True)
+    status: str = Field(default=ORDER_STATUS_RESERVED, index=True)
     subtotal_kobo: int
     delivery_fee_kobo: int
     total_kobo: int
@@ -2,6 +2,10 @@ from datetime import datetime, timezone
 
 from sqlmodel import Field, SQLModel
 
+PAYMENT_STATUS_INITIATED = "initiated"
+PAYMENT_STATUS_SUCCESS = "success"
+PAYMENT_STATUS_FAILED = "failed"
+
 
 class Payment(SQLModel, table=True):
     __tablename__ = "payment"
@@ -9,7 +13,7 @@ class Payment(SQLModel, table=True):
     id: int | None = Field(default=None, primary_key=True)
     order_id: int = Field(foreign_key="order.id", index=True)
     provider: str = Field(default="paystack")
-    status: str = Field(default="initiated", index=True)
+    status: str = Field(default=PAYMENT_STATUS_INITIATED, index=True)
     amount_kobo: int
     currency: str = Field(default="NGN")
     paystack_reference: str | None = Field(default=None, index=True, unique=True)
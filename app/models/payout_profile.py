@@ -1,15 +1,34 @@
 from datetime import datetime, timezone
 
+from sqlalchemy import Index
 from sqlmodel import Field, SQLModel
 
+PAYOUT_STATUS_PENDING = "pending"
+PAYOUT_STATUS_ACTIVE = "active"
+PAYOUT_STATUS_FAILED = "failed"
+
 
 class PayoutProfile(SQLModel, table=True):
     __tablename__ = "payout_profile"
+    __table_args__ = (
+        # Serves the provisioning job: due pending profiles, oldest first.
+        Index("ix_payout_profile_status_next_attempt_at", "status", "next_attempt_at"),
+    )
 
     business_id: int = Field(foreign_key="business.id", primary_key=True, unique=True)
     bank_name: str
     account_number: str
     account_name: str
+    # The subaccount payments settle to. Replaced only when the job activates
+    # resubmitted bank details, so it keeps serving while they are provisioned.
     paystack_subaccount_code: str | None = None
-    status: str = Field(default="pending")
+    status: str = Field(default=PAYOUT_STATUS_PENDING)
+    # Provisioning job state: attempts so far, when the next one is due (or
+    # until when the current one is locked), and the latest provider error.
+    attempts: int = 0
+    # Bumped on every resubmission and never reset, so a provider call made for
+    # older bank details can never complete the current setup.
+    setup_version: int = 0
+    next_attempt_at: datetime | None = None
+    last_error: str | None = None
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
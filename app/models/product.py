@@ -1,10 +1,21 @@
 from datetime import datetime, timezone
 
+from sqlalchemy import Index, text
 from sqlmodel import Field, SQLModel
 
 
 class Product(SQLModel, table=True):
     __tablename__ = "product"
+    __table_args__ = (
+        # Serves the tenant catalog listing: business_id equality, keyset on id desc, active rows only.
+        Index(
+            "ix_product_business_active_id",
+            "business_id",
+            "id",
+            sqlite_where=text("is_active IS 1"),
+            postgresql_where=text("is_active IS true"),
+        ),
+    )
 
     id: int | None = Field(default=None, primary_key=True)
     business_id: int = Field(foreign_key="business.id", index=True)
@@ -0,0 +1,33 @@
+from datetime import datetime, timezone
+
+from sqlalchemy import Index
+from sqlmodel import Field, SQLModel
+
+WEBHOOK_STATUS_PENDING = "pending"
+WEBHOOK_STATUS_PROCESSING = "processing"
+WEBHOOK_STATUS_DONE = "done"
+WEBHOOK_STATUS_FAILED = "failed"
+
+
+class WebhookEvent(SQLModel, table=True):
+    __tablename__ = "webhook_event"
+    __table_args__ = (
+        # Serves the claim query: due pending rows and processing rows whose lock has lapsed.
+        Index("ix_webhook_event_status_available_at", "status", "available_at"),
+    )
+
+    id: int | None = Field(default=None, primary_key=True)
+    provider: str
+    # "<event>:<reference>"; a redelivery of the same event is dropped on insert.
+    event_key: str = Field(unique=True)
+    event_type: str
+    reference: str | None = Field(default=None, index=True)
+    payload: str
+    status: str = Field(default=WEBHOOK_STATUS_PENDING)
+    attempts: int = 0
+    # When a pending row is next due, or when a processing row's lock runs out.
+    available_at: datetime
+    locked_by: str | None = None
+    last_error: str | None = None
+    received_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    processed_at: datetime | None = None
@@ -0,0 +1,11 @@
+from datetime import datetime
+
+from sqlmodel import Field, SQLModel
+
+
+class WorkerLease(SQLModel, table=True):
+    __tablename__ = "worker_lease"
+
+    name: str = Field(primary_key=True)
+    holder: str
+    expires_at: datetime
@@ -1,4 +1,5 @@
 from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.models.business import Business
 from app.models.user import User
@@ -14,6 +15,12 @@ def get_user_by_id(session: Session, user_id: int) -> User | None:
     return session.exec(statement).first()
 
 
+async def get_user_by_id_async(session: AsyncSession, user_id: int) -> User | None:
+    statement = select(User).where(User.id == user_id)
+    result = await session.exec(statement)
+    return result.first()
+
+
 def get_business_by_id(session: Session, business_id: int) -> Business | None:
     statement = select(Business).where(Business.id == business_id)
     return session.exec(statement).first()
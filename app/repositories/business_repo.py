@@ -1,4 +1,6 @@
+from sqlalchemy import update
 from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.models.business import Business
 
@@ -8,6 +10,12 @@ def get_business_by_id(session: Session, business_id: int) -> Business | None:
     return session.exec(statement).first()
 
 
+async def get_business_by_id_async(session: AsyncSession, business_id: int) -> Business | None:
+    statement = select(Business).where(Business.id == business_id)
+    result = await session.exec(statement)
+    return result.first()
+
+
 def update_business_name(session: Session, business_id: int, name: str) -> Business | None:
     business = get_business_by_id(session, business_id=business_id)
     if not business:
@@ -18,3 +26,25 @@ def update_business_name(session: Session, business_id: int, name: str) -> Busin
     session.commit()
     session.refresh(business)
     return business
+
+
+def get_listing_version(session: Session, business_id: int, column) -> int:
+    return session.exec(select(column).where(Business.id == business_id)).first() or 0
+
+
+async def get_listing_version_async(session: AsyncSession, business_id: int, column) -> int:
+    result = await session.exec(select(column).where(Business.id == business_id))
+    return result.first() or 0
+
+
+def get_listing_versions(session: Session, business_id: int) -> tuple[int, int]:
+    """``(catalog_version, delivery_zone_version)`` in one lookup."""
+    row = session.exec(
+        select(Business.catalog_version, Business.delivery_zone_version).where(Business.id == business_id)
+    ).first()
+    return tuple(row) if row else (0, 0)
+
+
+def bump_listing_version(session: Session, business_id: int, column) -> None:
+    """Increment a listing version inside the caller's transaction; the caller commits."""
+    session.execute(update(Business).where(Business.id == business_id).values({column: column + 1}))
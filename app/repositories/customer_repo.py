@@ -0,0 +1,48 @@
+from datetime import datetime, timezone
+
+from sqlalchemy import func, insert
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlmodel import Session, select
+
+from app.models.customer import Customer
+
+_UPSERT_INSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+
+def upsert_customer(
+    session: Session,
+    business_id: int,
+    channel_type: str,
+    channel_user_id: str,
+    display_name: str | None,
+) -> int:
+    """Return the customer id for a channel user, creating the row if needed.
+
+    One ``INSERT .. ON CONFLICT DO UPDATE .. RETURNING`` round trip where the
+    dialect has it; a select-then-insert elsewhere.
+    """
+    values = {
+        "business_id": business_id,
+        "channel_type": channel_type,
+        "channel_user_id": channel_user_id,
+        "display_name": display_name,
+        "created_at": datetime.now(timezone.utc),
+    }
+    dialect_insert = _UPSERT_INSERTS.get(session.get_bind().dialect.name)
+    if dialect_insert is not None:
+        statement = dialect_insert(Customer).values(**values)
+        statement = statement.on_conflict_do_update(
+            index_elements=["business_id", "channel_type", "channel_user_id"],
+            set_={"display_name": func.coalesce(statement.excluded.display_name, Customer.display_name)},
+        ).returning(Customer.id)
+        return session.execute(statement).scalar_one()
+
+    existing = session.exec(
+        select(Customer.id)
+        .where(Customer.business_id == business_id)
+        .where(Customer.channel_type == channel_type)
+        .where(Customer.channel_user_id == channel_user_id)
+    ).first()
+    if existing is not None:
+        return existing
+    return session.execute(insert(Customer).values(**values).returning(Customer.id)).scalar_one()
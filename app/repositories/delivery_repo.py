@@ -1,4 +1,5 @@
 from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.models.delivery_zone import DeliveryZone
 
@@ -11,14 +12,37 @@ def create_delivery_zone(session: Session, business_id: int, name: str, fee_kobo
     return zone
 
 
-def list_active_delivery_zones(session: Session, business_id: int) -> list[DeliveryZone]:
+def _active_delivery_zones_statement(business_id: int, before_id: int | None, limit: int | None):
     statement = (
         select(DeliveryZone)
         .where(DeliveryZone.business_id == business_id)
         .where(DeliveryZone.is_active.is_(True))
         .order_by(DeliveryZone.id.desc())
     )
-    return list(session.exec(statement).all())
+    if before_id is not None:
+        statement = statement.where(DeliveryZone.id < before_id)
+    if limit is not None:
+        statement = statement.limit(limit)
+    return statement
+
+
+def list_active_delivery_zones(
+    session: Session,
+    business_id: int,
+    before_id: int | None = None,
+    limit: int | None = None,
+) -> list[DeliveryZone]:
+    return list(session.exec(_active_delivery_zones_statement(business_id, before_id, limit)).all())
+
+
+async def list_active_delivery_zones_async(
+    session: AsyncSession,
+    business_id: int,
+    before_id: int | None = None,
+    limit: int | None = None,
+) -> list[DeliveryZone]:
+    result = await session.exec(_active_delivery_zones_statement(business_id, before_id, limit))
+    return list(result.all())
 
 
 def get_delivery_zone_by_id(session: Session, business_id: int, zone_id: int) -> DeliveryZone | None:
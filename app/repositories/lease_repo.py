@@ -0,0 +1,40 @@
+from datetime import datetime
+
+from sqlalchemy import insert, or_, update
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import Session
+
+from app.models.worker_lease import WorkerLease
+
+
+def try_acquire_lease(session: Session, name: str, holder: str, now: datetime, expires_at: datetime) -> bool:
+    """Take or renew the named lease until ``expires_at``; False while another holder has it.
+
+    Both paths are single conditional statements, so two workers racing for a
+    free lease cannot both win.
+    """
+    statement = (
+        update(WorkerLease)
+        .where(WorkerLease.name == name)
+        .where(or_(WorkerLease.holder == holder, WorkerLease.expires_at <= now))
+        .values(holder=holder, expires_at=expires_at)
+    )
+    if session.execute(statement).rowcount:
+        return True
+
+    try:
+        with session.begin_nested():
+            session.execute(insert(WorkerLease).values(name=name, holder=holder, expires_at=expires_at))
+        return True
+    except IntegrityError:
+        # The row exists and someone else's lease is still live.
+        return False
+
+
+def release_lease(session: Session, name: str, holder: str, now: datetime) -> None:
+    session.execute(
+        update(WorkerLease)
+        .where(WorkerLease.name == name)
+        .where(WorkerLease.holder == holder)
+        .values(expires_at=now)
+    )
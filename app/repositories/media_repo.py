@@ -0,0 +1,55 @@
+from sqlalchemy import delete, insert, update
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import Session, select
+
+from app.models.media_alias import MediaAlias
+from app.models.media_blob import MediaBlob
+
+
+def add_blob_reference(session: Session, sha256: str, suffix: str, size_bytes: int) -> bool:
+    """Count one more reference to a blob, creating its row on first sight.
+
+    Returns True if the blob was already known (the new bytes were a duplicate).
+    """
+    statement = update(MediaBlob).where(MediaBlob.sha256 == sha256).values(ref_count=MediaBlob.ref_count + 1)
+    if session.execute(statement).rowcount:
+        return True
+
+    try:
+        with session.begin_nested():
+            session.execute(
+                insert(MediaBlob).values(sha256=sha256, suffix=suffix, size_bytes=size_bytes, ref_count=1)
+            )
+        return False
+    except IntegrityError:
+        # A concurrent upload of the same bytes inserted the row first.
+        session.execute(statement)
+        return True
+
+
+def release_blob_reference(session: Session, sha256: str) -> int:
+    """Drop one reference and return how many remain (the row is deleted at zero)."""
+    session.execute(
+        update(MediaBlob).where(MediaBlob.sha256 == sha256).values(ref_count=MediaBlob.ref_count - 1)
+    )
+    remaining = session.exec(select(MediaBlob.ref_count).where(MediaBlob.sha256 == sha256)).first()
+    if remaining is not None and remaining <= 0:
+        session.execute(delete(MediaBlob).where(MediaBlob.sha256 == sha256))
+        return 0
+    return remaining or 0
+
+
+def create_alias(session: Session, public_path: str, sha256: str, business_id: int | None) -> None:
+    session.add(MediaAlias(public_path=public_path, sha256=sha256, business_id=business_id))
+
+
+def get_alias(session: Session, public_path: str) -> MediaAlias | None:
+    return session.get(MediaAlias, public_path)
+
+
+def delete_alias(session: Session, alias: MediaAlias) -> None:
+    session.delete(alias)
+
+
+def get_blob(session: Session, sha256: str) -> MediaBlob | None:
+    return session.get(MediaBlob, sha256)
@@ -0,0 +1,88 @@
+from datetime import datetime
+
+from sqlalchemy import insert, update
+from sqlmodel import Session, select
+
+from app.models.order import (
+    ORDER_STATUS_EXPIRED,
+    ORDER_STATUS_PAID,
+    ORDER_STATUS_PAYMENT_PENDING,
+    ORDER_STATUS_RESERVED,
+    Order,
+)
+from app.models.order_item import OrderItem
+
+
+def insert_order(session: Session, values: dict) -> int:
+    return session.execute(insert(Order).values(**values).returning(Order.id)).scalar_one()
+
+
+def insert_order_items(session: Session, rows: list[dict]) -> list[int]:
+    """Insert every line as one multi-row statement; the new ids (ascending) come back via RETURNING.
+
+    Ids are not matched back to ``rows``: asking for that (``sort_by_parameter_order``)
+    makes SQLite fall back to one INSERT per row.
+    """
+    if session.get_bind().dialect.insert_executemany_returning:
+        return sorted(session.scalars(insert(OrderItem).returning(OrderItem.id), rows))
+
+    session.execute(insert(OrderItem), rows)
+    return []
+
+
+def list_order_items(session: Session, order_id: int) -> list[OrderItem]:
+    return list(session.exec(select(OrderItem).where(OrderItem.order_id == order_id).order_by(OrderItem.id)).all())
+
+
+def _overdue_reservations_statement(now: datetime, limit: int):
+    return (
+        select(Order.id, Order.expires_at)
+        .where(Order.status == ORDER_STATUS_RESERVED)
+        .where(Order.expires_at <= now)
+        .order_by(Order.expires_at)
+        .limit(limit)
+    )
+
+
+def expire_overdue_orders(session: Session, now: datetime, limit: int) -> tuple[list[int], datetime | None]:
+    """Expire up to ``limit`` overdue reservations, oldest first.
+
+    Returns the ids that changed and the ``expires_at`` of the oldest one.
+    The status is re-checked in the UPDATE so an order paid in between is left alone.
+    """
+    overdue = session.exec(_overdue_reservations_statement(now, limit)).all()
+    if not overdue:
+        return [], None
+
+    expired = session.scalars(
+        update(Order)
+        .where(Order.id.in_([order_id for order_id, _expires_at in overdue]))
+        .where(Order.status == ORDER_STATUS_RESERVED)
+        .values(status=ORDER_STATUS_EXPIRED)
+        .returning(Order.id)
+    ).all()
+    return list(expired), overdue[0][1]
+
+
+def get_order_for_business(session: Session, business_id: int, order_id: int) -> Order | None:
+    return session.exec(select(Order).where(Order.id == order_id).where(Order.business_id == business_id)).first()
+
+
+def mark_order_payment_pending(session: Session, order_id: int) -> bool:
+    result = session.execute(
+        update(Order)
+        .where(Order.id == order_id)
+        .where(Order.status == ORDER_STATUS_RESERVED)
+        .values(status=ORDER_STATUS_PAYMENT_PENDING)
+    )
+    return bool(result.rowcount)
+
+
+def mark_order_paid(session: Session, order_id: int, from_statuses: tuple[str, ...]) -> bool:
+    result = session.execute(
+        update(Order)
+        .where(Order.id == order_id)
+        .where(Order.status.in_(from_statuses))
+        .values(status=ORDER_STATUS_PAID)
+    )
+    return bool(result.rowcount)
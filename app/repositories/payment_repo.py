@@ -0,0 +1,70 @@
+from datetime import datetime
+
+from sqlalchemy import delete, insert, update
+from sqlmodel import Session, select
+
+from app.models.order import ORDER_STATUS_EXPIRED, Order
+from app.models.payment import PAYMENT_STATUS_INITIATED, PAYMENT_STATUS_SUCCESS, Payment
+
+
+def get_payment_by_reference(session: Session, reference: str) -> Payment | None:
+    return session.exec(select(Payment).where(Payment.paystack_reference == reference)).first()
+
+
+def mark_payment_success(session: Session, payment_id: int, raw_event_json: str, confirmed_at: datetime) -> bool:
+    """Flip a payment to success; False if it already was (a concurrent or repeated event)."""
+    result = session.execute(
+        update(Payment)
+        .where(Payment.id == payment_id)
+        .where(Payment.status != PAYMENT_STATUS_SUCCESS)
+        .values(status=PAYMENT_STATUS_SUCCESS, raw_event_json=raw_event_json, confirmed_at=confirmed_at)
+    )
+    return bool(result.rowcount)
+
+
+def list_recent_paid_references(session: Session, limit: int) -> list[str]:
+    """References of the latest successful payments, newest first."""
+    return list(
+        session.exec(
+            select(Payment.paystack_reference)
+            .where(Payment.status == PAYMENT_STATUS_SUCCESS)
+            .where(Payment.paystack_reference.is_not(None))
+            .order_by(Payment.confirmed_at.desc(), Payment.id.desc())
+            .limit(limit)
+        ).all()
+    )
+
+
+def get_paid_payment(session: Session, order_id: int) -> Payment | None:
+    return session.exec(
+        select(Payment)
+        .where(Payment.order_id == order_id)
+        .where(Payment.status == PAYMENT_STATUS_SUCCESS)
+        .order_by(Payment.id.desc())
+    ).first()
+
+
+def get_open_payment_for_order(session: Session, order_id: int) -> Payment | None:
+    """The newest initiated payment that already has a checkout link."""
+    return session.exec(
+        select(Payment)
+        .where(Payment.order_id == order_id)
+        .where(Payment.status == PAYMENT_STATUS_INITIATED)
+        .where(Payment.authorization_url.is_not(None))
+        .order_by(Payment.id.desc())
+    ).first()
+
+
+def insert_payment(session: Session, values: dict) -> int:
+    return session.execute(insert(Payment).values(**values).returning(Payment.id)).scalar_one()
+
+
+def delete_unused_payments(session: Session, order_ids: list[int]) -> int:
+    """Drop initiated payments of the given orders that ended up expired."""
+    expired_orders = select(Order.id).where(Order.id.in_(order_ids)).where(Order.status == ORDER_STATUS_EXPIRED)
+    result = session.execute(
+        delete(Payment)
+        .where(Payment.order_id.in_(expired_orders))
+        .where(Payment.status == PAYMENT_STATUS_INITIATED)
+    )
+    return result.rowcount
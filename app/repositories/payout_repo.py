@@ -0,0 +1,138 @@
+from datetime import datetime
+
+from sqlalchemy import update
+from sqlmodel import Session, select
+
+from app.models.business import Business
+from app.models.payout_profile import (
+    PAYOUT_STATUS_ACTIVE,
+    PAYOUT_STATUS_FAILED,
+    PAYOUT_STATUS_PENDING,
+    PayoutProfile,
+)
+
+
+def get_payout_profile(session: Session, business_id: int) -> PayoutProfile | None:
+    return session.get(PayoutProfile, business_id)
+
+
+def save_pending_payout_profile(
+    session: Session,
+    business_id: int,
+    bank_name: str,
+    account_number: str,
+    account_name: str,
+    now: datetime,
+) -> PayoutProfile:
+    profile = session.get(PayoutProfile, business_id)
+    if profile is None:
+        profile = PayoutProfile(
+            business_id=business_id,
+            bank_name=bank_name,
+            account_number=account_number,
+            account_name=account_name,
+            created_at=now,
+        )
+    else:
+        profile.bank_name = bank_name
+        profile.account_number = account_number
+        profile.account_name = account_name
+        # The current subaccount keeps serving until the new one is active.
+        profile.setup_version += 1
+    profile.status = PAYOUT_STATUS_PENDING
+    profile.attempts = 0
+    profile.next_attempt_at = now
+    profile.last_error = None
+    session.add(profile)
+    return profile
+
+
+def _due_payout_profiles_statement(now: datetime, limit: int, business_id: int | None):
+    statement = (
+        select(PayoutProfile.business_id)
+        .where(PayoutProfile.status == PAYOUT_STATUS_PENDING)
+        .where(PayoutProfile.next_attempt_at <= now)
+    )
+    if business_id is not None:
+        statement = statement.where(PayoutProfile.business_id == business_id)
+    return statement.order_by(PayoutProfile.next_attempt_at).limit(limit)
+
+
+def claim_due_payout_profiles(
+    session: Session,
+    now: datetime,
+    locked_until: datetime,
+    limit: int,
+    business_id: int | None = None,
+) -> list:
+    """Lock up to ``limit`` due pending profiles (only ``business_id``'s, if given) until ``locked_until``.
+
+    Returns rows of (business_id, business_name, bank_name, account_number,
+    attempts, setup_version, created_at). Claiming bumps ``attempts``; together with
+    ``setup_version`` and the bank details it fences later writes, so neither
+    a worker whose lock lapsed and was re-claimed nor one still working on
+    bank details the business has since replaced can overwrite the profile.
+    """
+    due = _due_payout_profiles_statement(now, limit, business_id).with_for_update(skip_locked=True)
+    business_ids = list(session.exec(due).all())
+    if not business_ids:
+        return []
+
+    claimed = session.scalars(
+        update(PayoutProfile)
+        .where(PayoutProfile.business_id.in_(business_ids))
+        .where(PayoutProfile.status == PAYOUT_STATUS_PENDING)
+        .where(PayoutProfile.next_attempt_at <= now)
+        .values(next_attempt_at=locked_until, attempts=PayoutProfile.attempts + 1)
+        .returning(PayoutProfile.business_id)
+    ).all()
+    if not claimed:
+        return []
+    return list(
+        session.exec(
+            select(
+                PayoutProfile.business_id,
+                Business.name.label("business_name"),
+                PayoutProfile.bank_name,
+                PayoutProfile.account_number,
+                PayoutProfile.attempts,
+                PayoutProfile.setup_version,
+                PayoutProfile.created_at,
+            )
+            .join(Business, Business.id == PayoutProfile.business_id)
+            .where(PayoutProfile.business_id.in_(claimed))
+            .order_by(PayoutProfile.business_id)
+        ).all()
+    )
+
+
+def _held_claim(statement, claim):
+    return (
+        statement.where(PayoutProfile.business_id == claim.business_id)
+        .where(PayoutProfile.status == PAYOUT_STATUS_PENDING)
+        .where(PayoutProfile.setup_version == claim.setup_version)
+        .where(PayoutProfile.attempts == claim.attempts)
+        .where(PayoutProfile.bank_name == claim.bank_name)
+        .where(PayoutProfile.account_number == claim.account_number)
+    )
+
+
+def mark_payout_active(session: Session, claim, subaccount_code: str) -> bool:
+    """Activate the profile ``claim`` (a row from ``claim_due_payout_profiles``) still holds."""
+    result = session.execute(
+        _held_claim(update(PayoutProfile), claim).values(
+            status=PAYOUT_STATUS_ACTIVE,
+            paystack_subaccount_code=subaccount_code,
+            next_attempt_at=None,
+            last_error=None,
+        )
+    )
+    return bool(result.rowcount)
+
+
+def release_payout_attempt(session: Session, claim, error: str, retry_at: datetime | None) -> None:
+    """Schedule another attempt at ``retry_at``, or mark the profile failed if None."""
+    values = {"last_error": error[:1000], "next_attempt_at": retry_at}
+    if retry_at is None:
+        values["status"] = PAYOUT_STATUS_FAILED
+    session.execute(_held_claim(update(PayoutProfile), claim).values(**values))
@@ -1,4 +1,6 @@
+from sqlalchemy import bindparam, insert, update
 from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.models.product import Product
 
@@ -25,14 +27,37 @@ def create_product(
     return product
 
 
-def list_active_products(session: Session, business_id: int) -> list[Product]:
+def _active_products_statement(business_id: int, before_id: int | None, limit: int | None):
     statement = (
         select(Product)
         .where(Product.business_id == business_id)
         .where(Product.is_active.is_(True))
         .order_by(Product.id.desc())
     )
-    return list(session.exec(statement).all())
+    if before_id is not None:
+        statement = statement.where(Product.id < before_id)
+    if limit is not None:
+        statement = statement.limit(limit)
+    return statement
+
+
+def list_active_products(
+    session: Session,
+    business_id: int,
+    before_id: int | None = None,
+    limit: int | None = None,
+) -> list[Product]:
+    return list(session.exec(_active_products_statement(business_id, before_id, limit)).all())
+
+
+async def list_active_products_async(
+    session: AsyncSession,
+    business_id: int,
+    before_id: int | None = None,
+    limit: int | None = None,
+) -> list[Product]:
+    result = await session.exec(_active_products_statement(business_id, before_id, limit))
+    return list(result.all())
 
 
 def get_product_by_id(session: Session, business_id: int, product_id: int) -> Product | None:
@@ -49,3 +74,85 @@ def save_product(session: Session, product: Product) -> Product:
     session.commit()
     session.refresh(product)
     return product
+
+
+def insert_products(session: Session, rows: list[dict]) -> None:
+    """executemany INSERT inside the caller's transaction; the caller commits."""
+    if rows:
+        session.execute(insert(Product), rows)
+
+
+def get_product_active_flags(session: Session, business_id: int, product_ids: list[int]) -> dict[int, bool]:
+    statement = (
+        select(Product.id, Product.is_active)
+        .where(Product.business_id == business_id)
+        .where(Product.id.in_(product_ids))
+    )
+    return {product_id: is_active for product_id, is_active in session.exec(statement).all()}
+
+
+def list_active_products_by_ids(session: Session, business_id: int, product_ids: list[int]) -> list[Product]:
+    statement = (
+        select(Product)
+        .where(Product.business_id == business_id)
+        .where(Product.is_active.is_(True))
+        .where(Product.id.in_(product_ids))
+    )
+    return list(session.exec(statement).all())
+
+
+def list_products_by_ids(session: Session, business_id: int, product_ids: list[int]) -> list[Product]:
+    statement = (
+        select(Product)
+        .where(Product.business_id == business_id)
+        .where(Product.id.in_(product_ids))
+        .order_by(Product.id.desc())
+    )
+    return list(session.exec(statement).all())
+
+
+def update_products_set_values(session: Session, business_id: int, product_ids: list[int], values: dict) -> None:
+    statement = (
+        update(Product.__table__)
+        .where(Product.business_id == business_id)
+        .where(Product.id.in_(product_ids))
+        .values(**values)
+    )
+    session.connection().execute(statement)
+
+
+def update_products_per_row(session: Session, business_id: int, fields: tuple[str, ...], rows: list[dict]) -> None:
+    """One UPDATE statement executed with many parameter sets; rows carry ``product_id`` plus ``fields``."""
+    statement = (
+        update(Product.__table__)
+        .where(Product.business_id == business_id)
+        .where(Product.id == bindparam("product_id"))
+        .values({field: bindparam(field) for field in fields})
+    )
+    session.connection().execute(statement, rows)
+
+
+def scale_product_prices(session: Session, business_id: int, product_ids: list[int], percent: int) -> None:
+    # Integer arithmetic rounded half-up to a whole naira, so prices stay naira multiples.
+    scaled_kobo = (Product.base_price_kobo * (100 + percent) + 5000) // 10000 * 100
+    update_products_set_values(session, business_id, product_ids, {"base_price_kobo": scaled_kobo})
+
+
+def get_product_image_urls(session: Session, business_id: int, product_ids: list[int]) -> dict[int, str | None]:
+    statement = (
+        select(Product.id, Product.image_url)
+        .where(Product.business_id == business_id)
+        .where(Product.id.in_(product_ids))
+    )
+    return {product_id: image_url for product_id, image_url in session.exec(statement).all()}
+
+
+def list_image_urls_in_use(session: Session, business_id: int, image_urls: list[str]) -> set[str]:
+    """Which of ``image_urls`` some product of the business (active or not) still points at."""
+    statement = (
+        select(Product.image_url)
+        .where(Product.business_id == business_id)
+        .where(Product.image_url.in_(image_urls))
+        .distinct()
+    )
+    return set(session.exec(statement).all())
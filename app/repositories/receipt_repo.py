@@ -0,0 +1,27 @@
+from sqlalchemy import insert
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import Session, select
+
+from app.models.receipt import Receipt
+
+_CONFLICT_INSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+
+def get_receipt_for_order(session: Session, order_id: int) -> Receipt | None:
+    return session.exec(select(Receipt).where(Receipt.order_id == order_id)).first()
+
+
+def insert_receipt(session: Session, values: dict) -> bool:
+    """Store a rendered receipt; False if the order already has one."""
+    dialect_insert = _CONFLICT_INSERTS.get(session.get_bind().dialect.name)
+    if dialect_insert is not None:
+        statement = dialect_insert(Receipt).values(**values).on_conflict_do_nothing(index_elements=["order_id"])
+        return bool(session.execute(statement).rowcount)
+
+    try:
+        with session.begin_nested():
+            session.execute(insert(Receipt).values(**values))
+        return True
+    except IntegrityError:
+        return False
@@ -0,0 +1,106 @@
+from datetime import datetime
+
+from sqlalchemy import insert, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import Session, select
+
+from app.models.webhook_event import (
+    WEBHOOK_STATUS_DONE,
+    WEBHOOK_STATUS_FAILED,
+    WEBHOOK_STATUS_PENDING,
+    WEBHOOK_STATUS_PROCESSING,
+    WebhookEvent,
+)
+
+_CONFLICT_INSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+
+def insert_webhook_event(session: Session, values: dict) -> bool:
+    """Store an incoming event; False if one with the same ``event_key`` is already there."""
+    dialect_insert = _CONFLICT_INSERTS.get(session.get_bind().dialect.name)
+    if dialect_insert is not None:
+        statement = dialect_insert(WebhookEvent).values(**values).on_conflict_do_nothing(index_elements=["event_key"])
+        return bool(session.execute(statement).rowcount)
+
+    try:
+        with session.begin_nested():
+            session.execute(insert(WebhookEvent).values(**values))
+        return True
+    except IntegrityError:
+        return False
+
+
+def claim_webhook_events(
+    session: Session,
+    worker: str,
+    now: datetime,
+    locked_until: datetime,
+    limit: int,
+) -> list[WebhookEvent]:
+    """Lock up to ``limit`` due events for ``worker`` until ``locked_until``, oldest first.
+
+    Processing rows whose lock has lapsed are due again, which is what makes
+    delivery at-least-once when a worker dies mid-event. Postgres skips rows
+    another claimer holds; the status re-check covers dialects without SKIP LOCKED.
+    """
+    due = (
+        select(WebhookEvent.id)
+        .where(WebhookEvent.status.in_((WEBHOOK_STATUS_PENDING, WEBHOOK_STATUS_PROCESSING)))
+        .where(WebhookEvent.available_at <= now)
+        .order_by(WebhookEvent.id)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )
+    ids = list(session.exec(due).all())
+    if not ids:
+        return []
+
+    session.execute(
+        update(WebhookEvent)
+        .where(WebhookEvent.id.in_(ids))
+        .where(WebhookEvent.status.in_((WEBHOOK_STATUS_PENDING, WEBHOOK_STATUS_PROCESSING)))
+        .where(WebhookEvent.available_at <= now)
+        .values(
+            status=WEBHOOK_STATUS_PROCESSING,
+            locked_by=worker,
+            available_at=locked_until,
+            attempts=WebhookEvent.attempts + 1,
+        )
+    )
+    return list(
+        session.exec(
+            select(WebhookEvent)
+            .where(WebhookEvent.id.in_(ids))
+            .where(WebhookEvent.locked_by == worker)
+            .where(WebhookEvent.available_at == locked_until)
+            .order_by(WebhookEvent.id)
+        ).all()
+    )
+
+
+def mark_webhook_event_done(session: Session, event_id: int, worker: str, now: datetime) -> None:
+    session.execute(
+        update(WebhookEvent)
+        .where(WebhookEvent.id == event_id)
+        .where(WebhookEvent.locked_by == worker)
+        .values(status=WEBHOOK_STATUS_DONE, locked_by=None, last_error=None, processed_at=now)
+    )
+
+
+def release_webhook_event(
+    session: Session,
+    event_id: int,
+    worker: str,
+    error: str,
+    retry_at: datetime | None,
+) -> None:
+    """Hand a failed event back for another attempt at ``retry_at``, or park it as failed if None."""
+    values = {"locked_by": None, "last_error": error[:1000]}
+    if retry_at is None:
+        values["status"] = WEBHOOK_STATUS_FAILED
+    else:
+        values.update(status=WEBHOOK_STATUS_PENDING, available_at=retry_at)
+    session.execute(
+        update(WebhookEvent).where(WebhookEvent.id == event_id).where(WebhookEvent.locked_by == worker).values(**values)
+    )
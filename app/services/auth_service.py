@@ -1,8 +1,14 @@
+from dataclasses import dataclass
+
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.exc import IntegrityError
 from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 
+from app.core.cache import TTLCache
+from app.core.config import get_settings
 from app.core.errors import AuthError, ConflictError
-from app.core.security import hash_password, verify_password
+from app.core.security import hash_password, hash_password_async, verify_password, verify_password_async
 from app.models.business import Business
 from app.models.user import User
 from app.repositories.auth_repo import (
@@ -11,6 +17,26 @@ from app.repositories.auth_repo import (
     get_business_by_id,
     get_user_by_email,
     get_user_by_id,
+    get_user_by_id_async,
+)
+from app.repositories.business_repo import get_business_by_id_async
+
+
+@dataclass(frozen=True, slots=True)
+class Principal:
+    user_id: int
+    business_id: int
+    email: str
+    role: str
+    business_name: str
+    store_code: str
+    currency: str
+
+
+_settings = get_settings()
+principal_cache = TTLCache(
+    maxsize=_settings.principal_cache_max_entries,
+    ttl_seconds=_settings.principal_cache_ttl_seconds,
 )
 
 
@@ -20,6 +46,40 @@ def register_business_owner(
     store_code: str,
     email: str,
     password: str,
+) -> tuple[User, Business]:
+    return _create_business_owner(
+        session,
+        business_name=business_name,
+        store_code=store_code,
+        email=email,
+        password_hash=hash_password(password),
+    )
+
+
+async def register_business_owner_async(
+    session: Session,
+    business_name: str,
+    store_code: str,
+    email: str,
+    password: str,
+) -> tuple[User, Business]:
+    password_hash = await hash_password_async(password)
+    return await run_in_threadpool(
+        _create_business_owner,
+        session,
+        business_name=business_name,
+        store_code=store_code,
+        email=email,
+        password_hash=password_hash,
+    )
+
+
+def _create_business_owner(
+    session: Session,
+    business_name: str,
+    store_code: str,
+    email: str,
+    password_hash: str,
 ) -> tuple[User, Business]:
     try:
         with session.begin():
@@ -28,7 +88,7 @@ def register_business_owner(
                 session,
                 business_id=business.id,
                 email=email,
-                password_hash=hash_password(password),
+                password_hash=password_hash,
             )
     except IntegrityError as exc:
         session.rollback()
@@ -44,6 +104,22 @@ def authenticate_user(session: Session, email: str, password: str) -> User:
     return user
 
 
+async def authenticate_user_async(session: Session, email: str, password: str) -> User:
+    user = await run_in_threadpool(_load_login_candidate, session, email=email)
+    if not user or not await verify_password_async(password, user.password_hash):
+        raise AuthError(message="Invalid email or password")
+    return user
+
+
+def _load_login_candidate(session: Session, email: str) -> User | None:
+    user = get_user_by_email(session, email=email)
+    if user:
+        session.expunge(user)
+    # Hand the connection back to the pool before the slow bcrypt check.
+    session.rollback()
+    return user
+
+
 def get_user_with_business(session: Session, user_id: int) -> tuple[User, Business]:
     user = get_user_by_id(session, user_id=user_id)
     if not user:
@@ -54,3 +130,55 @@ def get_user_with_business(session: Session, user_id: int) -> tuple[User, Busine
         raise AuthError(message="Invalid authentication credentials")
 
     return user, business
+
+
+async def get_user_with_business_async(session: AsyncSession, user_id: int) -> tuple[User, Business]:
+    user = await get_user_by_id_async(session, user_id=user_id)
+    if not user:
+        raise AuthError(message="Invalid authentication credentials")
+
+    business = await get_business_by_id_async(session, business_id=user.business_id)
+    if not business:
+        raise AuthError(message="Invalid authentication credentials")
+
+    return user, business
+
+
+def get_principal(session: Session, user_id: int) -> Principal:
+    principal = principal_cache.get(user_id)
+    if principal is not None:
+        return principal
+
+    user, business = get_user_with_business(session, user_id=user_id)
+    return _remember_principal(user, business)
+
+
+async def get_principal_async(session: AsyncSession, user_id: int) -> Principal:
+    principal = principal_cache.get(user_id)
+    if principal is not None:
+        return principal
+
+    user, business = await get_user_with_business_async(session, user_id=user_id)
+    return _remember_principal(user, business)
+
+
+def _remember_principal(user: User, business: Business) -> Principal:
+    principal = Principal(
+        user_id=user.id,
+        business_id=business.id,
+        email=user.email,
+        role=user.role,
+        business_name=business.name,
+        store_code=business.store_code,
+        currency=business.currency,
+    )
+    principal_cache.set(user.id, principal)
+    return principal
+
+
+def invalidate_principal(user_id: int) -> None:
+    principal_cache.pop(user_id)
+
+
+def invalidate_business_principals(business_id: int) -> None:
+    principal_cache.discard_if(lambda _user_id, principal: principal.business_id == business_id)
@@ -1,8 +1,10 @@
 from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.core.errors import NotFoundError, ValidationError
 from app.models.business import Business
-from app.repositories.business_repo import get_business_by_id, update_business_name
+from app.repositories.business_repo import get_business_by_id, get_business_by_id_async, update_business_name
+from app.services.auth_service import invalidate_business_principals
 
 
 def get_business(session: Session, business_id: int) -> Business:
@@ -12,6 +14,13 @@ def get_business(session: Session, business_id: int) -> Business:
     return business
 
 
+async def get_business_async(session: AsyncSession, business_id: int) -> Business:
+    business = await get_business_by_id_async(session, business_id=business_id)
+    if not business:
+        raise NotFoundError(message="Business not found")
+    return business
+
+
 def patch_business(session: Session, business_id: int, name: str | None, store_code: str | None) -> Business:
     if store_code is not None:
         raise ValidationError(message="store_code cannot be updated")
@@ -21,4 +30,6 @@ def patch_business(session: Session, business_id: int, name: str | None, store_c
     business = update_business_name(session, business_id=business_id, name=name)
     if not business:
         raise NotFoundError(message="Business not found")
+
+    invalidate_business_principals(business_id)
     return business
@@ -1,23 +1,90 @@
+from dataclasses import dataclass
+
 from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 
+from app.core.config import get_settings
 from app.core.errors import NotFoundError
+from app.core.pagination import Page, build_page, resolve_page_request
+from app.models.business import Business
 from app.models.delivery_zone import DeliveryZone
 from app.repositories.delivery_repo import (
     create_delivery_zone,
     get_delivery_zone_by_id,
     list_active_delivery_zones,
+    list_active_delivery_zones_async,
     save_delivery_zone,
 )
+from app.services.listing_cache import ListingCache
 from app.services.money import naira_to_kobo
 
 
+@dataclass(frozen=True, slots=True)
+class DeliveryZoneSnapshot:
+    id: int
+    name: str
+    fee_kobo: int
+    is_active: bool
+
+
+_settings = get_settings()
+delivery_zone_cache = ListingCache(
+    maxsize=_settings.catalog_cache_max_entries,
+    ttl_seconds=_settings.catalog_cache_ttl_seconds,
+    version_column=Business.delivery_zone_version,
+)
+
+
 def create_delivery_zone_service(session: Session, business_id: int, name: str, fee_naira: int) -> DeliveryZone:
     fee_kobo = naira_to_kobo(fee_naira)
+    # create_delivery_zone commits, taking the version bump with it.
+    delivery_zone_cache.invalidate(session, business_id)
     return create_delivery_zone(session, business_id=business_id, name=name, fee_kobo=fee_kobo)
 
 
-def list_delivery_zones_service(session: Session, business_id: int) -> list[DeliveryZone]:
-    return list_active_delivery_zones(session, business_id=business_id)
+def list_delivery_zones_service(
+    session: Session,
+    business_id: int,
+    cursor: str | None = None,
+    limit: int | None = None,
+) -> Page[DeliveryZoneSnapshot]:
+    before_id, limit = resolve_page_request(cursor, limit)
+    version = delivery_zone_cache.version(session, business_id)
+    cached = delivery_zone_cache.get(business_id, version, (before_id, limit))
+    if cached is not None:
+        return cached
+
+    fetch_limit = limit + 1 if limit is not None else None
+    zones = list_active_delivery_zones(session, business_id=business_id, before_id=before_id, limit=fetch_limit)
+    page = build_page([_snapshot(zone) for zone in zones], limit)
+    return delivery_zone_cache.put(business_id, version, (before_id, limit), page)
+
+
+async def list_delivery_zones_service_async(
+    session: AsyncSession,
+    business_id: int,
+    cursor: str | None = None,
+    limit: int | None = None,
+) -> Page[DeliveryZoneSnapshot]:
+    before_id, limit = resolve_page_request(cursor, limit)
+    version = await delivery_zone_cache.version_async(session, business_id)
+    cached = delivery_zone_cache.get(business_id, version, (before_id, limit))
+    if cached is not None:
+        return cached
+
+    fetch_limit = limit + 1 if limit is not None else None
+    zones = await list_active_delivery_zones_async(
+        session,
+        business_id=business_id,
+        before_id=before_id,
+        limit=fetch_limit,
+    )
+    page = build_page([_snapshot(zone) for zone in zones], limit)
+    return delivery_zone_cache.put(business_id, version, (before_id, limit), page)
+
+
+def _snapshot(zone: DeliveryZone) -> DeliveryZoneSnapshot:
+    return DeliveryZoneSnapshot(id=zone.id, name=zone.name, fee_kobo=zone.fee_kobo, is_active=zone.is_active)
 
 
 def update_delivery_zone_service(
@@ -36,6 +103,7 @@ def update_delivery_zone_service(
     if fee_naira is not None:
         zone.fee_kobo = naira_to_kobo(fee_naira)
 
+    delivery_zone_cache.invalidate(session, business_id)
     return save_delivery_zone(session, zone)
 
 
@@ -45,4 +113,5 @@ def soft_delete_delivery_zone_service(session: Session, business_id: int, zone_i
         raise NotFoundError(message="Delivery zone not found")
 
     zone.is_active = False
+    delivery_zone_cache.invalidate(session, business_id)
     save_delivery_zone(session, zone)
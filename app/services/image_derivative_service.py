@@ -0,0 +1,215 @@
+import logging
+import hashlib
+import os
+import shutil
+import tempfile
+from collections import defaultdict
+from concurrent.futures import Future, ProcessPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+from app.core.config import get_settings
+from app.core.errors import ServiceUnavailableError
+from app.core.executors import BoundedExecutor
+
+logger = logging.getLogger(__name__)
+
+PRODUCT_MEDIA_PREFIX = "/media/products/"
+BLOBS_DIR = "blobs"
+DERIVED_DIR = "derived"
+# variant -> (longest edge in pixels, output suffix)
+DERIVATIVES = {
+    "thumb": (320, ".jpg"),
+    "medium": (1024, ".jpg"),
+    "webp": (1024, ".webp"),
+}
+SOURCE_SUFFIXES = {".jpg", ".png", ".webp"}
+
+
+@lru_cache
+def get_image_executor() -> BoundedExecutor:
+    # Resizing is pure CPU in Pillow, so it gets processes rather than threads.
+    settings = get_settings()
+    return BoundedExecutor(
+        ProcessPoolExecutor(max_workers=settings.image_derivative_workers),
+        max_workers=settings.image_derivative_workers,
+        max_pending=settings.image_derivative_max_pending,
+        name="Image service",
+    )
+
+
+def derivative_path(source: Path, variant: str) -> Path:
+    _edge, suffix = DERIVATIVES[variant]
+    return source.parent / DERIVED_DIR / f"{source.stem}_{variant}{suffix}"
+
+
+def render_derivatives(source_path: str, alias_paths: tuple[str, ...] = ()) -> list[str]:
+    """Write every missing or stale variant of one blob, link them to its aliases and return what changed.
+
+    Runs inside a worker process. Variants are rendered once per distinct
+    content, next to the blob, and each alias gets hard links to them under its
+    own public name. Variants newer than the source are left alone, so
+    re-running over the same image is a no-op.
+    """
+    source = Path(source_path)
+    source_mtime = source.stat().st_mtime
+    pending = [variant for variant in DERIVATIVES if not _is_fresh(derivative_path(source, variant), source_mtime)]
+    if pending:
+        with Image.open(source) as original:
+            image = ImageOps.exif_transpose(original)
+            image.load()
+
+        for variant in pending:
+            edge, suffix = DERIVATIVES[variant]
+            resized = image.copy()
+            resized.thumbnail((edge, edge), Image.Resampling.LANCZOS)
+            _save_atomic(resized, derivative_path(source, variant), suffix)
+
+    linked = [
+        variant
+        for alias_path in alias_paths
+        for variant in DERIVATIVES
+        if _link_variant(derivative_path(source, variant), derivative_path(Path(alias_path), variant))
+    ]
+    return pending + [variant for variant in linked if variant not in pending]
+
+
+def _is_fresh(path: Path, source_mtime: float) -> bool:
+    try:
+        return path.stat().st_mtime >= source_mtime
+    except FileNotFoundError:
+        return False
+
+
+def _link_variant(rendered: Path, destination: Path) -> bool:
+    # A hard link shares the rendered file's mtime, so a current link counts as fresh.
+    if _is_fresh(destination, rendered.stat().st_mtime):
+        return False
+    destination.parent.mkdir(parents=True, exist_ok=True)
+    fd, temp_name = tempfile.mkstemp(dir=destination.parent, prefix=".derive-", suffix=".part")
+    os.close(fd)
+    try:
+        os.unlink(temp_name)
+        try:
+            os.link(rendered, temp_name)
+        except OSError:
+            shutil.copy2(rendered, temp_name)
+        os.replace(temp_name, destination)
+    except BaseException:
+        Path(temp_name).unlink(missing_ok=True)
+        raise
+    return True
+
+
+def _save_atomic(image: Image.Image, destination: Path, suffix: str) -> None:
+    destination.parent.mkdir(parents=True, exist_ok=True)
+    fd, temp_name = tempfile.mkstemp(dir=destination.parent, prefix=".derive-", suffix=".part")
+    try:
+        with os.fdopen(fd, "wb") as output:
+            if suffix == ".webp":
+                image.save(output, format="WEBP", quality=80, method=4)
+            else:
+                _flatten(image).save(output, format="JPEG", quality=82, optimize=True, progressive=True)
+        os.replace(temp_name, destination)
+    except BaseException:
+        Path(temp_name).unlink(missing_ok=True)
+        raise
+
+
+def _flatten(image: Image.Image) -> Image.Image:
+    # JPEG has no alpha channel; composite transparent PNG/WebP onto white.
+    if image.mode in ("RGBA", "LA", "P"):
+        rgba = image.convert("RGBA")
+        background = Image.new("RGB", rgba.size, (255, 255, 255))
+        background.paste(rgba, mask=rgba.getchannel("A"))
+        return background
+    return image.convert("RGB")
+
+
+def schedule_derivatives(source: Path, alias: Path | None = None, on_done=None) -> Future | None:
+    """Queue variant generation for a blob (linked to ``alias``) off the request path; None if the pool is saturated.
+
+    A skipped image keeps serving its original until ``backfill_derivatives``
+    (or the next upload of the same file) picks it up.
+    """
+    aliases = (str(alias),) if alias is not None else ()
+    try:
+        future = get_image_executor().submit(render_derivatives, str(source), aliases)
+    except ServiceUnavailableError:
+        logger.warning("Image pool saturated; derivatives for %s deferred", source.name)
+        return None
+
+    def _finished(done: Future) -> None:
+        if isinstance(done.exception(), UnidentifiedImageError):
+            # The magic bytes matched but the body does not decode; keep serving the original.
+            logger.warning("Skipping derivatives for %s: not a decodable image", source.name)
+        elif done.exception() is not None:
+            logger.error("Rendering derivatives for %s failed", source.name, exc_info=done.exception())
+        elif on_done is not None and done.result():
+            on_done()
+
+    future.add_done_callback(_finished)
+    return future
+
+
+def derivative_urls(image_url: str | None) -> dict[str, str]:
+    """Public URLs of the variants that already exist for a locally stored image."""
+    if not image_url or not image_url.startswith(PRODUCT_MEDIA_PREFIX):
+        return {}
+    name = image_url[len(PRODUCT_MEDIA_PREFIX):]
+    if "/" in name:
+        return {}
+
+    source = Path(get_settings().media_dir) / "products" / name
+    urls = {}
+    for variant in DERIVATIVES:
+        path = derivative_path(source, variant)
+        if path.exists():
+            urls[variant] = f"{PRODUCT_MEDIA_PREFIX}{DERIVED_DIR}/{path.name}"
+    return urls
+
+
+def backfill_derivatives(media_dir: str | None = None) -> int:
+    """Render variants for every stored product image's blob and link them to its aliases; safe to re-run."""
+    root = Path(media_dir or get_settings().media_dir)
+    aliases = [str(path) for path in (root / "products").iterdir() if path.suffix in SOURCE_SUFFIXES]
+    settings = get_settings()
+    with ProcessPoolExecutor(max_workers=settings.image_derivative_workers) as pool:
+        by_blob: dict[str, list[str]] = defaultdict(list)
+        for alias, blob in zip(aliases, pool.map(_blob_path, aliases, [str(root)] * len(aliases))):
+            by_blob[blob].append(alias)
+        sources, linked_aliases = [], []
+        for blob, blob_aliases in by_blob.items():
+            if Path(blob).is_file():
+                sources.append(blob)
+                linked_aliases.append(tuple(blob_aliases))
+            else:
+                # Images stored before deduplication have no blob and are rendered in place.
+                sources.extend(blob_aliases)
+                linked_aliases.extend(() for _alias in blob_aliases)
+        renders = pool.map(_render_if_decodable, sources, linked_aliases)
+        return sum(1 for rendered in renders if rendered)
+
+
+def _blob_path(alias_path: str, root: str) -> str:
+    # Aliases are byte-for-byte copies of their blob, which is named by its SHA-256.
+    digest = hashlib.sha256()
+    with open(alias_path, "rb") as alias:
+        for chunk in iter(lambda: alias.read(1 << 20), b""):
+            digest.update(chunk)
+    sha256 = digest.hexdigest()
+    return str(Path(root) / BLOBS_DIR / sha256[:2] / f"{sha256}{Path(alias_path).suffix}")
+
+
+def _render_if_decodable(source_path: str, alias_paths: tuple[str, ...] = ()) -> list[str]:
+    try:
+        return render_derivatives(source_path, alias_paths)
+    except UnidentifiedImageError:
+        return []
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    logger.info("Rendered derivatives for %d images", backfill_derivatives())
@@ -0,0 +1,57 @@
+import hashlib
+import json
+from collections.abc import Hashable
+from dataclasses import asdict, replace
+
+from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.cache import TTLCache
+from app.core.pagination import Page
+from app.repositories.business_repo import bump_listing_version, get_listing_version, get_listing_version_async
+
+
+class ListingCache:
+    """Per-tenant cache of list pages, invalidated by bumping a tenant version.
+
+    The version is a column on ``business`` that writers bump in their own
+    transaction, so every worker process sees an invalidation on its next
+    read; a hit costs one primary-key lookup instead of the listing query.
+    Entries are keyed by the version that was current *before* the DB read, so a
+    write that lands mid-read leaves the stale page unreachable instead of cached.
+    """
+
+    def __init__(self, maxsize: int, ttl_seconds: float, version_column) -> None:
+        self.entries = TTLCache(maxsize=maxsize, ttl_seconds=ttl_seconds)
+        self.version_column = version_column
+
+    def version(self, session: Session, business_id: int) -> int:
+        return get_listing_version(session, business_id, self.version_column)
+
+    async def version_async(self, session: AsyncSession, business_id: int) -> int:
+        return await get_listing_version_async(session, business_id, self.version_column)
+
+    def invalidate(self, session: Session, business_id: int) -> None:
+        """Bump the tenant's version in the caller's transaction; takes effect on commit."""
+        bump_listing_version(session, business_id, self.version_column)
+
+    def get(self, business_id: int, version: int, page_key: Hashable) -> Page | None:
+        return self.entries.get((business_id, version, page_key))
+
+    def put(self, business_id: int, version: int, page_key: Hashable, page: Page) -> Page:
+        cached = replace(page, etag=_page_etag(page))
+        self.entries.set((business_id, version, page_key), cached)
+        return cached
+
+    def clear(self) -> None:
+        self.entries.clear()
+
+
+def _page_etag(page: Page) -> str:
+    body = json.dumps(
+        {"items": [asdict(item) for item in page.items], "next_cursor": page.next_cursor},
+        sort_keys=True,
+        separators=(",", ":"),
+        default=str,
+    )
+    return f'"{hashlib.sha256(body.encode()).hexdigest()[:32]}"'
@@ -0,0 +1,220 @@
+import re
+from collections.abc import Callable
+from dataclasses import dataclass
+from mimetypes import guess_type
+from typing import BinaryIO
+from uuid import uuid4
+
+from sqlmodel import Session
+
+from app.core.config import get_settings
+from app.core.errors import NotFoundError, PayloadTooLargeError, ValidationError
+from app.core.storage import PresignedUpload, StorageBackend, get_storage
+from app.core.uploads import StreamDigest, digest_stream, sniff_image_suffix, spool_stream
+from app.repositories.media_repo import (
+    add_blob_reference,
+    create_alias,
+    delete_alias,
+    get_alias,
+    release_blob_reference,
+)
+from app.services.image_derivative_service import BLOBS_DIR, DERIVATIVES, derivative_path
+
+INCOMING_DIR = "incoming"
+MEDIA_KINDS = {"products", "receipts"}
+
+
+@dataclass(frozen=True)
+class StoredMedia:
+    public_path: str
+    url: str
+    sha256: str
+    size_bytes: int
+    deduplicated: bool
+
+
+@dataclass(frozen=True)
+class DirectUpload:
+    key: str
+    presigned: PresignedUpload
+    expires_in_seconds: int
+
+
+def blob_key(sha256: str, suffix: str) -> str:
+    return f"{BLOBS_DIR}/{sha256[:2]}/{sha256}{suffix}"
+
+
+def store_media_stream(
+    session: Session,
+    source: BinaryIO,
+    kind: str,
+    business_id: int | None,
+    detect_suffix: Callable[[bytes], str | None] = sniff_image_suffix,
+) -> StoredMedia:
+    """Store an upload once per distinct content and hand back a fresh public alias.
+
+    Bytes are hashed while they stream to a temp file; the first copy of a given
+    SHA-256 becomes the blob under ``blobs/`` and later copies are dropped. Each
+    call still gets its own random public key (a hard link or server-side copy
+    of the blob), so URLs stay unguessable and one tenant's upload never reveals
+    another's.
+    """
+    _check_kind(kind)
+    storage = get_storage()
+    spooled = spool_stream(
+        source,
+        directory=storage.spool_dir,
+        max_bytes=get_settings().max_upload_bytes,
+        detect_suffix=detect_suffix,
+    )
+    key = blob_key(spooled.sha256, spooled.suffix)
+    try:
+        return _register(
+            session,
+            storage,
+            spooled,
+            kind=kind,
+            business_id=business_id,
+            place_blob=lambda: storage.put_file(spooled.path, key, _content_type(spooled.suffix)),
+        )
+    finally:
+        spooled.path.unlink(missing_ok=True)
+
+
+def create_direct_upload(kind: str, business_id: int) -> DirectUpload:
+    """Presign a one-off key under ``incoming/<business_id>/`` for a client to upload to."""
+    _check_kind(kind)
+    settings = get_settings()
+    key = f"{INCOMING_DIR}/{business_id}/{kind}/{uuid4().hex}"
+    presigned = get_storage().presign_upload(
+        key,
+        max_bytes=settings.max_upload_bytes,
+        expires_seconds=settings.presigned_upload_expires_seconds,
+    )
+    return DirectUpload(key=key, presigned=presigned, expires_in_seconds=settings.presigned_upload_expires_seconds)
+
+
+def complete_direct_upload(
+    session: Session,
+    key: str,
+    kind: str,
+    business_id: int,
+    detect_suffix: Callable[[bytes], str | None] = sniff_image_suffix,
+) -> StoredMedia:
+    """Verify a client's direct upload and file it exactly like a proxied one.
+
+    The object is read once to check its type, size and hash; blob and alias
+    are then made with server-side copies and the incoming object is removed.
+    """
+    _check_kind(kind)
+    if not re.fullmatch(rf"{INCOMING_DIR}/{business_id}/{kind}/[0-9a-f]{{32}}", key):
+        raise NotFoundError(message="Upload not found")
+
+    storage = get_storage()
+    if not storage.exists(key):
+        raise NotFoundError(message="Upload not found")
+
+    source = storage.open(key)
+    try:
+        digest = digest_stream(source, max_bytes=get_settings().max_upload_bytes, detect_suffix=detect_suffix)
+    except (ValidationError, PayloadTooLargeError):
+        storage.delete(key)
+        raise
+    finally:
+        source.close()
+
+    blob = blob_key(digest.sha256, digest.suffix)
+    stored = _register(
+        session,
+        storage,
+        digest,
+        kind=kind,
+        business_id=business_id,
+        place_blob=lambda: storage.copy(key, blob),
+    )
+    storage.delete(key)
+    return stored
+
+
+def _register(
+    session: Session,
+    storage: StorageBackend,
+    digest: StreamDigest,
+    kind: str,
+    business_id: int | None,
+    place_blob: Callable[[], None],
+) -> StoredMedia:
+    key = blob_key(digest.sha256, digest.suffix)
+    public_path = f"{kind}/{uuid4().hex}{digest.suffix}"
+    try:
+        if not storage.exists(key):
+            place_blob()
+        storage.copy(key, public_path)
+
+        deduplicated = add_blob_reference(
+            session,
+            sha256=digest.sha256,
+            suffix=digest.suffix,
+            size_bytes=digest.size_bytes,
+        )
+        create_alias(session, public_path=public_path, sha256=digest.sha256, business_id=business_id)
+        session.commit()
+    except BaseException:
+        session.rollback()
+        storage.delete(public_path)
+        raise
+
+    return StoredMedia(
+        public_path=public_path,
+        url=storage.url(public_path),
+        sha256=digest.sha256,
+        size_bytes=digest.size_bytes,
+        deduplicated=deduplicated,
+    )
+
+
+def release_media(session: Session, public_path: str) -> None:
+    """Drop one public alias, deleting the blob once nothing references it."""
+    alias = get_alias(session, public_path)
+    if not alias:
+        raise NotFoundError(message="Media not found")
+
+    storage = get_storage()
+    sha256 = alias.sha256
+    suffix = public_path[public_path.rfind("."):]
+    delete_alias(session, alias)
+    remaining = release_blob_reference(session, sha256)
+    session.commit()
+
+    storage.delete(public_path)
+    alias_file = storage.local_path(public_path)
+    if alias_file is not None:
+        for variant in DERIVATIVES:
+            derivative_path(alias_file, variant).unlink(missing_ok=True)
+    if remaining == 0:
+        storage.delete(blob_key(sha256, suffix))
+        blob_file = storage.local_path(blob_key(sha256, suffix))
+        if blob_file is not None:
+            for variant in DERIVATIVES:
+                derivative_path(blob_file, variant).unlink(missing_ok=True)
+
+
+def release_media_url(session: Session, url: str, business_id: int) -> bool:
+    """Release the alias behind a URL this store handed to ``business_id``; False for any other URL."""
+    prefix = get_storage().url("")
+    if not url.startswith(prefix):
+        return False
+    alias = get_alias(session, url[len(prefix):])
+    if alias is None or alias.business_id != business_id:
+        return False
+    release_media(session, alias.public_path)
+    return True
+
+
+def _check_kind(kind: str) -> None:
+    if kind not in MEDIA_KINDS:
+        raise ValidationError(message=f"Unknown media kind: {kind}")
+
+
+def _content_type(suffix: str) -> str:
+    return guess_type(f"file{suffix}")[0] or "application/octet-stream"
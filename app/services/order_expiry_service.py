@@ -0,0 +1,204 @@
+import asyncio
+import logging
+import os
+import socket
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from threading import Lock
+from typing import Any
+from uuid import uuid4
+
+from sqlmodel import Session
+
+from app.repositories.lease_repo import release_lease, try_acquire_lease
+from app.repositories.order_repo import expire_overdue_orders
+from app.repositories.payment_repo import delete_unused_payments
+
+logger = logging.getLogger(__name__)
+
+SWEEPER_LEASE = "order-expiry-sweeper"
+
+
+@dataclass(frozen=True, slots=True)
+class SweepResult:
+    swept: int
+    batches: int
+    # How long the oldest expired reservation had been overdue, or None if nothing was due.
+    lag_seconds: float | None
+
+
+class SweeperStats:
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.runs = 0
+            self.lease_denied = 0
+            self.failures = 0
+            self.swept_total = 0
+            self.last_swept = 0
+            self.last_lag_seconds: float | None = None
+            self.max_lag_seconds = 0.0
+            self.last_run_at: datetime | None = None
+
+    def record(self, result: SweepResult | None, finished_at: datetime) -> None:
+        with self._lock:
+            self.last_run_at = finished_at
+            if result is None:
+                self.lease_denied += 1
+                return
+            self.runs += 1
+            self.swept_total += result.swept
+            self.last_swept = result.swept
+            self.last_lag_seconds = result.lag_seconds
+            if result.lag_seconds is not None:
+                self.max_lag_seconds = max(self.max_lag_seconds, result.lag_seconds)
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "runs": self.runs,
+                "lease_denied": self.lease_denied,
+                "failures": self.failures,
+                "swept_total": self.swept_total,
+                "last_swept": self.last_swept,
+                "last_lag_seconds": None if self.last_lag_seconds is None else round(self.last_lag_seconds, 3),
+                "max_lag_seconds": round(self.max_lag_seconds, 3),
+                "last_run_at": self.last_run_at.isoformat() if self.last_run_at else None,
+            }
+
+
+sweeper_stats = SweeperStats()
+
+
+def sweep_expired_orders(
+    session: Session,
+    holder: str,
+    batch_size: int,
+    max_batches: int,
+    lease_seconds: float,
+    now: datetime | None = None,
+    clock: Callable[[], datetime] = lambda: datetime.now(timezone.utc),
+) -> SweepResult | None:
+    """Move overdue ``reserved`` orders to ``expired``; None if another worker holds the lease.
+
+    ``now`` is the overdue cutoff for the whole sweep. Each batch renews the
+    lease from a fresh ``clock()`` reading and commits on its own, so locks
+    stay short, a long sweep keeps its lease, and a worker that stalls
+    mid-sweep hands over once its lease lapses.
+    """
+    now = now or clock()
+    swept, batches, oldest = 0, 0, None
+    while batches < max_batches:
+        try:
+            leased_at = clock()
+            if not try_acquire_lease(
+                session,
+                SWEEPER_LEASE,
+                holder=holder,
+                now=leased_at,
+                expires_at=leased_at + timedelta(seconds=lease_seconds),
+            ):
+                session.commit()
+                return None if batches == 0 else SweepResult(swept, batches, _lag(now, oldest))
+            expired_ids, batch_oldest = expire_overdue_orders(session, now=now, limit=batch_size)
+            if expired_ids:
+                # Links pre-initialized for these orders were never handed to the customer.
+                delete_unused_payments(session, expired_ids)
+            session.commit()
+        except BaseException:
+            session.rollback()
+            raise
+
+        batches += 1
+        swept += len(expired_ids)
+        if oldest is None:
+            oldest = batch_oldest
+        if len(expired_ids) < batch_size:
+            break
+    return SweepResult(swept, batches, _lag(now, oldest))
+
+
+def _lag(now: datetime, oldest: datetime | None) -> float | None:
+    if oldest is None:
+        return None
+    if oldest.tzinfo is None:
+        # SQLite hands DateTime columns back naive; they were written in UTC.
+        oldest = oldest.replace(tzinfo=timezone.utc)
+    return (now - oldest).total_seconds()
+
+
+class OrderExpirySweeper:
+    """Runs ``sweep_expired_orders`` every ``interval_seconds`` on the event loop's threadpool.
+
+    Every uvicorn worker may start one; the database lease keeps all but one idle.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        interval_seconds: float,
+        batch_size: int,
+        max_batches: int,
+        lease_seconds: float,
+        stats: SweeperStats = sweeper_stats,
+    ) -> None:
+        self.session_factory = session_factory
+        self.interval_seconds = interval_seconds
+        self.batch_size = batch_size
+        self.max_batches = max_batches
+        self.lease_seconds = lease_seconds
+        self.stats = stats
+        self.holder = f"{socket.gethostname()}:{os.getpid()}:{uuid4().hex[:8]}"
+        self._task: asyncio.Task | None = None
+
+    def run_once(self) -> SweepResult | None:
+        with self.session_factory() as session:
+            result = sweep_expired_orders(
+                session,
+                holder=self.holder,
+                batch_size=self.batch_size,
+                max_batches=self.max_batches,
+                lease_seconds=self.lease_seconds,
+            )
+        self.stats.record(result, finished_at=datetime.now(timezone.utc))
+        if result is not None and result.swept:
+            logger.info("Expired %d reservations (lag %.1fs)", result.swept, result.lag_seconds or 0.0)
+        return result
+
+    async def _run_forever(self) -> None:
+        while True:
+            try:
+                await asyncio.to_thread(self.run_once)
+            except Exception:
+                self.stats.record_failure()
+                logger.exception("Order expiry sweep failed")
+            await asyncio.sleep(self.interval_seconds)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run_forever(), name="order-expiry-sweeper")
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        # Let another worker take over now rather than after the lease runs out.
+        await asyncio.to_thread(self._release)
+
+    def _release(self) -> None:
+        with self.session_factory() as session:
+            release_lease(session, SWEEPER_LEASE, holder=self.holder, now=datetime.now(timezone.utc))
+            session.commit()
@@ -0,0 +1,103 @@
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+
+from sqlmodel import Session
+
+from app.core.config import get_settings
+from app.models.order import ORDER_STATUS_RESERVED
+from app.repositories.customer_repo import upsert_customer
+from app.repositories.order_repo import insert_order, insert_order_items
+from app.services.pricing_service import CartLine, Quote, quote_cart
+
+
+@dataclass(frozen=True, slots=True)
+class ReservedOrder:
+    order_id: int
+    customer_id: int
+    status: str
+    expires_at: datetime
+    item_ids: tuple[int, ...]
+    quote: Quote
+
+
+def reserve_order(
+    session: Session,
+    business_id: int,
+    channel_type: str,
+    channel_user_id: str,
+    items: list[CartLine],
+    display_name: str | None = None,
+    delivery_zone_id: int | None = None,
+    delivery_address: str | None = None,
+) -> ReservedOrder:
+    """Upsert the customer, then write the order and its item snapshots in one transaction.
+
+    Each write is a single statement (upsert, ``INSERT .. RETURNING`` for the
+    order, one batched insert for every line) and nothing is refreshed, so a
+    reservation costs a handful of round trips whatever the cart size.
+    Prices are read from the database, never from this worker's listing
+    cache, since they are what the customer will be charged.
+    """
+    quote = quote_cart(
+        session,
+        business_id=business_id,
+        items=items,
+        delivery_zone_id=delivery_zone_id,
+        use_cache=False,
+    )
+    now = datetime.now(timezone.utc)
+    expires_at = now + timedelta(minutes=get_settings().order_reservation_ttl_minutes)
+
+    try:
+        customer_id = upsert_customer(
+            session,
+            business_id=business_id,
+            channel_type=channel_type,
+            channel_user_id=channel_user_id,
+            display_name=display_name,
+        )
+        order_id = insert_order(
+            session,
+            {
+                "business_id": business_id,
+                "customer_id": customer_id,
+                "channel_type": channel_type,
+                "status": ORDER_STATUS_RESERVED,
+                "subtotal_kobo": quote.subtotal_kobo,
+                "delivery_fee_kobo": quote.delivery_fee_kobo,
+                "total_kobo": quote.total_kobo,
+                "platform_fee_kobo": quote.platform_fee_kobo,
+                "business_payout_kobo": quote.business_payout_kobo,
+                "delivery_zone_id": delivery_zone_id,
+                "delivery_address": delivery_address,
+                "expires_at": expires_at,
+                "created_at": now,
+            },
+        )
+        item_ids = insert_order_items(
+            session,
+            [
+                {
+                    "order_id": order_id,
+                    "product_id": line.product_id,
+                    "name_snapshot": line.name,
+                    "unit_price_kobo": line.unit_price_kobo,
+                    "quantity": line.quantity,
+                    "line_total_kobo": line.line_total_kobo,
+                }
+                for line in quote.lines
+            ],
+        )
+        session.commit()
+    except BaseException:
+        session.rollback()
+        raise
+
+    return ReservedOrder(
+        order_id=order_id,
+        customer_id=customer_id,
+        status=ORDER_STATUS_RESERVED,
+        expires_at=expires_at,
+        item_ids=tuple(item_ids),
+        quote=quote,
+    )
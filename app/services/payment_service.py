@@ -0,0 +1,219 @@
+import logging
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from uuid import uuid4
+
+from fastapi.concurrency import run_in_threadpool
+from sqlmodel import Session
+
+from app.core.config import get_settings
+from app.core.errors import AppError, ConflictError, NotFoundError, ValidationError
+from app.models.order import ORDER_STATUS_EXPIRED, ORDER_STATUS_PAYMENT_PENDING, ORDER_STATUS_RESERVED
+from app.models.payment import PAYMENT_STATUS_INITIATED, PAYMENT_STATUS_SUCCESS
+from app.repositories.order_repo import get_order_for_business, mark_order_paid, mark_order_payment_pending
+from app.repositories.payment_repo import (
+    get_open_payment_for_order,
+    get_payment_by_reference,
+    insert_payment,
+    mark_payment_success,
+)
+from app.repositories.payout_repo import get_payout_profile
+from app.services.paystack_service import InitializedTransaction, PaystackEvent, get_paystack_client
+
+logger = logging.getLogger(__name__)
+
+CHARGE_SUCCESS = "charge.success"
+# A verified charge settles the order even if the reservation lapsed while the customer paid.
+PAYABLE_ORDER_STATUSES = (ORDER_STATUS_RESERVED, ORDER_STATUS_PAYMENT_PENDING, ORDER_STATUS_EXPIRED)
+
+
+@dataclass(frozen=True, slots=True)
+class PaymentLink:
+    order_id: int
+    reference: str
+    authorization_url: str
+    preinitialized: bool
+
+
+@dataclass(frozen=True, slots=True)
+class _PayableOrder:
+    id: int
+    business_id: int
+    customer_id: int
+    status: str
+    total_kobo: int
+    platform_fee_kobo: int
+    subaccount_code: str
+    open_payment: PaymentLink | None
+
+
+async def pay_order_service(session: Session, business_id: int, order_id: int) -> PaymentLink:
+    """Hand out the checkout link for a reserved order and mark it ``payment_pending``.
+
+    A link pre-initialized at reservation time is answered from the database;
+    otherwise Paystack is called now, with the platform fee as the flat
+    transaction charge and the rest split to the business subaccount.
+    """
+    order = await run_in_threadpool(_load_payable_order, session, business_id, order_id)
+    if order.open_payment is not None:
+        if not await run_in_threadpool(_hand_out, session, order):
+            raise ConflictError(message="Order is no longer awaiting payment")
+        return order.open_payment
+
+    initialized = await _initialize_transaction(order)
+    await run_in_threadpool(_record_payment, session, order, initialized, True)
+    return PaymentLink(order_id, initialized.reference, initialized.authorization_url, preinitialized=False)
+
+
+async def preinitialize_payment(session_factory: Callable[[], Session], business_id: int, order_id: int) -> bool:
+    """Initialize the Paystack transaction for a fresh reservation ahead of ``pay``.
+
+    Best effort, run after the reservation response: any failure just leaves
+    ``pay`` to initialize synchronously. The order stays ``reserved``, so an
+    unused link is dropped when the reservation expires.
+    """
+    with session_factory() as session:
+        try:
+            order = await run_in_threadpool(_load_payable_order, session, business_id, order_id)
+            if order.open_payment is not None or order.status != ORDER_STATUS_RESERVED:
+                return False
+            initialized = await _initialize_transaction(order)
+            return await run_in_threadpool(_record_payment, session, order, initialized, False)
+        except AppError as exc:
+            logger.info("Payment pre-initialization skipped for order %s: %s", order_id, exc.message)
+            return False
+
+
+def _load_payable_order(session: Session, business_id: int, order_id: int) -> _PayableOrder:
+    try:
+        order = get_order_for_business(session, business_id=business_id, order_id=order_id)
+        if order is None:
+            raise NotFoundError(message="Order not found")
+        if order.status not in (ORDER_STATUS_RESERVED, ORDER_STATUS_PAYMENT_PENDING):
+            raise ConflictError(message=f"Order is {order.status}, not awaiting payment")
+        profile = get_payout_profile(session, business_id)
+        # A profile being reprovisioned keeps paying out to its current subaccount.
+        if profile is None or not profile.paystack_subaccount_code:
+            raise ConflictError(message="Payouts are not set up for this business")
+
+        payment = get_open_payment_for_order(session, order_id)
+        if payment is None and order.status == ORDER_STATUS_PAYMENT_PENDING:
+            raise ConflictError(message="Order payment is already in progress")
+        return _PayableOrder(
+            id=order.id,
+            business_id=order.business_id,
+            customer_id=order.customer_id,
+            status=order.status,
+            total_kobo=order.total_kobo,
+            platform_fee_kobo=order.platform_fee_kobo,
+            subaccount_code=profile.paystack_subaccount_code,
+            open_payment=None
+            if payment is None
+            else PaymentLink(order.id, payment.paystack_reference, payment.authorization_url, preinitialized=True),
+        )
+    finally:
+        # Never hold a transaction open across the Paystack round trip.
+        session.rollback()
+
+
+async def _initialize_transaction(order: _PayableOrder) -> InitializedTransaction:
+    return await get_paystack_client().init_transaction(
+        reference=f"ord_{order.id}_{uuid4().hex[:16]}",
+        email=f"customer-{order.customer_id}@{get_settings().paystack_customer_email_domain}",
+        amount_kobo=order.total_kobo,
+        subaccount_code=order.subaccount_code,
+        transaction_charge_kobo=order.platform_fee_kobo,
+    )
+
+
+def _record_payment(
+    session: Session,
+    order: _PayableOrder,
+    initialized: InitializedTransaction,
+    hand_out: bool,
+) -> bool:
+    try:
+        if not hand_out:
+            current = get_order_for_business(session, business_id=order.business_id, order_id=order.id)
+            if current is None or current.status != ORDER_STATUS_RESERVED:
+                # Paid, expired or handed a link while Paystack was answering.
+                session.rollback()
+                return False
+        insert_payment(
+            session,
+            {
+                "order_id": order.id,
+                "provider": "paystack",
+                "status": PAYMENT_STATUS_INITIATED,
+                "amount_kobo": order.total_kobo,
+                "currency": "NGN",
+                "paystack_reference": initialized.reference,
+                "authorization_url": initialized.authorization_url,
+                "created_at": datetime.now(timezone.utc),
+            },
+        )
+        if hand_out and not mark_order_payment_pending(session, order.id):
+            # Expired (or handed a link by a concurrent pay) while Paystack was answering.
+            session.rollback()
+            raise ConflictError(message="Order is no longer awaiting payment")
+        session.commit()
+    except BaseException:
+        session.rollback()
+        raise
+    return True
+
+
+def _hand_out(session: Session, order: _PayableOrder) -> bool:
+    """Mark the order ``payment_pending`` for its open link; False if the link is gone.
+
+    A reservation that lapsed since it was loaded has lost its unused payment
+    to the expiry sweep, so the link must not be handed out.
+    """
+    try:
+        handed_out = mark_order_payment_pending(session, order.id)
+        if not handed_out:
+            # Already pending (this link was handed out before) is fine; anything else is not.
+            current = get_order_for_business(session, business_id=order.business_id, order_id=order.id)
+            payment = get_payment_by_reference(session, order.open_payment.reference)
+            handed_out = (
+                current is not None
+                and current.status == ORDER_STATUS_PAYMENT_PENDING
+                and payment is not None
+                and payment.status == PAYMENT_STATUS_INITIATED
+            )
+        session.commit()
+    except BaseException:
+        session.rollback()
+        raise
+    return handed_out
+
+
+def apply_paystack_event(session: Session, event: PaystackEvent, raw_payload: str, now: datetime) -> int | None:
+    """Apply a verified Paystack event; the order id if it settled a payment, else None.
+
+    Only ``charge.success`` moves money state. The ``paystack_reference``
+    uniqueness plus the conditional status update make a repeat a no-op, so
+    the inbox may hand the same event over more than once. The caller commits.
+    """
+    if event.event != CHARGE_SUCCESS:
+        return None
+    if not event.reference:
+        raise ValidationError(message="charge.success without a reference")
+
+    payment = get_payment_by_reference(session, event.reference)
+    if payment is None:
+        # The event can beat the commit that stored the payment; let the inbox retry.
+        raise NotFoundError(message=f"No payment for reference {event.reference}")
+    if payment.status == PAYMENT_STATUS_SUCCESS:
+        return None
+    if event.amount_kobo != payment.amount_kobo:
+        raise ValidationError(
+            message="Charged amount does not match the payment",
+            details={"expected_kobo": payment.amount_kobo, "charged_kobo": event.amount_kobo},
+        )
+
+    if not mark_payment_success(session, payment.id, raw_event_json=raw_payload, confirmed_at=now):
+        return None
+    mark_order_paid(session, payment.order_id, from_statuses=PAYABLE_ORDER_STATUSES)
+    return payment.order_id
@@ -0,0 +1,253 @@
+import asyncio
+import logging
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+
+from sqlmodel import Session
+
+from app.core.config import get_settings
+from app.core.errors import NotFoundError, ProviderError
+from app.models.payout_profile import PAYOUT_STATUS_FAILED, PayoutProfile
+from app.repositories.payout_repo import (
+    claim_due_payout_profiles,
+    get_payout_profile,
+    mark_payout_active,
+    release_payout_attempt,
+    save_pending_payout_profile,
+)
+from app.services.money import FEE_RATE
+from app.services.paystack_service import PaystackClient, get_paystack_client
+
+logger = logging.getLogger(__name__)
+
+RETRY_BASE_SECONDS = 30.0
+RETRY_MAX_SECONDS = 3600.0
+# Paystack applies this to the subaccount's share when a transaction sets no
+# flat transaction_charge; payment initialization always sets one.
+SUBACCOUNT_PERCENTAGE_CHARGE = float(FEE_RATE * 100)
+
+
+def request_payout_setup_service(
+    session: Session,
+    business_id: int,
+    bank_name: str,
+    account_number: str,
+    account_name: str,
+) -> PayoutProfile:
+    """Record the bank details as ``pending`` and leave the subaccount to the provisioning job.
+
+    Paystack is never sent ``account_name``, so changing only the name keeps
+    the profile's subaccount and its provisioning state.
+    """
+    existing = get_payout_profile(session, business_id)
+    if (
+        existing is not None
+        and existing.status != PAYOUT_STATUS_FAILED
+        and (existing.bank_name, existing.account_number) == (bank_name, account_number)
+    ):
+        if existing.account_name != account_name:
+            existing.account_name = account_name
+            session.add(existing)
+            session.commit()
+            session.refresh(existing)
+        return existing
+
+    profile = save_pending_payout_profile(
+        session,
+        business_id=business_id,
+        bank_name=bank_name,
+        account_number=account_number,
+        account_name=account_name,
+        now=datetime.now(timezone.utc),
+    )
+    session.commit()
+    session.refresh(profile)
+    return profile
+
+
+def get_payout_status_service(session: Session, business_id: int) -> PayoutProfile:
+    profile = get_payout_profile(session, business_id)
+    if profile is None:
+        raise NotFoundError(message="Payout profile not found")
+    return profile
+
+
+@dataclass(frozen=True, slots=True)
+class ProvisionResult:
+    claimed: int
+    activated: int
+    retried: int
+    failed: int
+
+
+async def provision_due_payouts(
+    session_factory: Callable[[], Session],
+    client: PaystackClient,
+    batch_size: int,
+    lock_seconds: float,
+    max_attempts: int,
+    now: datetime | None = None,
+    business_id: int | None = None,
+) -> ProvisionResult:
+    """Create Paystack subaccounts for one batch of pending profiles, concurrently.
+
+    Provider 4xx answers (an unknown bank or account) fail the profile at once;
+    anything else is retried with exponential backoff up to ``max_attempts``.
+    No transaction is held open while Paystack is working.
+    """
+    now = now or datetime.now(timezone.utc)
+    locked_until = now + timedelta(seconds=lock_seconds)
+    jobs = await asyncio.to_thread(_claim, session_factory, now, locked_until, batch_size, business_id)
+    if not jobs:
+        return ProvisionResult(0, 0, 0, 0)
+
+    outcomes = await asyncio.gather(*(_provision_subaccount(client, job) for job in jobs), return_exceptions=True)
+    for outcome in outcomes:
+        # Cancellation comes back as a result too; the claims simply lapse.
+        if isinstance(outcome, asyncio.CancelledError):
+            raise outcome
+    return await asyncio.to_thread(_record, session_factory, list(zip(jobs, outcomes)), now, max_attempts)
+
+
+async def _provision_subaccount(client: PaystackClient, job) -> str:
+    # Tags the subaccount with the setup it was made for, so a retry can find it.
+    metadata = {"business_id": job.business_id, "setup_version": job.setup_version}
+    if job.attempts > 1:
+        # An earlier attempt may have created it before timing out or failing with a 5xx.
+        existing = await client.find_subaccount(job.account_number, metadata, created_after=job.created_at)
+        if existing is not None:
+            return existing
+    return await client.create_subaccount(
+        business_name=job.business_name,
+        settlement_bank=job.bank_name,
+        account_number=job.account_number,
+        percentage_charge=SUBACCOUNT_PERCENTAGE_CHARGE,
+        metadata=metadata,
+    )
+
+
+def _claim(
+    session_factory: Callable[[], Session],
+    now: datetime,
+    locked_until: datetime,
+    limit: int,
+    business_id: int | None,
+) -> list:
+    with session_factory() as session:
+        jobs = claim_due_payout_profiles(
+            session, now=now, locked_until=locked_until, limit=limit, business_id=business_id
+        )
+        session.commit()
+        return jobs
+
+
+def _record(
+    session_factory: Callable[[], Session],
+    outcomes: list[tuple],
+    now: datetime,
+    max_attempts: int,
+) -> ProvisionResult:
+    activated = retried = failed = 0
+    with session_factory() as session:
+        for job, outcome in outcomes:
+            if not isinstance(outcome, Exception):
+                if mark_payout_active(session, job, subaccount_code=outcome):
+                    activated += 1
+                continue
+
+            retry_at = None
+            if not _is_permanent(outcome) and job.attempts < max_attempts:
+                retry_at = now + timedelta(seconds=_retry_delay(job.attempts))
+            message = getattr(outcome, "message", None) or str(outcome) or type(outcome).__name__
+            if retry_at is None:
+                failed += 1
+                logger.error("Payout provisioning for business %s failed: %s", job.business_id, message)
+            else:
+                retried += 1
+                logger.warning("Payout provisioning for business %s will retry: %s", job.business_id, message)
+            release_payout_attempt(session, job, error=message, retry_at=retry_at)
+        session.commit()
+    return ProvisionResult(claimed=len(outcomes), activated=activated, retried=retried, failed=failed)
+
+
+async def provision_payout_inline(session_factory: Callable[[], Session], business_id: int) -> ProvisionResult:
+    """Provision ``business_id``'s profile on its own request, for deployments that run no provisioning worker.
+
+    Only a due profile is claimed, so a failed attempt is retried, after its
+    backoff, by a later setup or status request from the same business.
+    """
+    settings = get_settings()
+    return await provision_due_payouts(
+        session_factory,
+        get_paystack_client(),
+        batch_size=1,
+        lock_seconds=settings.payout_provisioning_lock_seconds,
+        max_attempts=settings.payout_provisioning_max_attempts,
+        business_id=business_id,
+    )
+
+
+def _retry_delay(attempts: int) -> float:
+    return min(RETRY_BASE_SECONDS * 2 ** (attempts - 1), RETRY_MAX_SECONDS)
+
+
+def _is_permanent(exc: Exception) -> bool:
+    status_code = (exc.details or {}).get("status_code") if isinstance(exc, ProviderError) else None
+    return status_code is not None and 400 <= status_code < 500 and status_code != 429
+
+
+class PayoutProvisioningWorker:
+    """Polls for pending payout profiles every ``poll_interval_seconds``.
+
+    Safe to run in every uvicorn worker: claims lock rows, and a lock that
+    lapses (a worker died mid-call) makes the profile due again.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        poll_interval_seconds: float,
+        batch_size: int,
+        lock_seconds: float,
+        max_attempts: int,
+    ) -> None:
+        self.session_factory = session_factory
+        self.poll_interval_seconds = poll_interval_seconds
+        self.batch_size = batch_size
+        self.lock_seconds = lock_seconds
+        self.max_attempts = max_attempts
+        self._task: asyncio.Task | None = None
+
+    async def run_once(self) -> ProvisionResult:
+        return await provision_due_payouts(
+            self.session_factory,
+            get_paystack_client(),
+            batch_size=self.batch_size,
+            lock_seconds=self.lock_seconds,
+            max_attempts=self.max_attempts,
+        )
+
+    async def _run_forever(self) -> None:
+        while True:
+            try:
+                result = await self.run_once()
+                if result.claimed == self.batch_size:
+                    continue
+            except Exception:
+                logger.exception("Payout provisioning run failed")
+            await asyncio.sleep(self.poll_interval_seconds)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run_forever(), name="payout-provisioning")
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
@@ -0,0 +1,283 @@
+import asyncio
+import hashlib
+import hmac
+import importlib.util
+import json
+import random
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any
+
+import httpx
+
+from app.core.circuit_breaker import CircuitBreaker
+from app.core.config import get_settings
+from app.core.errors import AuthError, ProviderError, ValidationError
+
+PAYSTACK_SIGNATURE_HEADER = "x-paystack-signature"
+
+
+@dataclass(frozen=True, slots=True)
+class PaystackEvent:
+    event: str
+    reference: str | None
+    amount_kobo: int | None
+    data: dict[str, Any]
+    body_sha256: str = ""
+
+    @property
+    def key(self) -> str:
+        """Deduplication key: the reference, else Paystack's own id, else the exact body.
+
+        Many event types carry no reference, and keying those on ``None``
+        would make every later event of the type look like a redelivery.
+        """
+        if self.reference is not None:
+            return f"{self.event}:{self.reference}"
+        if self.data.get("id") is not None:
+            return f"{self.event}:id:{self.data['id']}"
+        return f"{self.event}:sha256:{self.body_sha256}"
+
+
+def verify_paystack_signature(raw_body: bytes, signature: str | None, secret_key: str) -> None:
+    """Check ``x-paystack-signature``: hex HMAC-SHA512 of the exact request bytes under the secret key."""
+    if not secret_key:
+        raise AuthError(message="Paystack webhook signing is not configured")
+    if not signature:
+        raise AuthError(message="Missing Paystack signature")
+    expected = hmac.new(secret_key.encode(), raw_body, hashlib.sha512).hexdigest()
+    if not hmac.compare_digest(expected, signature.strip().lower()):
+        raise AuthError(message="Invalid Paystack signature")
+
+
+def parse_webhook_event(raw_body: bytes) -> PaystackEvent:
+    try:
+        payload = json.loads(raw_body)
+    except ValueError as exc:
+        raise ValidationError(message="Webhook body is not JSON") from exc
+    if not isinstance(payload, dict) or not isinstance(payload.get("event"), str):
+        raise ValidationError(message="Webhook body has no event")
+
+    data = payload.get("data") if isinstance(payload.get("data"), dict) else {}
+    reference = data.get("reference")
+    amount = data.get("amount")
+    return PaystackEvent(
+        event=payload["event"],
+        reference=str(reference) if reference is not None else None,
+        amount_kobo=amount if isinstance(amount, int) else None,
+        data=data,
+        body_sha256=hashlib.sha256(raw_body).hexdigest(),
+    )
+
+
+@dataclass(frozen=True, slots=True)
+class InitializedTransaction:
+    reference: str
+    authorization_url: str
+    access_code: str
+
+
+# Initialization sits on the customer's path, so it gets the shortest read budget.
+INIT_TIMEOUT = httpx.Timeout(8.0, connect=3.0)
+VERIFY_TIMEOUT = httpx.Timeout(10.0, connect=3.0)
+SUBACCOUNT_TIMEOUT = httpx.Timeout(20.0, connect=3.0)
+SUBACCOUNT_PAGE_SIZE = 100
+RETRY_BASE_SECONDS = 0.2
+RETRY_MAX_SECONDS = 2.0
+# Failures where the request provably never reached Paystack.
+_NOT_SENT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
+
+class PaystackClient:
+    """Async Paystack API client sharing one keep-alive connection pool.
+
+    Requests that never reached Paystack (connect errors) are always retried.
+    Timeouts, 429s and 5xx are retried only for idempotent calls, because
+    Paystack has no idempotency keys. Retries back off with full jitter.
+    Transport errors and 5xx feed a circuit breaker, so while Paystack is
+    degraded callers get a 503 at once instead of waiting out every timeout.
+    """
+
+    def __init__(
+        self,
+        secret_key: str,
+        base_url: str,
+        max_retries: int,
+        breaker: CircuitBreaker,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ) -> None:
+        self.max_retries = max_retries
+        self.breaker = breaker
+        self._client = httpx.AsyncClient(
+            base_url=base_url,
+            headers={"Authorization": f"Bearer {secret_key}"},
+            http2=transport is None and importlib.util.find_spec("h2") is not None,
+            limits=httpx.Limits(max_connections=50, max_keepalive_connections=20, keepalive_expiry=60.0),
+            timeout=VERIFY_TIMEOUT,
+            transport=transport,
+        )
+
+    async def init_transaction(
+        self,
+        reference: str,
+        email: str,
+        amount_kobo: int,
+        subaccount_code: str | None = None,
+        transaction_charge_kobo: int | None = None,
+        callback_url: str | None = None,
+    ) -> InitializedTransaction:
+        payload: dict[str, Any] = {"reference": reference, "email": email, "amount": amount_kobo}
+        if subaccount_code:
+            # The platform keeps a flat transaction_charge; the rest settles to the subaccount.
+            payload.update(subaccount=subaccount_code, transaction_charge=transaction_charge_kobo, bearer="subaccount")
+        if callback_url:
+            payload["callback_url"] = callback_url
+        data = await self._request("POST", "/transaction/initialize", INIT_TIMEOUT, idempotent=False, json=payload)
+        return InitializedTransaction(
+            reference=data["reference"],
+            authorization_url=data["authorization_url"],
+            access_code=data["access_code"],
+        )
+
+    async def verify_transaction(self, reference: str) -> dict[str, Any]:
+        return await self._request("GET", f"/transaction/verify/{reference}", VERIFY_TIMEOUT, idempotent=True)
+
+    async def create_subaccount(
+        self,
+        business_name: str,
+        settlement_bank: str,
+        account_number: str,
+        percentage_charge: float,
+        metadata: dict[str, Any] | None = None,
+    ) -> str:
+        payload: dict[str, Any] = {
+            "business_name": business_name,
+            "settlement_bank": settlement_bank,
+            "account_number": account_number,
+            "percentage_charge": percentage_charge,
+        }
+        if metadata:
+            payload["metadata"] = json.dumps(metadata)
+        data = await self._request("POST", "/subaccount", SUBACCOUNT_TIMEOUT, idempotent=False, json=payload)
+        return data["subaccount_code"]
+
+    async def find_subaccount(self, account_number: str, metadata: dict[str, Any], created_after: datetime) -> str | None:
+        """Code of a subaccount created since ``created_after`` with this account number and metadata, if any.
+
+        Paystack has no idempotency keys, so this is how a retry finds out
+        whether an earlier ``create_subaccount`` that timed out went through.
+        """
+        page = 1
+        while True:
+            subaccounts = await self._request(
+                "GET",
+                "/subaccount",
+                VERIFY_TIMEOUT,
+                idempotent=True,
+                params={"perPage": SUBACCOUNT_PAGE_SIZE, "page": page, "from": created_after.isoformat()},
+            )
+            for subaccount in subaccounts:
+                if subaccount.get("account_number") == account_number and _metadata(subaccount) == metadata:
+                    return subaccount["subaccount_code"]
+            if len(subaccounts) < SUBACCOUNT_PAGE_SIZE:
+                return None
+            page += 1
+
+    async def _request(
+        self,
+        method: str,
+        path: str,
+        timeout: httpx.Timeout,
+        idempotent: bool,
+        json: dict[str, Any] | None = None,
+        params: dict[str, Any] | None = None,
+    ) -> Any:
+        attempt = 0
+        while True:
+            self.breaker.before_call()
+            transport_error: httpx.TransportError | None = None
+            try:
+                response = await self._client.request(method, path, json=json, params=params, timeout=timeout)
+            except httpx.TransportError as exc:
+                self.breaker.record_failure()
+                transport_error = exc
+            else:
+                if response.status_code >= 500:
+                    self.breaker.record_failure()
+                else:
+                    self.breaker.record_success()
+            finally:
+                # No-op once an outcome is recorded; otherwise the trial would hold the circuit half-open forever.
+                self.breaker.release_trial()
+
+            if transport_error is not None:
+                retryable = idempotent or isinstance(transport_error, _NOT_SENT_ERRORS)
+                if retryable and attempt < self.max_retries:
+                    attempt = await self._back_off(attempt)
+                    continue
+                raise ProviderError(
+                    message=f"Paystack unreachable: {type(transport_error).__name__}"
+                ) from transport_error
+            if (response.status_code == 429 or response.status_code >= 500) and idempotent:
+                if attempt < self.max_retries:
+                    attempt = await self._back_off(attempt)
+                    continue
+            return _unwrap(response)
+
+    async def _back_off(self, attempt: int) -> int:
+        await asyncio.sleep(random.uniform(0, min(RETRY_MAX_SECONDS, RETRY_BASE_SECONDS * 2**attempt)))
+        return attempt + 1
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+
+def _metadata(resource: dict[str, Any]) -> Any:
+    # Sent as a JSON string; Paystack echoes it back as a string or an object.
+    metadata = resource.get("metadata")
+    if isinstance(metadata, str):
+        try:
+            return json.loads(metadata)
+        except ValueError:
+            return None
+    return metadata
+
+
+def _unwrap(response: httpx.Response) -> Any:
+    try:
+        body = response.json()
+    except ValueError:
+        body = {}
+    if response.is_success and body.get("status") is True:
+        return body.get("data") or {}
+    raise ProviderError(
+        message=body.get("message") or f"Paystack returned HTTP {response.status_code}",
+        details={"status_code": response.status_code},
+    )
+
+
+_client: PaystackClient | None = None
+
+
+def get_paystack_client() -> PaystackClient:
+    global _client
+    if _client is None:
+        settings = get_settings()
+        _client = PaystackClient(
+            secret_key=settings.paystack_secret_key,
+            base_url=settings.paystack_base_url,
+            max_retries=settings.paystack_max_retries,
+            breaker=CircuitBreaker(
+                failure_threshold=settings.paystack_breaker_failure_threshold,
+                reset_timeout_seconds=settings.paystack_breaker_reset_seconds,
+                name="Paystack",
+            ),
+        )
+    return _client
+
+
+async def close_paystack_client() -> None:
+    global _client
+    if _client is not None:
+        client, _client = _client, None
+        await client.aclose()
@@ -0,0 +1,138 @@
+from dataclasses import dataclass
+
+from sqlmodel import Session
+
+from app.core.errors import NotFoundError, ValidationError
+from app.repositories.business_repo import get_listing_versions
+from app.repositories.delivery_repo import get_delivery_zone_by_id
+from app.repositories.product_repo import list_active_products_by_ids
+from app.services.delivery_service import delivery_zone_cache
+from app.services.money import calc_platform_fee_kobo
+from app.services.product_service import catalog_cache
+
+# Page key of the unpaginated listing, which doubles as the tenant's catalog snapshot.
+FULL_LISTING = (None, None)
+# Keeps every line total, and so the order total, far inside a signed 64-bit kobo column.
+MAX_LINE_QUANTITY = 1000
+
+
+@dataclass(frozen=True, slots=True)
+class CartLine:
+    product_id: int
+    quantity: int
+
+
+@dataclass(frozen=True, slots=True)
+class PricedLine:
+    product_id: int
+    name: str
+    unit_price_kobo: int
+    quantity: int
+    line_total_kobo: int
+
+
+@dataclass(frozen=True, slots=True)
+class Quote:
+    lines: tuple[PricedLine, ...]
+    subtotal_kobo: int
+    delivery_fee_kobo: int
+    total_kobo: int
+    platform_fee_kobo: int
+    business_payout_kobo: int
+
+
+def quote_cart(
+    session: Session,
+    business_id: int,
+    items: list[CartLine],
+    delivery_zone_id: int | None = None,
+    use_cache: bool = True,
+) -> Quote:
+    """Price a cart against the tenant's active products and delivery zones.
+
+    One lookup reads the tenant's listing versions; prices then come from the
+    cached catalog snapshot for that version when one is warm, otherwise from
+    a single ``IN`` query for every product in the cart, plus at most one
+    delivery-zone lookup. Unknown, inactive or foreign ids are a 404.
+
+    ``use_cache=False`` skips the versions and snapshots and reads straight
+    from the database, for callers that charge the price they get back.
+    """
+    if not items:
+        raise ValidationError(message="Cart is empty")
+    for item in items:
+        if isinstance(item.quantity, bool) or not isinstance(item.quantity, int) or item.quantity < 1:
+            raise ValidationError(message="quantity must be a positive integer")
+        if item.quantity > MAX_LINE_QUANTITY:
+            raise ValidationError(message=f"quantity must be at most {MAX_LINE_QUANTITY}")
+
+    catalog_version, delivery_zone_version = get_listing_versions(session, business_id) if use_cache else (None, None)
+    products = _resolve_products(session, business_id, {item.product_id for item in items}, catalog_version)
+    lines = tuple(
+        PricedLine(
+            product_id=item.product_id,
+            name=products[item.product_id][0],
+            unit_price_kobo=products[item.product_id][1],
+            quantity=item.quantity,
+            line_total_kobo=products[item.product_id][1] * item.quantity,
+        )
+        for item in items
+    )
+
+    subtotal_kobo = sum(line.line_total_kobo for line in lines)
+    delivery_fee_kobo = _resolve_delivery_fee(session, business_id, delivery_zone_id, delivery_zone_version)
+    total_kobo = subtotal_kobo + delivery_fee_kobo
+    platform_fee_kobo = calc_platform_fee_kobo(total_kobo)
+    return Quote(
+        lines=lines,
+        subtotal_kobo=subtotal_kobo,
+        delivery_fee_kobo=delivery_fee_kobo,
+        total_kobo=total_kobo,
+        platform_fee_kobo=platform_fee_kobo,
+        business_payout_kobo=total_kobo - platform_fee_kobo,
+    )
+
+
+def _resolve_products(
+    session: Session,
+    business_id: int,
+    product_ids: set[int],
+    catalog_version: int | None,
+) -> dict[int, tuple[str, int]]:
+    snapshot = None if catalog_version is None else catalog_cache.get(business_id, catalog_version, FULL_LISTING)
+    if snapshot is not None:
+        found = {item.id: (item.name, item.base_price_kobo) for item in snapshot.items if item.id in product_ids}
+    else:
+        products = list_active_products_by_ids(session, business_id=business_id, product_ids=sorted(product_ids))
+        found = {product.id: (product.name, product.base_price_kobo) for product in products}
+
+    missing = sorted(product_ids - found.keys())
+    if missing:
+        raise NotFoundError(message="Product not found", details={"product_ids": missing})
+    return found
+
+
+def _resolve_delivery_fee(
+    session: Session,
+    business_id: int,
+    delivery_zone_id: int | None,
+    delivery_zone_version: int | None,
+) -> int:
+    if delivery_zone_id is None:
+        return 0
+
+    snapshot = (
+        None
+        if delivery_zone_version is None
+        else delivery_zone_cache.get(business_id, delivery_zone_version, FULL_LISTING)
+    )
+    if snapshot is not None:
+        for zone in snapshot.items:
+            if zone.id == delivery_zone_id:
+                return zone.fee_kobo
+        raise NotFoundError(message="Delivery zone not found")
+
+    zone = get_delivery_zone_by_id(session, business_id=business_id, zone_id=delivery_zone_id)
+    if not zone or not zone.is_active:
+        raise NotFoundError(message="Delivery zone not found")
+    return zone.fee_kobo
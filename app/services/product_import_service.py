@@ -0,0 +1,171 @@
+import csv
+import io
+import json
+import re
+from collections.abc import AsyncIterator, Iterator
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, BinaryIO
+
+from fastapi.concurrency import run_in_threadpool
+from sqlmodel import Session
+
+from app.core.config import get_settings
+from app.core.errors import ValidationError
+from app.core.streams import BlockingByteStream
+from app.repositories.product_repo import insert_products
+from app.services.money import naira_to_kobo
+from app.services.product_service import catalog_cache
+
+CSV_CONTENT_TYPES = {"text/csv", "application/csv"}
+NDJSON_CONTENT_TYPES = {"application/x-ndjson", "application/ndjson", "application/jsonl"}
+REQUIRED_CSV_COLUMNS = {"name", "base_price_naira"}
+
+_WHOLE_NAIRA = re.compile(r"^\d{1,19}$")
+# Prices are stored as int64 kobo.
+MAX_BASE_PRICE_NAIRA = (2**63 - 1) // 100
+
+
+@dataclass
+class ImportRowError:
+    row: int
+    message: str
+
+
+@dataclass
+class ProductImportReport:
+    created: int = 0
+    failed: int = 0
+    errors: list[ImportRowError] = field(default_factory=list)
+
+
+async def import_products_stream_service(
+    session: Session,
+    business_id: int,
+    body: AsyncIterator[bytes],
+    content_type: str | None,
+) -> ProductImportReport:
+    return await run_in_threadpool(
+        import_products_service,
+        session,
+        business_id=business_id,
+        stream=BlockingByteStream(body),
+        content_type=content_type,
+    )
+
+
+def import_products_service(
+    session: Session,
+    business_id: int,
+    stream: BinaryIO,
+    content_type: str | None,
+) -> ProductImportReport:
+    settings = get_settings()
+    media_type = (content_type or "").split(";")[0].strip().lower()
+    text = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+    if media_type in CSV_CONTENT_TYPES:
+        records = _csv_records(text)
+    elif media_type in NDJSON_CONTENT_TYPES:
+        records = _ndjson_records(text)
+    else:
+        raise ValidationError(message="Import must be text/csv or application/x-ndjson")
+
+    report = ProductImportReport()
+    created_at = datetime.now(timezone.utc)
+    batch: list[dict] = []
+    try:
+        for row_number, record in records:
+            try:
+                batch.append(_product_row(record, business_id=business_id, created_at=created_at))
+            except ValueError as exc:
+                report.failed += 1
+                if len(report.errors) < settings.product_import_max_reported_errors:
+                    report.errors.append(ImportRowError(row=row_number, message=str(exc)))
+                continue
+
+            if len(batch) >= settings.product_import_batch_size:
+                insert_products(session, batch)
+                report.created += len(batch)
+                batch = []
+
+        insert_products(session, batch)
+        report.created += len(batch)
+        if report.created:
+            catalog_cache.invalidate(session, business_id)
+        session.commit()
+    except (UnicodeDecodeError, csv.Error) as exc:
+        # The stream itself is unreadable, so no row boundary can be trusted after this point.
+        session.rollback()
+        message = "Import must be UTF-8 text" if isinstance(exc, UnicodeDecodeError) else f"Malformed CSV: {exc}"
+        raise ValidationError(message=message) from exc
+    except BaseException:
+        session.rollback()
+        raise
+
+    return report
+
+
+def _csv_records(text: io.TextIOBase) -> Iterator[tuple[int, Any]]:
+    reader = csv.DictReader(text)
+    columns = {name.strip() for name in reader.fieldnames or []}
+    missing = REQUIRED_CSV_COLUMNS - columns
+    if missing:
+        raise ValidationError(message=f"CSV header is missing: {', '.join(sorted(missing))}")
+
+    for row_number, row in enumerate(reader, start=1):
+        if None in row:
+            yield row_number, ValueError("Too many columns")
+            continue
+        yield row_number, {key.strip(): value for key, value in row.items()}
+
+
+def _ndjson_records(text: io.TextIOBase) -> Iterator[tuple[int, Any]]:
+    for row_number, line in enumerate(text, start=1):
+        if not line.strip():
+            continue
+        try:
+            yield row_number, json.loads(line)
+        except json.JSONDecodeError:
+            yield row_number, ValueError("Invalid JSON")
+
+
+def _product_row(record: Any, business_id: int, created_at: datetime) -> dict:
+    if isinstance(record, ValueError):
+        raise record
+    if not isinstance(record, dict):
+        raise ValueError("Row must be an object")
+
+    name = record.get("name")
+    if not isinstance(name, str) or not name.strip():
+        raise ValueError("name is required")
+
+    description = record.get("description") or None
+    image_url = record.get("image_url") or None
+    if description is not None and not isinstance(description, str):
+        raise ValueError("description must be a string")
+    if image_url is not None and not isinstance(image_url, str):
+        raise ValueError("image_url must be a string")
+
+    return {
+        "business_id": business_id,
+        "name": name,
+        "description": description,
+        "base_price_kobo": naira_to_kobo(_whole_naira(record.get("base_price_naira"))),
+        "image_url": image_url,
+        "is_active": True,
+        "created_at": created_at,
+    }
+
+
+def _whole_naira(value: Any) -> int:
+    # CSV cells arrive as text; NDJSON must already be an integer.
+    naira = None
+    if isinstance(value, str) and _WHOLE_NAIRA.match(value.strip()):
+        naira = int(value.strip())
+    elif isinstance(value, int) and not isinstance(value, bool):
+        naira = value
+    if naira is None or naira < 0:
+        raise ValueError("base_price_naira must be a whole, non-negative number of naira")
+    if naira > MAX_BASE_PRICE_NAIRA:
+        raise ValueError(f"base_price_naira must be at most {MAX_BASE_PRICE_NAIRA}")
+    return naira
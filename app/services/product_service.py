@@ -1,17 +1,65 @@
+from collections import defaultdict
+from dataclasses import dataclass, field
 from pathlib import Path
-from uuid import uuid4
+from typing import BinaryIO
 
-from fastapi import UploadFile
 from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.core.config import get_settings
 from app.core.errors import NotFoundError, ValidationError
+from app.core.pagination import Page, build_page, resolve_page_request
+from app.core.storage import get_storage
+from app.models.business import Business
 from app.models.product import Product
-from app.repositories.product_repo import create_product, get_product_by_id, list_active_products, save_product
+from app.repositories.product_repo import (
+    create_product,
+    get_product_active_flags,
+    get_product_by_id,
+    get_product_image_urls,
+    list_active_products,
+    list_active_products_async,
+    list_image_urls_in_use,
+    list_products_by_ids,
+    save_product,
+    scale_product_prices,
+    update_products_per_row,
+    update_products_set_values,
+)
+from app.services.image_derivative_service import derivative_urls, schedule_derivatives
+from app.services.listing_cache import ListingCache
+from app.services.media_store_service import (
+    DirectUpload,
+    StoredMedia,
+    blob_key,
+    complete_direct_upload,
+    create_direct_upload,
+    release_media_url,
+    store_media_stream,
+)
 from app.services.money import naira_to_kobo
 
 
-ALLOWED_EXTENSIONS = {".jpg", ".jpeg", ".png", ".webp"}
+BATCH_UPDATE_FIELDS = ("name", "description", "base_price_naira", "image_url", "is_active")
+
+
+@dataclass(frozen=True, slots=True)
+class ProductSnapshot:
+    id: int
+    name: str
+    description: str | None
+    base_price_kobo: int
+    image_url: str | None
+    is_active: bool
+    image_variants: dict[str, str] = field(default_factory=dict)
+
+
+_settings = get_settings()
+catalog_cache = ListingCache(
+    maxsize=_settings.catalog_cache_max_entries,
+    ttl_seconds=_settings.catalog_cache_ttl_seconds,
+    version_column=Business.catalog_version,
+)
 
 
 def create_product_service(
@@ -23,7 +71,9 @@ def create_product_service(
     image_url: str | None,
 ) -> Product:
     base_price_kobo = naira_to_kobo(base_price_naira)
-    return create_product(
+    # create_product commits, taking the version bump with it.
+    catalog_cache.invalidate(session, business_id)
+    product = create_product(
         session,
         business_id=business_id,
         name=name,
@@ -31,10 +81,60 @@ def create_product_service(
         base_price_kobo=base_price_kobo,
         image_url=image_url,
     )
+    return product
+
+
+def list_products_service(
+    session: Session,
+    business_id: int,
+    cursor: str | None = None,
+    limit: int | None = None,
+) -> Page[ProductSnapshot]:
+    before_id, limit = resolve_page_request(cursor, limit)
+    version = catalog_cache.version(session, business_id)
+    cached = catalog_cache.get(business_id, version, (before_id, limit))
+    if cached is not None:
+        return cached
+
+    fetch_limit = limit + 1 if limit is not None else None
+    products = list_active_products(session, business_id=business_id, before_id=before_id, limit=fetch_limit)
+    page = build_page([_snapshot(product) for product in products], limit)
+    return catalog_cache.put(business_id, version, (before_id, limit), page)
+
+
+async def list_products_service_async(
+    session: AsyncSession,
+    business_id: int,
+    cursor: str | None = None,
+    limit: int | None = None,
+) -> Page[ProductSnapshot]:
+    before_id, limit = resolve_page_request(cursor, limit)
+    version = await catalog_cache.version_async(session, business_id)
+    cached = catalog_cache.get(business_id, version, (before_id, limit))
+    if cached is not None:
+        return cached
+
+    fetch_limit = limit + 1 if limit is not None else None
+    products = await list_active_products_async(
+        session,
+        business_id=business_id,
+        before_id=before_id,
+        limit=fetch_limit,
+    )
+    page = build_page([_snapshot(product) for product in products], limit)
+    return catalog_cache.put(business_id, version, (before_id, limit), page)
 
 
-def list_products_service(session: Session, business_id: int) -> list[Product]:
-    return list_active_products(session, business_id=business_id)
+def _snapshot(product: Product) -> ProductSnapshot:
+    return ProductSnapshot(
+        id=product.id,
+        name=product.name,
+        description=product.description,
+        base_price_kobo=product.base_price_kobo,
+        image_url=product.image_url,
+        is_active=product.is_active,
+        image_variants=derivative_urls(product.image_url),
+    )
 
 
 def update_product_service(
@@ -56,10 +156,93 @@ def update_product_service(
         product.description = description
     if base_price_naira is not None:
         product.base_price_kobo = naira_to_kobo(base_price_naira)
+    previous_image_url = product.image_url
     if image_url is not None:
         product.image_url = image_url
 
-    return save_product(session, product)
+    catalog_cache.invalidate(session, business_id)
+    saved = save_product(session, product)
+    if previous_image_url and previous_image_url != saved.image_url:
+        _release_replaced_images(session, business_id, {previous_image_url})
+    return saved
+
+
+def batch_update_products_service(session: Session, business_id: int, changes: list[dict]) -> list[Product]:
+    """Apply many product changes in one transaction.
+
+    Each change is a dict with ``id`` plus any of ``BATCH_UPDATE_FIELDS`` or
+    ``price_change_percent``. Changes that set the same columns share one
+    UPDATE statement; the whole batch fails with 404 if any id is not an
+    active product of this business (unless the change sets ``is_active``).
+    """
+    product_ids = [change["id"] for change in changes]
+    if len(set(product_ids)) != len(product_ids):
+        raise ValidationError(message="Each product may appear only once per batch")
+
+    flags = get_product_active_flags(session, business_id=business_id, product_ids=product_ids)
+    missing = [
+        change["id"]
+        for change in changes
+        if change["id"] not in flags or (not flags[change["id"]] and "is_active" not in change)
+    ]
+    if missing:
+        raise NotFoundError(message="Product not found", details={"product_ids": missing})
+
+    image_changes = {change["id"]: change["image_url"] for change in changes if change.get("image_url") is not None}
+    replaced_images: set[str] = set()
+    if image_changes:
+        previous_images = get_product_image_urls(session, business_id=business_id, product_ids=list(image_changes))
+        replaced_images = {
+            url for product_id, url in previous_images.items() if url and url != image_changes[product_id]
+        }
+
+    by_shape: dict[tuple[str, ...], list[dict]] = defaultdict(list)
+    by_percent: dict[int, list[int]] = defaultdict(list)
+    for change in changes:
+        values = _column_values(change)
+        if values:
+            by_shape[tuple(sorted(values))].append({"product_id": change["id"], **values})
+        if change.get("price_change_percent") is not None:
+            by_percent[change["price_change_percent"]].append(change["id"])
+
+    try:
+        for fields, rows in by_shape.items():
+            first = {field: rows[0][field] for field in fields}
+            if all({field: row[field] for field in fields} == first for row in rows):
+                ids = [row["product_id"] for row in rows]
+                update_products_set_values(session, business_id=business_id, product_ids=ids, values=first)
+            else:
+                update_products_per_row(session, business_id=business_id, fields=fields, rows=rows)
+        for percent, ids in by_percent.items():
+            scale_product_prices(session, business_id=business_id, product_ids=ids, percent=percent)
+        catalog_cache.invalidate(session, business_id)
+        session.commit()
+    except BaseException:
+        session.rollback()
+        raise
+
+    if replaced_images:
+        _release_replaced_images(session, business_id, replaced_images)
+    return list_products_by_ids(session, business_id=business_id, product_ids=product_ids)
+
+
+def _release_replaced_images(session: Session, business_id: int, image_urls: set[str]) -> None:
+    # Runs after the product commit. Deactivated products keep their image
+    # (a batch PATCH can bring them back), so only URLs no product of the
+    # business points at any more give up their alias.
+    in_use = list_image_urls_in_use(session, business_id=business_id, image_urls=list(image_urls))
+    for url in sorted(image_urls - in_use):
+        release_media_url(session, url, business_id)
+
+
+def _column_values(change: dict) -> dict:
+    if change.get("base_price_naira") is not None and change.get("price_change_percent") is not None:
+        raise ValidationError(message="Set either base_price_naira or price_change_percent, not both")
+
+    values = {field: change[field] for field in BATCH_UPDATE_FIELDS if change.get(field) is not None}
+    if "base_price_naira" in values:
+        values["base_price_kobo"] = naira_to_kobo(values.pop("base_price_naira"))
+    return values
 
 
 def soft_delete_product_service(session: Session, business_id: int, product_id: int) -> None:
@@ -68,21 +251,40 @@ def soft_delete_product_service(session: Session, business_id: int, product_id:
         raise NotFoundError(message="Product not found")
 
     product.is_active = False
+    catalog_cache.invalidate(session, business_id)
     save_product(session, product)
 
 
-def upload_product_image_service(file: UploadFile) -> str:
-    settings = get_settings()
-    suffix = Path(file.filename or "").suffix.lower()
-    if suffix not in ALLOWED_EXTENSIONS:
-        raise ValidationError(message="Unsupported image type")
+def upload_product_image_service(session: Session, file: BinaryIO, business_id: int) -> str:
+    stored = store_media_stream(session, file, kind="products", business_id=business_id)
+    _schedule_image_derivatives(session, stored, business_id)
+    return stored.url
+
+
+def presign_product_image_upload_service(business_id: int) -> DirectUpload:
+    return create_direct_upload(kind="products", business_id=business_id)
+
+
+def complete_product_image_upload_service(session: Session, business_id: int, key: str) -> str:
+    stored = complete_direct_upload(session, key=key, kind="products", business_id=business_id)
+    _schedule_image_derivatives(session, stored, business_id)
+    return stored.url
+
 
-    filename = f"{uuid4().hex}{suffix}"
-    media_products = Path(settings.media_dir) / "products"
-    media_products.mkdir(parents=True, exist_ok=True)
-    destination = media_products / filename
+def _schedule_image_derivatives(session: Session, stored: StoredMedia, business_id: int) -> None:
+    # Variants are rendered from local files only; remote backends serve the original.
+    storage = get_storage()
+    alias = storage.local_path(stored.public_path)
+    if alias is None:
+        return
+    # Rendered once per blob, so a re-uploaded photo only gets links for its new alias.
+    source = storage.local_path(blob_key(stored.sha256, Path(stored.public_path).suffix))
+    # Listings embed the variant URLs that exist, so cached pages go stale once they land.
+    bind = session.get_bind()
+    schedule_derivatives(source, alias=alias, on_done=lambda: _invalidate_catalog(bind, business_id))
 
-    with destination.open("wb") as output:
-        output.write(file.file.read())
 
-    return f"/media/products/{filename}"
+def _invalidate_catalog(bind, business_id: int) -> None:
+    with Session(bind) as session:
+        catalog_cache.invalidate(session, business_id)
+        session.commit()
@@ -0,0 +1,345 @@
+import asyncio
+import io
+import logging
+from collections.abc import Callable
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from functools import lru_cache
+
+from reportlab.lib.pagesizes import A5
+from reportlab.lib.units import mm
+from reportlab.lib.utils import simpleSplit
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfgen import canvas
+from sqlmodel import Session
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import get_settings
+from app.core.errors import NotFoundError, ServiceUnavailableError
+from app.core.executors import BoundedExecutor
+from app.core.uploads import sniff_pdf_suffix
+from app.models.business import Business
+from app.models.order import ORDER_STATUS_PAID, Order
+from app.models.receipt import Receipt
+from app.repositories.order_repo import get_order_for_business, list_order_items
+from app.repositories.payment_repo import get_paid_payment
+from app.repositories.receipt_repo import get_receipt_for_order, insert_receipt
+from app.services.media_store_service import release_media, store_media_stream
+
+logger = logging.getLogger(__name__)
+
+# Standard PDF fonts: every viewer has them, so nothing is embedded. An
+# embedded TrueType subset made each receipt ~20x larger and ~5x slower.
+FONT_REGULAR = "Helvetica"
+FONT_BOLD = "Helvetica-Bold"
+PAGE_WIDTH, PAGE_HEIGHT = A5
+MARGIN = 12 * mm
+LINE_HEIGHT = 13
+# Right edges of the quantity, unit price and line total columns.
+QTY_RIGHT = PAGE_WIDTH - MARGIN - 150
+UNIT_RIGHT = PAGE_WIDTH - MARGIN - 75
+TOTAL_RIGHT = PAGE_WIDTH - MARGIN
+NAME_WIDTH = QTY_RIGHT - 30 - MARGIN
+
+
+@dataclass(frozen=True, slots=True)
+class ReceiptLine:
+    name: str
+    quantity: int
+    unit_price_kobo: int
+    line_total_kobo: int
+
+
+@dataclass(frozen=True, slots=True)
+class ReceiptDocument:
+    """Everything printed on one receipt; picklable so it can cross into the pool."""
+
+    business_id: int
+    business_name: str
+    store_code: str
+    currency: str
+    order_id: int
+    receipt_number: str
+    issued_at: datetime
+    payment_reference: str | None
+    lines: tuple[ReceiptLine, ...]
+    subtotal_kobo: int
+    delivery_fee_kobo: int
+    total_kobo: int
+
+
+@dataclass(frozen=True, slots=True)
+class _BusinessLayout:
+    title_lines: tuple[str, ...]
+    subtitle: str
+    header_height: float
+
+
+@lru_cache
+def get_receipt_executor() -> BoundedExecutor:
+    # reportlab is pure Python; threads would serialize on the GIL.
+    settings = get_settings()
+    return BoundedExecutor(
+        ProcessPoolExecutor(max_workers=settings.receipt_render_workers),
+        max_workers=settings.receipt_render_workers,
+        max_pending=settings.receipt_render_max_pending,
+        name="Receipt service",
+    )
+
+
+@lru_cache
+def get_receipt_store_executor() -> BoundedExecutor:
+    # Storing a rendered PDF is DB and file I/O; it must not run on the process
+    # pool's result thread, which also hands every other render its result.
+    settings = get_settings()
+    return BoundedExecutor(
+        ThreadPoolExecutor(max_workers=settings.receipt_render_workers, thread_name_prefix="receipt-store"),
+        max_workers=settings.receipt_render_workers,
+        max_pending=settings.receipt_render_max_pending,
+        name="Receipt store",
+    )
+
+
+def receipt_number(store_code: str, order_id: int) -> str:
+    # Derived from the order, so a re-render never mints a second number.
+    return f"RCP-{store_code}-{order_id:08d}"
+
+
+@lru_cache(maxsize=256)
+def _business_layout(business_id: int, business_name: str, store_code: str) -> _BusinessLayout:
+    """Wrapped and measured header for one business, reused by every receipt a worker renders for it.
+
+    The name and store code are part of the key, so a renamed business simply
+    gets a fresh entry.
+    """
+    title_lines = tuple(simpleSplit(business_name, FONT_BOLD, 15, PAGE_WIDTH - 2 * MARGIN)[:3])
+    return _BusinessLayout(
+        title_lines=title_lines,
+        subtitle=f"Store code {store_code}",
+        header_height=len(title_lines) * 18 + LINE_HEIGHT + 8,
+    )
+
+
+def render_receipt_pdf(document: ReceiptDocument) -> bytes:
+    """Draw one receipt and return the PDF bytes.
+
+    Runs inside a worker process. Output is byte-for-byte stable for the same
+    document, so a repeated render lands on the already stored blob.
+    """
+    layout = _business_layout(document.business_id, document.business_name, document.store_code)
+    buffer = io.BytesIO()
+    pdf = canvas.Canvas(buffer, pagesize=A5, pageCompression=1, invariant=1)
+    pdf.setTitle(document.receipt_number)
+    pdf.setAuthor(document.business_name)
+
+    y = _draw_header(pdf, layout, document)
+    for line in document.lines:
+        if y < MARGIN + 4 * LINE_HEIGHT:
+            pdf.showPage()
+            y = _draw_header(pdf, layout, document)
+        pdf.setFont(FONT_REGULAR, 9)
+        pdf.drawString(MARGIN, y, _fit(line.name, NAME_WIDTH))
+        pdf.drawRightString(QTY_RIGHT, y, str(line.quantity))
+        pdf.drawRightString(UNIT_RIGHT, y, _money(line.unit_price_kobo))
+        pdf.drawRightString(TOTAL_RIGHT, y, _money(line.line_total_kobo))
+        y -= LINE_HEIGHT
+
+    if y < MARGIN + 5 * LINE_HEIGHT:
+        pdf.showPage()
+        y = _draw_header(pdf, layout, document)
+    pdf.line(MARGIN, y + 4, TOTAL_RIGHT, y + 4)
+    y -= LINE_HEIGHT
+    for label, amount_kobo in (("Subtotal", document.subtotal_kobo), ("Delivery", document.delivery_fee_kobo)):
+        pdf.setFont(FONT_REGULAR, 9)
+        pdf.drawRightString(UNIT_RIGHT, y, label)
+        pdf.drawRightString(TOTAL_RIGHT, y, _money(amount_kobo))
+        y -= LINE_HEIGHT
+    pdf.setFont(FONT_BOLD, 10)
+    pdf.drawRightString(UNIT_RIGHT, y, f"Total ({document.currency})")
+    pdf.drawRightString(TOTAL_RIGHT, y, _money(document.total_kobo))
+    y -= 2 * LINE_HEIGHT
+    pdf.setFont(FONT_REGULAR, 8)
+    pdf.drawString(MARGIN, y, "Thank you for your order.")
+
+    pdf.showPage()
+    pdf.save()
+    return buffer.getvalue()
+
+
+def _draw_header(pdf: canvas.Canvas, layout: _BusinessLayout, document: ReceiptDocument) -> float:
+    y = PAGE_HEIGHT - MARGIN - 15
+    pdf.setFont(FONT_BOLD, 15)
+    for title_line in layout.title_lines:
+        pdf.drawString(MARGIN, y, title_line)
+        y -= 18
+    pdf.setFont(FONT_REGULAR, 9)
+    pdf.drawString(MARGIN, y, layout.subtitle)
+    y = PAGE_HEIGHT - MARGIN - 15 - layout.header_height
+
+    details = [
+        f"Receipt {document.receipt_number}",
+        f"Order #{document.order_id}",
+        f"Issued {document.issued_at:%Y-%m-%d %H:%M} UTC",
+    ]
+    if document.payment_reference:
+        details.append(f"Paystack reference {document.payment_reference}")
+    for detail in details:
+        pdf.drawString(MARGIN, y, detail)
+        y -= LINE_HEIGHT
+
+    y -= 6
+    pdf.setFont(FONT_BOLD, 9)
+    pdf.drawString(MARGIN, y, "Item")
+    pdf.drawRightString(QTY_RIGHT, y, "Qty")
+    pdf.drawRightString(UNIT_RIGHT, y, "Unit")
+    pdf.drawRightString(TOTAL_RIGHT, y, "Amount")
+    pdf.line(MARGIN, y - 4, TOTAL_RIGHT, y - 4)
+    return y - LINE_HEIGHT - 2
+
+
+def _fit(text: str, width: float) -> str:
+    if pdfmetrics.stringWidth(text, FONT_REGULAR, 9) <= width:
+        return text
+    while text and pdfmetrics.stringWidth(f"{text}...", FONT_REGULAR, 9) > width:
+        text = text[:-1]
+    return f"{text}..."
+
+
+def _money(amount_kobo: int) -> str:
+    naira, kobo = divmod(amount_kobo, 100)
+    return f"{naira:,}.{kobo:02d}"
+
+
+def load_receipt_document(session: Session, order: Order) -> ReceiptDocument:
+    business = session.get(Business, order.business_id)
+    items = list_order_items(session, order.id)
+    payment = get_paid_payment(session, order.id)
+    return ReceiptDocument(
+        business_id=business.id,
+        business_name=business.name,
+        store_code=business.store_code,
+        currency=business.currency,
+        order_id=order.id,
+        receipt_number=receipt_number(business.store_code, order.id),
+        # The confirmation time keeps every render of one order identical.
+        issued_at=payment.confirmed_at if payment and payment.confirmed_at else order.created_at,
+        payment_reference=payment.paystack_reference if payment else None,
+        lines=tuple(
+            ReceiptLine(
+                name=item.name_snapshot,
+                quantity=item.quantity,
+                unit_price_kobo=item.unit_price_kobo,
+                line_total_kobo=item.line_total_kobo,
+            )
+            for item in items
+        ),
+        subtotal_kobo=order.subtotal_kobo,
+        delivery_fee_kobo=order.delivery_fee_kobo,
+        total_kobo=order.total_kobo,
+    )
+
+
+def save_rendered_receipt(session: Session, document: ReceiptDocument, pdf_bytes: bytes) -> Receipt:
+    """Store the PDF under ``receipts/`` and write the ``Receipt`` row.
+
+    When another render of the same order got there first, its row wins and
+    this copy's alias is released again.
+    """
+    stored = store_media_stream(
+        session,
+        io.BytesIO(pdf_bytes),
+        kind="receipts",
+        business_id=document.business_id,
+        detect_suffix=sniff_pdf_suffix,
+    )
+    try:
+        inserted = insert_receipt(
+            session,
+            {
+                "order_id": document.order_id,
+                "receipt_number": document.receipt_number,
+                "pdf_url": stored.url,
+                "created_at": datetime.now(timezone.utc),
+            },
+        )
+        session.commit()
+    except BaseException:
+        session.rollback()
+        release_media(session, stored.public_path)
+        raise
+
+    if not inserted:
+        release_media(session, stored.public_path)
+    return get_receipt_for_order(session, document.order_id)
+
+
+async def get_receipt_service(session: Session, business_id: int, order_id: int) -> Receipt:
+    """The order's receipt, rendering it now if the background render has not landed yet."""
+    existing, document = await run_in_threadpool(_receipt_or_document, session, business_id, order_id)
+    if existing is not None:
+        return existing
+    pdf_bytes = await asyncio.wrap_future(get_receipt_executor().submit(render_receipt_pdf, document))
+    return await run_in_threadpool(save_rendered_receipt, session, document, pdf_bytes)
+
+
+def _receipt_or_document(
+    session: Session,
+    business_id: int,
+    order_id: int,
+) -> tuple[Receipt | None, ReceiptDocument | None]:
+    try:
+        order = get_order_for_business(session, business_id, order_id)
+        if order is None:
+            raise NotFoundError(message="Order not found")
+        existing = get_receipt_for_order(session, order_id)
+        if existing is not None:
+            return existing, None
+        if order.status != ORDER_STATUS_PAID:
+            raise NotFoundError(message="Receipt not found")
+        return None, load_receipt_document(session, order)
+    finally:
+        # Nothing stays open while the pool renders.
+        session.rollback()
+
+
+def schedule_receipt(session_factory: Callable[[], Session], order_id: int) -> Future | None:
+    """Render a paid order's receipt off the caller's thread; None if there is nothing to do.
+
+    The returned future resolves to the receipt number once the ``Receipt``
+    row is committed. A saturated pool or failed render is only logged: the
+    receipt endpoint renders on first request instead.
+    """
+    with session_factory() as session:
+        order = session.get(Order, order_id)
+        if order is None or order.status != ORDER_STATUS_PAID or get_receipt_for_order(session, order_id):
+            return None
+        document = load_receipt_document(session, order)
+
+    try:
+        rendering = get_receipt_executor().submit(render_receipt_pdf, document)
+    except ServiceUnavailableError:
+        logger.warning("Receipt pool saturated; receipt for order %s deferred", order_id)
+        return None
+
+    saved: Future = Future()
+
+    def _save(pdf_bytes: bytes) -> None:
+        try:
+            with session_factory() as session:
+                receipt = save_rendered_receipt(session, document, pdf_bytes)
+            saved.set_result(receipt.receipt_number)
+        except Exception as exc:
+            logger.error("Storing the receipt for order %s failed", order_id, exc_info=exc)
+            saved.set_exception(exc)
+
+    def _finished(done: Future) -> None:
+        # Runs on the process pool's result thread: only hand the bytes on.
+        try:
+            get_receipt_store_executor().submit(_save, done.result())
+        except Exception as exc:
+            logger.error("Rendering the receipt for order %s failed", order_id, exc_info=exc)
+            saved.set_exception(exc)
+
+    rendering.add_done_callback(_finished)
+    return saved
@@ -0,0 +1,241 @@
+import asyncio
+import logging
+import os
+import socket
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+from sqlmodel import Session
+
+from app.core.cache import TTLCache
+from app.core.config import get_settings
+from app.core.errors import ValidationError
+from app.models.webhook_event import WEBHOOK_STATUS_PENDING
+from app.repositories.payment_repo import list_recent_paid_references
+from app.repositories.webhook_event_repo import (
+    claim_webhook_events,
+    insert_webhook_event,
+    mark_webhook_event_done,
+    release_webhook_event,
+)
+from app.services.payment_service import CHARGE_SUCCESS, apply_paystack_event
+from app.services.paystack_service import parse_webhook_event, verify_paystack_signature
+
+logger = logging.getLogger(__name__)
+
+PAYSTACK = "paystack"
+RETRY_BASE_SECONDS = 2.0
+RETRY_MAX_SECONDS = 300.0
+
+_settings = get_settings()
+# Keys of events already durable in the inbox (or applied). A redelivery found
+# here is acknowledged without touching the database; a miss just falls
+# through to the conditional insert, which stays the authority.
+known_events = TTLCache(
+    maxsize=_settings.webhook_dedup_max_entries,
+    ttl_seconds=_settings.webhook_dedup_ttl_seconds,
+)
+
+
+def receive_paystack_webhook(session: Session, raw_body: bytes, signature: str | None) -> bool:
+    """Verify and persist one delivery; True if new, False for a redelivery.
+
+    This is all the request path does: one conditional INSERT and a commit,
+    or nothing at all for an event this process already knows. Payment and
+    order updates happen when a worker drains the inbox.
+    """
+    verify_paystack_signature(raw_body, signature, get_settings().paystack_secret_key)
+    event = parse_webhook_event(raw_body)
+    if known_events.get(event.key):
+        return False
+
+    now = datetime.now(timezone.utc)
+    try:
+        inserted = insert_webhook_event(
+            session,
+            {
+                "provider": PAYSTACK,
+                "event_key": event.key,
+                "event_type": event.event,
+                "reference": event.reference,
+                "payload": raw_body.decode("utf-8"),
+                "status": WEBHOOK_STATUS_PENDING,
+                "attempts": 0,
+                "available_at": now,
+                "received_at": now,
+            },
+        )
+        session.commit()
+    except BaseException:
+        session.rollback()
+        raise
+    known_events.set(event.key, True)
+    return inserted
+
+
+def seed_known_events(session: Session) -> int:
+    """Preload ``known_events`` with the most recent settled charges; returns how many."""
+    references = list_recent_paid_references(session, limit=known_events.maxsize)
+    # Oldest first, so the LRU evicts in age order.
+    for reference in reversed(references):
+        known_events.set(f"{CHARGE_SUCCESS}:{reference}", True)
+    return len(references)
+
+
+@dataclass(frozen=True, slots=True)
+class DrainResult:
+    claimed: int
+    applied: int
+    retried: int
+    failed: int
+
+
+def drain_webhook_inbox(
+    session: Session,
+    worker: str,
+    batch_size: int,
+    lock_seconds: float,
+    max_attempts: int,
+    now: datetime | None = None,
+    on_paid: Callable[[int], object] | None = None,
+) -> DrainResult:
+    """Claim one batch of due events and apply each in its own transaction.
+
+    An event is marked done in the same commit as its effects. A worker that
+    dies first leaves the row locked until ``lock_seconds`` pass, after which
+    another worker picks it up again (at-least-once delivery). ``on_paid`` is
+    called with each newly paid order id after that commit, for follow-up
+    work such as the receipt that should not hold the transaction open.
+    """
+    now = now or datetime.now(timezone.utc)
+    try:
+        events = claim_webhook_events(
+            session,
+            worker=worker,
+            now=now,
+            locked_until=now + timedelta(seconds=lock_seconds),
+            limit=batch_size,
+        )
+        session.commit()
+    except BaseException:
+        session.rollback()
+        raise
+
+    applied = retried = failed = 0
+    for event in events:
+        event_id, attempts, payload = event.id, event.attempts, event.payload
+        try:
+            paystack_event = parse_webhook_event(payload.encode("utf-8"))
+            paid_order_id = apply_paystack_event(session, paystack_event, payload, now=now)
+            if paid_order_id is not None:
+                applied += 1
+            mark_webhook_event_done(session, event_id, worker=worker, now=now)
+            session.commit()
+            known_events.set(paystack_event.key, True)
+        except Exception as exc:
+            session.rollback()
+            # Bad payloads and amount mismatches will not get better with time.
+            retry_at = None
+            if not isinstance(exc, ValidationError) and attempts < max_attempts:
+                retry_at = now + timedelta(seconds=_retry_delay(attempts))
+            if retry_at is None:
+                failed += 1
+                logger.error("Webhook event %s failed permanently: %s", event_id, exc)
+            else:
+                retried += 1
+                logger.warning("Webhook event %s failed (attempt %d), retrying: %s", event_id, attempts, exc)
+            release_webhook_event(session, event_id, worker=worker, error=str(exc), retry_at=retry_at)
+            session.commit()
+            continue
+
+        if paid_order_id is not None and on_paid is not None:
+            try:
+                on_paid(paid_order_id)
+            except Exception:
+                logger.exception("Follow-up for paid order %s failed", paid_order_id)
+    return DrainResult(claimed=len(events), applied=applied, retried=retried, failed=failed)
+
+
+def drain_webhook_inbox_inline(session: Session, on_paid: Callable[[int], object] | None = None) -> DrainResult:
+    """Drain one batch on the webhook request itself, for deployments that run no inbox workers.
+
+    The delivery is already durable in the inbox, so an event that fails here
+    is released for retry like any other; the next delivery drains it again.
+    """
+    settings = get_settings()
+    return drain_webhook_inbox(
+        session,
+        worker=f"inline:{socket.gethostname()}:{os.getpid()}",
+        batch_size=settings.webhook_inbox_batch_size,
+        lock_seconds=settings.webhook_inbox_lock_seconds,
+        max_attempts=settings.webhook_inbox_max_attempts,
+        on_paid=on_paid,
+    )
+
+
+def _retry_delay(attempts: int) -> float:
+    return min(RETRY_BASE_SECONDS * 2 ** (attempts - 1), RETRY_MAX_SECONDS)
+
+
+class WebhookInboxWorkers:
+    """``workers`` loops draining the inbox on the event loop's threadpool.
+
+    A loop that fills a whole batch goes straight back for more; otherwise it
+    polls every ``poll_interval_seconds``. Several processes can run these
+    side by side, since claiming locks rows per worker.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        workers: int,
+        poll_interval_seconds: float,
+        batch_size: int,
+        lock_seconds: float,
+        max_attempts: int,
+        on_paid: Callable[[int], object] | None = None,
+    ) -> None:
+        self.session_factory = session_factory
+        self.workers = workers
+        self.poll_interval_seconds = poll_interval_seconds
+        self.batch_size = batch_size
+        self.lock_seconds = lock_seconds
+        self.max_attempts = max_attempts
+        self.on_paid = on_paid
+        self._prefix = f"{socket.gethostname()}:{os.getpid()}:{uuid4().hex[:8]}"
+        self._tasks: list[asyncio.Task] = []
+
+    def drain_once(self, worker: str) -> DrainResult:
+        with self.session_factory() as session:
+            return drain_webhook_inbox(
+                session,
+                worker=worker,
+                batch_size=self.batch_size,
+                lock_seconds=self.lock_seconds,
+                max_attempts=self.max_attempts,
+                on_paid=self.on_paid,
+            )
+
+    async def _run_forever(self, worker: str) -> None:
+        while True:
+            try:
+                result = await asyncio.to_thread(self.drain_once, worker)
+                if result.claimed == self.batch_size:
+                    continue
+            except Exception:
+                logger.exception("Draining the webhook inbox failed")
+            await asyncio.sleep(self.poll_interval_seconds)
+
+    def start(self) -> None:
+        loop = asyncio.get_running_loop()
+        for index in range(self.workers - len(self._tasks)):
+            worker = f"{self._prefix}:{index}"
+            self._tasks.append(loop.create_task(self._run_forever(worker), name=f"webhook-inbox-{index}"))
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
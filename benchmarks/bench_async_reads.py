@@ -0,0 +1,95 @@
+"""GET /products throughput: sync Session on the threadpool vs AsyncSession.
+
+Run with: python -m benchmarks.bench_async_reads
+"""
+import asyncio
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+from fastapi import FastAPI
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel import Session, SQLModel, create_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.api.v1.products import ProductResponse, list_products_endpoint, list_products_endpoint_async
+from app.core.auth import get_current_business_id, get_current_business_id_async
+from app.core.db import get_async_session, get_session
+from app.models.business import Business
+from app.models.product import Product
+from app.services.product_service import catalog_cache
+
+PRODUCTS = 50
+REQUESTS = 2000
+CONCURRENCY = 200
+
+
+async def _drive(app: FastAPI) -> float:
+    transport = httpx.ASGITransport(app=app)
+    semaphore = asyncio.Semaphore(CONCURRENCY)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+
+        async def one() -> None:
+            async with semaphore:
+                response = await client.get("/products")
+                assert response.status_code == 200
+
+        await one()
+        started = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(REQUESTS)))
+        return REQUESTS / (time.perf_counter() - started)
+
+
+def main() -> None:
+    # Measure the DB path itself, not the catalog cache in front of it.
+    catalog_cache.entries.maxsize = 0
+    with tempfile.TemporaryDirectory() as tmp:
+        database_path = Path(tmp) / "bench.db"
+        engine = create_engine(
+            f"sqlite:///{database_path}",
+            connect_args={"check_same_thread": False},
+            pool_size=CONCURRENCY,
+        )
+        SQLModel.metadata.create_all(engine)
+        with Session(engine) as session:
+            session.add(Business(id=1, name="Bench", store_code="BENCH"))
+            for index in range(PRODUCTS):
+                session.add(Product(business_id=1, name=f"Product {index}", base_price_kobo=index * 100))
+            session.commit()
+        async_engine = create_async_engine(f"sqlite+aiosqlite:///{database_path}", pool_size=CONCURRENCY)
+
+        def override_get_session():
+            with Session(engine) as session:
+                yield session
+
+        async def override_get_async_session():
+            async with AsyncSession(async_engine, expire_on_commit=False) as session:
+                yield session
+
+        async def business_one() -> int:
+            return 1
+
+        sync_app = FastAPI()
+        sync_app.add_api_route("/products", list_products_endpoint, response_model=list[ProductResponse])
+        sync_app.dependency_overrides[get_session] = override_get_session
+        sync_app.dependency_overrides[get_current_business_id] = lambda: 1
+
+        async_app = FastAPI()
+        async_app.add_api_route("/products", list_products_endpoint_async, response_model=list[ProductResponse])
+        async_app.dependency_overrides[get_async_session] = override_get_async_session
+        async_app.dependency_overrides[get_current_business_id_async] = business_one
+
+        sync_rps = asyncio.run(_drive(sync_app))
+        async_rps = asyncio.run(_drive(async_app))
+        asyncio.run(async_engine.dispose())
+        engine.dispose()
+
+    print(f"GET /products, {PRODUCTS} products, {REQUESTS} requests, concurrency {CONCURRENCY}")
+    print(f"  sync Session (threadpool): {sync_rps:8.1f} req/s")
+    print(f"  AsyncSession (aiosqlite):  {async_rps:8.1f} req/s")
+
+
+if __name__ == "__main__":
+    main()
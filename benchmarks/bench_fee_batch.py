@@ -0,0 +1,37 @@
+"""Settlement fee computation: calc_fees_kobo_batch vs calc_platform_fee_kobo per order.
+
+Run with: python -m benchmarks.bench_fee_batch
+"""
+import time
+
+import numpy as np
+
+from app.services.money import calc_fees_kobo_batch, calc_platform_fee_kobo
+
+ORDERS = 2_000_000
+SCALAR_SAMPLE = 200_000
+
+
+def main() -> None:
+    rng = np.random.default_rng(7)
+    totals = rng.integers(0, 50_000_000, size=ORDERS, dtype=np.int64)
+
+    started = time.perf_counter()
+    fees, payouts = calc_fees_kobo_batch(totals)
+    batch_seconds = time.perf_counter() - started
+
+    sample = totals[:SCALAR_SAMPLE].tolist()
+    started = time.perf_counter()
+    scalar_fees = [calc_platform_fee_kobo(total) for total in sample]
+    scalar_seconds = (time.perf_counter() - started) * ORDERS / SCALAR_SAMPLE
+
+    assert fees[:SCALAR_SAMPLE].tolist() == scalar_fees
+    assert int((fees + payouts - totals).any()) == 0
+    print(f"{ORDERS:,} orders")
+    print(f"  batch:  {batch_seconds * 1000:8.1f} ms")
+    print(f"  scalar: {scalar_seconds * 1000:8.1f} ms (extrapolated from {SCALAR_SAMPLE:,})")
+    print(f"  speedup: {scalar_seconds / batch_seconds:.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""/products latency while a burst of logins hashes passwords.
+
+Compares bcrypt on Starlette's shared threadpool (the old behaviour) with the
+dedicated bounded password pool.
+
+Run with: python -m benchmarks.bench_login_storm
+"""
+import asyncio
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+from fastapi.concurrency import run_in_threadpool
+from sqlmodel import Session, SQLModel, create_engine
+
+from app.core.auth import get_current_business_id
+from app.core.db import get_session
+from app.core.security import verify_password
+from app.main import app
+from app.services import auth_service
+
+LOGINS = 300
+PROBES = 100
+
+
+async def _probe_products(client: httpx.AsyncClient) -> list[float]:
+    latencies = []
+    for _ in range(PROBES):
+        started = time.perf_counter()
+        response = await client.get("/api/v1/products")
+        latencies.append((time.perf_counter() - started) * 1000)
+        assert response.status_code == 200
+        await asyncio.sleep(0.005)
+    return latencies
+
+
+async def _login(client: httpx.AsyncClient) -> int:
+    response = await client.post("/api/v1/auth/login", json={"email": "storm@example.com", "password": "secret123"})
+    return response.status_code
+
+
+async def _run(storm: bool) -> tuple[list[float], dict[int, int]]:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        logins = [asyncio.create_task(_login(client)) for _ in range(LOGINS if storm else 0)]
+        latencies = await _probe_products(client)
+        statuses: dict[int, int] = {}
+        for status in await asyncio.gather(*logins):
+            statuses[status] = statuses.get(status, 0) + 1
+    return latencies, statuses
+
+
+def _summary(label: str, latencies: list[float], statuses: dict[int, int]) -> None:
+    ordered = sorted(latencies)
+    p99 = ordered[int(len(ordered) * 0.99) - 1]
+    print(f"  {label:<32} p50={statistics.median(ordered):7.2f}ms p99={p99:7.2f}ms logins={statuses}")
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{Path(tmp) / 'bench.db'}", connect_args={"check_same_thread": False})
+        SQLModel.metadata.create_all(engine)
+        with Session(engine) as session:
+            auth_service.register_business_owner(
+                session,
+                business_name="Storm Bakes",
+                store_code="STORM",
+                email="storm@example.com",
+                password="secret123",
+            )
+
+        def override_get_session():
+            with Session(engine) as session:
+                yield session
+
+        app.dependency_overrides[get_session] = override_get_session
+        app.dependency_overrides[get_current_business_id] = lambda: 1
+
+        print(f"GET /api/v1/products latency, {PROBES} probes, {LOGINS} concurrent logins")
+        _summary("idle", *asyncio.run(_run(storm=False)))
+
+        pooled_verify = auth_service.verify_password_async
+        auth_service.verify_password_async = lambda password, password_hash: run_in_threadpool(
+            verify_password, password, password_hash
+        )
+        _summary("login storm, shared threadpool", *asyncio.run(_run(storm=True)))
+        auth_service.verify_password_async = pooled_verify
+
+        _summary("login storm, password pool", *asyncio.run(_run(storm=True)))
+        app.dependency_overrides.clear()
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""Reserve 10-line orders: ORM add/commit/refresh per object vs the batched writes.
+
+Run with: python -m benchmarks.bench_order_reservation
+"""
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from sqlmodel import Session, SQLModel, create_engine, select
+
+from app.models.business import Business
+from app.models.customer import Customer
+from app.models.order import Order
+from app.models.order_item import OrderItem
+from app.models.product import Product
+from app.services.order_service import reserve_order
+from app.services.pricing_service import CartLine, quote_cart
+from tests.db_test_utils import QueryCounter
+
+CART_LINES = 10
+ORDERS = 500
+
+
+def _orm_reserve(session: Session, channel_user_id: str, items: list[CartLine]) -> None:
+    quote = quote_cart(session, business_id=1, items=items)
+    customer = session.exec(
+        select(Customer).where(Customer.business_id == 1).where(Customer.channel_user_id == channel_user_id)
+    ).first()
+    if customer is None:
+        customer = Customer(business_id=1, channel_type="telegram", channel_user_id=channel_user_id)
+        session.add(customer)
+        session.commit()
+        session.refresh(customer)
+    order = Order(
+        business_id=1,
+        customer_id=customer.id,
+        channel_type="telegram",
+        subtotal_kobo=quote.subtotal_kobo,
+        delivery_fee_kobo=quote.delivery_fee_kobo,
+        total_kobo=quote.total_kobo,
+        platform_fee_kobo=quote.platform_fee_kobo,
+        business_payout_kobo=quote.business_payout_kobo,
+        expires_at=datetime.now(timezone.utc) + timedelta(hours=1),
+    )
+    session.add(order)
+    session.commit()
+    session.refresh(order)
+    for line in quote.lines:
+        item = OrderItem(
+            order_id=order.id,
+            product_id=line.product_id,
+            name_snapshot=line.name,
+            unit_price_kobo=line.unit_price_kobo,
+            quantity=line.quantity,
+            line_total_kobo=line.line_total_kobo,
+        )
+        session.add(item)
+        session.commit()
+        session.refresh(item)
+
+
+def _run(label: str, engine, reserve) -> None:
+    items = [CartLine(product_id=product_id, quantity=2) for product_id in range(1, CART_LINES + 1)]
+    with Session(engine) as session, QueryCounter(engine) as counter:
+        started = time.perf_counter()
+        for index in range(ORDERS):
+            reserve(session, f"user-{index % 50}", items)
+        elapsed = time.perf_counter() - started
+    print(
+        f"{label:<14} {elapsed / ORDERS * 1000:7.3f} ms/order  "
+        f"{counter.count / ORDERS:5.1f} statements/order"
+    )
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        engines = []
+        for name in ("orm", "batched"):
+            engine = create_engine(f"sqlite:///{Path(tmp) / name}.db", connect_args={"check_same_thread": False})
+            SQLModel.metadata.create_all(engine)
+            with Session(engine) as session:
+                session.add(Business(id=1, name="Bench", store_code="BENCH"))
+                session.add_all(
+                    Product(business_id=1, name=f"Product {index}", base_price_kobo=(index + 1) * 10000)
+                    for index in range(CART_LINES)
+                )
+                session.commit()
+            engines.append(engine)
+
+        print(f"{ORDERS} reservations of {CART_LINES} lines")
+        _run("add/refresh", engines[0], _orm_reserve)
+        _run(
+            "batched",
+            engines[1],
+            lambda session, user, items: reserve_order(
+                session, business_id=1, channel_type="telegram", channel_user_id=user, items=items
+            ),
+        )
+
+
+if __name__ == "__main__":
+    main()
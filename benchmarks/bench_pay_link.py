@@ -0,0 +1,80 @@
+"""Time POST /orders/{id}/pay with and without pre-initialized payment links.
+
+The local Paystack stub answers after PROVIDER_LATENCY_SECONDS, roughly a
+Lagos-to-Paystack round trip plus their processing.
+
+Run with: python -m benchmarks.bench_pay_link
+"""
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+from sqlmodel import Session, SQLModel, create_engine
+
+from app.core.auth import get_current_business_id
+from app.core.config import get_settings
+from app.core.db import get_session
+from app.main import app
+from app.models.business import Business
+from app.models.payout_profile import PayoutProfile
+from app.models.product import Product
+from tests.paystack_stub import PaystackStub
+
+ORDERS = 50
+PROVIDER_LATENCY_SECONDS = 0.25
+RESERVE = {"channel_type": "telegram", "channel_user_id": "tg-1", "items": [{"product_id": 1, "quantity": 1}]}
+
+
+def _pay_latencies(client: TestClient) -> list[float]:
+    latencies = []
+    for _ in range(ORDERS):
+        order_id = client.post("/api/v1/orders/reserve", json=RESERVE).json()["order_id"]
+        started = time.perf_counter()
+        assert client.post(f"/api/v1/orders/{order_id}/pay").status_code == 200
+        latencies.append(time.perf_counter() - started)
+    return latencies
+
+
+def main() -> None:
+    settings = get_settings()
+    with tempfile.TemporaryDirectory() as tmp, PaystackStub(latency_seconds=PROVIDER_LATENCY_SECONDS) as stub:
+        engine = create_engine(f"sqlite:///{Path(tmp) / 'bench.db'}", connect_args={"check_same_thread": False})
+        SQLModel.metadata.create_all(engine)
+        with Session(engine) as session:
+            session.add(Business(id=1, name="Bench", store_code="BENCH"))
+            session.add(Product(id=1, business_id=1, name="Cake", base_price_kobo=1800000))
+            session.add(
+                PayoutProfile(
+                    business_id=1,
+                    bank_name="058",
+                    account_number="0123456789",
+                    account_name="Bench",
+                    paystack_subaccount_code="ACCT_bench",
+                    status="active",
+                )
+            )
+            session.commit()
+
+        def override_get_session():
+            with Session(engine) as session:
+                yield session
+
+        settings.paystack_base_url = stub.base_url
+        settings.paystack_secret_key = stub.secret_key
+        app.dependency_overrides[get_session] = override_get_session
+        app.dependency_overrides[get_current_business_id] = lambda: 1
+
+        print(f"{ORDERS} orders, {PROVIDER_LATENCY_SECONDS * 1000:.0f} ms provider latency")
+        for preinit in (False, True):
+            settings.payment_preinit_enabled = preinit
+            with TestClient(app) as client:
+                latencies = _pay_latencies(client)
+            label = "pre-initialized" if preinit else "synchronous"
+            print(f"{label:<16} pay p50 {statistics.median(latencies) * 1000:7.2f} ms  max {max(latencies) * 1000:7.2f} ms")
+        app.dependency_overrides.clear()
+
+
+if __name__ == "__main__":
+    main()
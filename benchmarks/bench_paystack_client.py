@@ -0,0 +1,69 @@
+"""Paystack calls against the local stub: client-per-call vs the shared pooled client.
+
+Run with: python -m benchmarks.bench_paystack_client
+"""
+import asyncio
+import time
+
+import httpx
+
+from app.core.circuit_breaker import CircuitBreaker
+from app.services.paystack_service import PaystackClient
+from tests.paystack_stub import PaystackStub
+
+CALLS = 300
+CONCURRENCY = 30
+LATENCY_SECONDS = 0.01
+
+
+async def _client_per_call(stub: PaystackStub, index: int) -> None:
+    # What a bare ``async with httpx.AsyncClient()`` at each call site costs.
+    async with httpx.AsyncClient(base_url=stub.base_url) as client:
+        response = await client.post(
+            "/transaction/initialize",
+            json={"reference": f"fresh-{index}", "email": "buyer@example.com", "amount": 500000},
+            headers={"Authorization": f"Bearer {stub.secret_key}"},
+        )
+        response.raise_for_status()
+
+
+async def _run(label: str, stub: PaystackStub, call) -> None:
+    connections_before = stub.connections
+    semaphore = asyncio.Semaphore(CONCURRENCY)
+
+    async def limited(index: int) -> None:
+        async with semaphore:
+            await call(index)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(limited(index) for index in range(CALLS)))
+    elapsed = time.perf_counter() - started
+    print(
+        f"{label:<16} {CALLS / elapsed:8.1f} calls/s  "
+        f"{stub.connections - connections_before:4d} connections"
+    )
+
+
+async def main() -> None:
+    with PaystackStub(latency_seconds=LATENCY_SECONDS) as stub:
+        print(f"{CALLS} init_transaction calls, {CONCURRENCY} in flight, {LATENCY_SECONDS * 1000:.0f} ms stub latency")
+        await _run("client per call", stub, lambda index: _client_per_call(stub, index))
+
+        client = PaystackClient(
+            secret_key=stub.secret_key,
+            base_url=stub.base_url,
+            max_retries=2,
+            breaker=CircuitBreaker(failure_threshold=5, reset_timeout_seconds=30, name="Paystack"),
+        )
+        try:
+            await _run(
+                "shared client",
+                stub,
+                lambda index: client.init_transaction(f"shared-{index}", "buyer@example.com", 500000),
+            )
+        finally:
+            await client.aclose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,81 @@
+"""Quote 50-line carts: per-line lookups vs one IN query vs the cached catalog snapshot.
+
+Run with: python -m benchmarks.bench_pricing_quote
+"""
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from sqlmodel import Session, SQLModel, create_engine
+
+from app.models.business import Business
+from app.models.delivery_zone import DeliveryZone
+from app.models.product import Product
+from app.repositories.delivery_repo import get_delivery_zone_by_id
+from app.repositories.product_repo import get_product_by_id
+from app.services.delivery_service import list_delivery_zones_service
+from app.services.money import calc_platform_fee_kobo
+from app.services.pricing_service import CartLine, quote_cart
+from app.services.product_service import catalog_cache, list_products_service
+from tests.db_test_utils import QueryCounter
+
+PRODUCTS = 2_000
+CART_LINES = 50
+QUOTES = 300
+
+
+def _per_line_quote(session: Session, business_id: int, items: list[CartLine], zone_id: int) -> int:
+    # What PricingService would do on top of get_product_by_id.
+    subtotal = 0
+    for item in items:
+        product = get_product_by_id(session, business_id=business_id, product_id=item.product_id)
+        subtotal += product.base_price_kobo * item.quantity
+    total = subtotal + get_delivery_zone_by_id(session, business_id=business_id, zone_id=zone_id).fee_kobo
+    return calc_platform_fee_kobo(total)
+
+
+def _run(label: str, engine, carts, quote) -> None:
+    with Session(engine) as session, QueryCounter(engine) as counter:
+        started = time.perf_counter()
+        for items in carts:
+            quote(session, items)
+        elapsed = time.perf_counter() - started
+    print(
+        f"{label:<16} {elapsed / len(carts) * 1000:7.3f} ms/quote  "
+        f"{counter.count / len(carts):5.1f} queries/quote"
+    )
+
+
+def main() -> None:
+    rng = random.Random(3)
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{Path(tmp) / 'bench.db'}", connect_args={"check_same_thread": False})
+        SQLModel.metadata.create_all(engine)
+        with Session(engine) as session:
+            session.add(Business(id=1, name="Bench", store_code="BENCH"))
+            session.add(DeliveryZone(id=1, business_id=1, name="Zone", fee_kobo=150000, is_active=True))
+            session.add_all(
+                Product(business_id=1, name=f"Product {index}", base_price_kobo=rng.randint(100, 5_000_000) * 100)
+                for index in range(PRODUCTS)
+            )
+            session.commit()
+
+        carts = [
+            [CartLine(product_id=rng.randint(1, PRODUCTS), quantity=rng.randint(1, 5)) for _ in range(CART_LINES)]
+            for _ in range(QUOTES)
+        ]
+        print(f"{QUOTES} quotes of {CART_LINES} lines over {PRODUCTS} products")
+        _run("per-line", engine, carts, lambda session, items: _per_line_quote(session, 1, items, 1))
+
+        catalog_cache.clear()
+        _run("IN query", engine, carts, lambda session, items: quote_cart(session, 1, items, delivery_zone_id=1))
+
+        with Session(engine) as session:
+            list_products_service(session, business_id=1)
+            list_delivery_zones_service(session, business_id=1)
+        _run("cached snapshot", engine, carts, lambda session, items: quote_cart(session, 1, items, delivery_zone_id=1))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""Queries per authenticated request with and without the principal cache.
+
+Run with: python -m benchmarks.bench_principal_cache
+"""
+from fastapi.testclient import TestClient
+from sqlmodel import Session
+
+from app.core.db import get_session
+from app.main import app
+from app.services.auth_service import principal_cache
+from tests.db_test_utils import QueryCounter, create_test_engine
+
+REQUESTS = 200
+
+
+def _authenticate(client: TestClient) -> dict[str, str]:
+    client.post(
+        "/api/v1/auth/register",
+        json={
+            "business_name": "Bench Bakes",
+            "store_code": "BENCH",
+            "email": "bench@example.com",
+            "password": "secret123",
+        },
+    )
+    response = client.post("/api/v1/auth/login", json={"email": "bench@example.com", "password": "secret123"})
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+def _queries_per_request(client: TestClient, engine, headers: dict[str, str], cached: bool) -> float:
+    principal_cache.clear()
+    with QueryCounter(engine) as counter:
+        for _ in range(REQUESTS):
+            if not cached:
+                principal_cache.clear()
+            client.get("/api/v1/products", headers=headers)
+    return counter.count / REQUESTS
+
+
+def main() -> None:
+    engine = create_test_engine()
+
+    def override_get_session():
+        with Session(engine) as session:
+            yield session
+
+    app.dependency_overrides[get_session] = override_get_session
+    with TestClient(app) as client:
+        headers = _authenticate(client)
+        uncached = _queries_per_request(client, engine, headers, cached=False)
+        principal_cache.reset_stats()
+        cached = _queries_per_request(client, engine, headers, cached=True)
+    app.dependency_overrides.clear()
+
+    print(f"GET /api/v1/products x{REQUESTS}")
+    print(f"  without principal cache: {uncached:.2f} queries/request")
+    print(f"  with principal cache:    {cached:.2f} queries/request")
+    print(f"  cache stats: {principal_cache.stats()}")
+
+
+if __name__ == "__main__":
+    main()
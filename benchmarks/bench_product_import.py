@@ -0,0 +1,87 @@
+"""Import 50k products through POST /products/import vs one create_product per row.
+
+Run with: python -m benchmarks.bench_product_import
+"""
+import asyncio
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+from sqlmodel import Session, SQLModel, create_engine, func, select
+
+from app.core.auth import get_current_business_id
+from app.core.db import get_session
+from app.main import app
+from app.models.business import Business
+from app.models.product import Product
+from app.repositories.product_repo import create_product
+
+ROWS = 50_000
+PER_ROW_SAMPLE = 2_000
+CHUNK_ROWS = 500
+
+
+async def _csv_body():
+    yield b"name,description,base_price_naira\n"
+    for start in range(0, ROWS, CHUNK_ROWS):
+        lines = (f"Product {index},Imported item {index},{index % 50000}\n" for index in range(start, start + CHUNK_ROWS))
+        yield "".join(lines).encode()
+
+
+async def _import() -> dict:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        response = await client.post(
+            "/api/v1/products/import",
+            content=_csv_body(),
+            headers={"Content-Type": "text/csv"},
+        )
+        return response.json()
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{Path(tmp) / 'bench.db'}", connect_args={"check_same_thread": False})
+        SQLModel.metadata.create_all(engine)
+        with Session(engine) as session:
+            session.add(Business(id=1, name="Bench", store_code="BENCH"))
+            session.add(Business(id=2, name="Baseline", store_code="BASE"))
+            session.commit()
+
+        def override_get_session():
+            with Session(engine) as session:
+                yield session
+
+        app.dependency_overrides[get_session] = override_get_session
+        app.dependency_overrides[get_current_business_id] = lambda: 1
+
+        started = time.perf_counter()
+        report = asyncio.run(_import())
+        bulk_seconds = time.perf_counter() - started
+
+        started = time.perf_counter()
+        with Session(engine) as session:
+            for index in range(PER_ROW_SAMPLE):
+                create_product(
+                    session,
+                    business_id=2,
+                    name=f"Product {index}",
+                    description=None,
+                    base_price_kobo=index * 100,
+                    image_url=None,
+                )
+        per_row_seconds = (time.perf_counter() - started) / PER_ROW_SAMPLE * ROWS
+
+        with Session(engine) as session:
+            stored = session.exec(select(func.count()).select_from(Product).where(Product.business_id == 1)).one()
+        app.dependency_overrides.clear()
+        engine.dispose()
+
+    print(f"Import {ROWS} products (CSV, streamed in {CHUNK_ROWS}-row chunks)")
+    print(f"  bulk import endpoint: {bulk_seconds:7.2f}s ({ROWS / bulk_seconds:,.0f} rows/s), created={report['created']}, stored={stored}")
+    print(f"  create_product loop:  {per_row_seconds:7.2f}s (extrapolated from {PER_ROW_SAMPLE} rows)")
+
+
+if __name__ == "__main__":
+    main()
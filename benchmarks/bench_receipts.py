@@ -0,0 +1,92 @@
+"""Receipts rendered per second per core.
+
+Renders the same mix of receipts three ways: in one process re-measuring and
+re-wrapping the business header for every receipt, in one process with the
+per-business layout cache warm, and across a process pool with one worker
+per core.
+
+Run with: python -m benchmarks.bench_receipts
+"""
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+
+from app.services.receipt_service import (
+    ReceiptDocument,
+    ReceiptLine,
+    _business_layout,
+    render_receipt_pdf,
+)
+
+RECEIPTS = 400
+BUSINESSES = 20
+LINES_PER_RECEIPT = 6
+
+
+def _documents() -> list[ReceiptDocument]:
+    issued_at = datetime(2026, 10, 18, 12, 0, tzinfo=timezone.utc)
+    documents = []
+    for order_id in range(1, RECEIPTS + 1):
+        business_id = order_id % BUSINESSES + 1
+        lines = tuple(
+            ReceiptLine(f"Product {index} from the weekly menu", index % 3 + 1, 150000, (index % 3 + 1) * 150000)
+            for index in range(LINES_PER_RECEIPT)
+        )
+        subtotal = sum(line.line_total_kobo for line in lines)
+        documents.append(
+            ReceiptDocument(
+                business_id=business_id,
+                business_name=f"Business number {business_id} Kitchen and Grills",
+                store_code=f"BIZ{business_id}",
+                currency="NGN",
+                order_id=order_id,
+                receipt_number=f"RCP-BIZ{business_id}-{order_id:08d}",
+                issued_at=issued_at,
+                payment_reference=f"ord_{order_id}_bench",
+                lines=lines,
+                subtotal_kobo=subtotal,
+                delivery_fee_kobo=100000,
+                total_kobo=subtotal + 100000,
+            )
+        )
+    return documents
+
+
+def _render_uncached(document: ReceiptDocument) -> bytes:
+    _business_layout.cache_clear()
+    return render_receipt_pdf(document)
+
+
+def _rate(render, documents: list[ReceiptDocument]) -> float:
+    started = time.perf_counter()
+    for document in documents:
+        render(document)
+    return len(documents) / (time.perf_counter() - started)
+
+
+def main() -> None:
+    documents = _documents()
+    cores = os.cpu_count() or 1
+
+    uncached = _rate(_render_uncached, documents[:100])
+    render_receipt_pdf(documents[0])
+    cached = _rate(render_receipt_pdf, documents)
+    print(f"single process, uncached layout: {uncached:7.1f} receipts/s")
+    print(f"single process, cached layout:   {cached:7.1f} receipts/s  ({cached / uncached:.1f}x)")
+
+    with ProcessPoolExecutor(max_workers=cores) as pool:
+        # Warm every worker (imports, fonts) before timing.
+        list(pool.map(render_receipt_pdf, documents[: cores * 4]))
+        started = time.perf_counter()
+        sizes = [len(pdf) for pdf in pool.map(render_receipt_pdf, documents, chunksize=8)]
+        elapsed = time.perf_counter() - started
+    rate = len(sizes) / elapsed
+    print(
+        f"process pool ({cores} workers):    {rate:7.1f} receipts/s  = {rate / cores:.1f} receipts/s/core, "
+        f"avg {sum(sizes) / len(sizes) / 1024:.1f} KiB"
+    )
+
+
+if __name__ == "__main__":
+    main()
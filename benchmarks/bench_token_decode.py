@@ -0,0 +1,33 @@
+"""Per-request cost of decode_access_token, cold versus cached.
+
+Run with: python -m benchmarks.bench_token_decode
+"""
+import timeit
+
+from app.core.security import create_access_token, decode_access_token, token_cache
+
+ITERATIONS = 20_000
+
+
+def main() -> None:
+    token = create_access_token(user_id=1, business_id=1)
+
+    def cold() -> None:
+        token_cache.clear()
+        decode_access_token(token)
+
+    def warm() -> None:
+        decode_access_token(token)
+
+    cold_us = min(timeit.repeat(cold, number=ITERATIONS, repeat=3)) / ITERATIONS * 1e6
+    token_cache.clear()
+    warm_us = min(timeit.repeat(warm, number=ITERATIONS, repeat=3)) / ITERATIONS * 1e6
+
+    print(f"decode_access_token x{ITERATIONS}")
+    print(f"  verify every call: {cold_us:8.2f} us/call")
+    print(f"  verified cache:    {warm_us:8.2f} us/call ({cold_us / warm_us:.1f}x faster)")
+    print(f"  cache stats: {token_cache.stats()}")
+
+
+if __name__ == "__main__":
+    main()
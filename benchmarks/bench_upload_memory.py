@@ -0,0 +1,109 @@
+"""Peak Python heap while uploading product images of growing size.
+
+Streams multipart bodies through POST /uploads/product-image and compares the
+chunked writer against the previous ``file.file.read()`` copy.
+
+Run with: python -m benchmarks.bench_upload_memory
+"""
+import asyncio
+import logging
+import tempfile
+import tracemalloc
+from pathlib import Path
+
+import httpx
+from sqlmodel import Session, SQLModel, create_engine
+
+from app.core.auth import get_current_business_id
+from app.core.config import get_settings
+from app.core.db import get_session
+from app.main import app
+from app.models.business import Business
+
+SIZES_MB = (4, 16, 64)
+CHUNK = 256 * 1024
+BOUNDARY = b"bench-boundary"
+PNG_HEADER = b"\x89PNG\r\n\x1a\n"
+
+
+async def _multipart_body(size: int):
+    yield b"--" + BOUNDARY + b'\r\nContent-Disposition: form-data; name="file"; filename="big.png"\r\n'
+    yield b"Content-Type: image/png\r\n\r\n" + PNG_HEADER
+    remaining = size - len(PNG_HEADER)
+    block = b"\x00" * CHUNK
+    while remaining > 0:
+        yield block[: min(CHUNK, remaining)]
+        remaining -= CHUNK
+    yield b"\r\n--" + BOUNDARY + b"--\r\n"
+
+
+async def _upload(size: int) -> str:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        response = await client.post(
+            "/api/v1/uploads/product-image",
+            content=_multipart_body(size),
+            headers={"Content-Type": f"multipart/form-data; boundary={BOUNDARY.decode()}"},
+        )
+        response.raise_for_status()
+        return response.json()["image_url"]
+
+
+def _read_whole_copy(size: int, directory: Path) -> None:
+    # The previous implementation: the spooled upload is read into memory in one go.
+    with tempfile.SpooledTemporaryFile(max_size=1024 * 1024) as spooled:
+        block = b"\x00" * CHUNK
+        for _ in range(0, size, CHUNK):
+            spooled.write(block)
+        spooled.seek(0)
+        tracemalloc.reset_peak()
+        with (directory / "legacy.png").open("wb") as output:
+            output.write(spooled.read())
+
+
+def _peak_mb(run) -> float:
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    run()
+    _current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak / (1024 * 1024)
+
+
+def main() -> None:
+    # The bodies are zero-filled, so every derivative render is (correctly) skipped.
+    logging.getLogger("app.services.image_derivative_service").setLevel(logging.ERROR)
+    settings = get_settings()
+    settings.max_upload_bytes = max(SIZES_MB) * 1024 * 1024 + 1024
+    app.dependency_overrides[get_current_business_id] = lambda: 1
+
+    with tempfile.TemporaryDirectory() as tmp:
+        settings.media_dir = tmp
+        engine = create_engine(f"sqlite:///{Path(tmp) / 'bench.db'}", connect_args={"check_same_thread": False})
+        SQLModel.metadata.create_all(engine)
+        with Session(engine) as session:
+            session.add(Business(id=1, name="Bench", store_code="BENCH"))
+            session.commit()
+
+        def override_get_session():
+            with Session(engine) as session:
+                yield session
+
+        app.dependency_overrides[get_session] = override_get_session
+        print(f"{'upload':>8} {'streamed peak':>14} {'read() peak':>12}")
+        for size_mb in SIZES_MB:
+            size = size_mb * 1024 * 1024
+            streamed = _peak_mb(lambda: asyncio.run(_upload(size)))
+            legacy = _peak_mb(lambda: _read_whole_copy(size, Path(tmp)))
+            print(f"{size_mb:>6}MB {streamed:>12.2f}MB {legacy:>10.2f}MB")
+
+        # Same bytes again: a new public URL, but no new blob on disk.
+        asyncio.run(_upload(SIZES_MB[0] * 1024 * 1024))
+        blobs = [path for path in (Path(tmp) / "blobs").rglob("*") if path.is_file()]
+        print(f"{len(SIZES_MB) + 1} uploads stored as {len(blobs)} blobs")
+
+    app.dependency_overrides.clear()
+
+
+if __name__ == "__main__":
+    main()
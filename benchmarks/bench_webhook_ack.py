@@ -0,0 +1,60 @@
+"""Time the Paystack webhook acknowledgement (verify + inbox insert + commit).
+
+Run with: python -m benchmarks.bench_webhook_ack
+"""
+import hashlib
+import hmac
+import json
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+from sqlmodel import Session, SQLModel, create_engine
+
+from app.core.config import get_settings
+from app.core.db import get_session
+from app.main import app
+
+DELIVERIES = 2_000
+SECRET = "sk_bench"
+
+
+def main() -> None:
+    get_settings().paystack_secret_key = SECRET
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{Path(tmp) / 'bench.db'}", connect_args={"check_same_thread": False})
+        SQLModel.metadata.create_all(engine)
+
+        def override_get_session():
+            with Session(engine) as session:
+                yield session
+
+        app.dependency_overrides[get_session] = override_get_session
+        latencies = []
+        with TestClient(app) as client:
+            for index in range(DELIVERIES):
+                # Every fourth delivery repeats an earlier event, as Paystack retries do.
+                reference = f"ref-{index - index % 4 if index % 4 == 3 else index}"
+                body = json.dumps({"event": "charge.success", "data": {"reference": reference, "amount": 500000}})
+                signature = hmac.new(SECRET.encode(), body.encode(), hashlib.sha512).hexdigest()
+                started = time.perf_counter()
+                response = client.post(
+                    "/api/v1/webhooks/paystack",
+                    content=body,
+                    headers={"x-paystack-signature": signature},
+                )
+                latencies.append(time.perf_counter() - started)
+                assert response.status_code == 200
+        app.dependency_overrides.clear()
+
+    latencies.sort()
+    print(
+        f"{DELIVERIES} deliveries: p50 {statistics.median(latencies) * 1000:.2f} ms, "
+        f"p99 {latencies[int(DELIVERIES * 0.99) - 1] * 1000:.2f} ms (in-process client, SQLite file)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+"""composite partial indexes for tenant-scoped active listings
+
+Revision ID: 20261018_0002
+Revises: 20260216_0001
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "20261018_0002"
+down_revision = "20260216_0001"
+branch_labels = None
+depends_on = None
+
+
+# The predicates mirror how SQLAlchemy renders ``is_active.is_(True)`` per dialect,
+# which is what lets each planner prove the partial index covers the query.
+def upgrade() -> None:
+    op.create_index(
+        "ix_product_business_active_id",
+        "product",
+        ["business_id", "id"],
+        unique=False,
+        sqlite_where=sa.text("is_active IS 1"),
+        postgresql_where=sa.text("is_active IS true"),
+    )
+    op.create_index(
+        "ix_delivery_zone_business_active_id",
+        "delivery_zone",
+        ["business_id", "id"],
+        unique=False,
+        sqlite_where=sa.text("is_active IS 1"),
+        postgresql_where=sa.text("is_active IS true"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_delivery_zone_business_active_id", table_name="delivery_zone")
+    op.drop_index("ix_product_business_active_id", table_name="product")
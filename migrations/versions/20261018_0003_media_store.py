@@ -0,0 +1,48 @@
+"""content-addressed media blobs and public aliases
+
+Revision ID: 20261018_0003
+Revises: 20261018_0002
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "20261018_0003"
+down_revision = "20261018_0002"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "media_blob",
+        sa.Column("sha256", sa.String(length=64), nullable=False),
+        sa.Column("suffix", sa.String(), nullable=False),
+        sa.Column("size_bytes", sa.Integer(), nullable=False),
+        sa.Column("ref_count", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("sha256"),
+    )
+    op.create_table(
+        "media_alias",
+        sa.Column("public_path", sa.String(), nullable=False),
+        sa.Column("sha256", sa.String(), nullable=False),
+        sa.Column("business_id", sa.Integer(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(["business_id"], ["business.id"]),
+        sa.ForeignKeyConstraint(["sha256"], ["media_blob.sha256"]),
+        sa.PrimaryKeyConstraint("public_path"),
+    )
+    op.create_index(op.f("ix_media_alias_business_id"), "media_alias", ["business_id"], unique=False)
+    op.create_index(op.f("ix_media_alias_sha256"), "media_alias", ["sha256"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_media_alias_sha256"), table_name="media_alias")
+    op.drop_index(op.f("ix_media_alias_business_id"), table_name="media_alias")
+    op.drop_table("media_alias")
+    op.drop_table("media_blob")
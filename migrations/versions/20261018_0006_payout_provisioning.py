@@ -0,0 +1,36 @@
+"""payout provisioning job state
+
+Revision ID: 20261018_0006
+Revises: 20261018_0005
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "20261018_0006"
+down_revision = "20261018_0005"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("payout_profile", sa.Column("attempts", sa.Integer(), nullable=False, server_default="0"))
+    op.add_column("payout_profile", sa.Column("next_attempt_at", sa.DateTime(), nullable=True))
+    op.add_column("payout_profile", sa.Column("last_error", sa.String(), nullable=True))
+    op.create_index(
+        "ix_payout_profile_status_next_attempt_at",
+        "payout_profile",
+        ["status", "next_attempt_at"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_payout_profile_status_next_attempt_at", table_name="payout_profile")
+    op.drop_column("payout_profile", "last_error")
+    op.drop_column("payout_profile", "next_attempt_at")
+    op.drop_column("payout_profile", "attempts")
@@ -0,0 +1,26 @@
+"""one receipt per order
+
+Revision ID: 20261018_0007
+Revises: 20261018_0006
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from __future__ import annotations
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "20261018_0007"
+down_revision = "20261018_0006"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.drop_index(op.f("ix_receipt_order_id"), table_name="receipt")
+    op.create_index(op.f("ix_receipt_order_id"), "receipt", ["order_id"], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_receipt_order_id"), table_name="receipt")
+    op.create_index(op.f("ix_receipt_order_id"), "receipt", ["order_id"], unique=False)
@@ -0,0 +1,27 @@
+"""shared listing cache versions
+
+Revision ID: 20261018_0008
+Revises: 20261018_0007
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "20261018_0008"
+down_revision = "20261018_0007"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("business", sa.Column("catalog_version", sa.Integer(), nullable=False, server_default="0"))
+    op.add_column("business", sa.Column("delivery_zone_version", sa.Integer(), nullable=False, server_default="0"))
+
+
+def downgrade() -> None:
+    op.drop_column("business", "delivery_zone_version")
+    op.drop_column("business", "catalog_version")
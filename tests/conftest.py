@@ -0,0 +1,27 @@
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def _reset_process_caches():
+    try:
+        from app.core.security import token_cache
+        from app.core.storage import get_storage
+        from app.services.auth_service import principal_cache
+        from app.services.delivery_service import delivery_zone_cache
+        from app.services.product_service import catalog_cache
+        from app.services.webhook_inbox_service import known_events
+    except ImportError:
+        yield
+        return
+
+    caches = (principal_cache, token_cache, catalog_cache, delivery_zone_cache, known_events)
+    for cache in caches:
+        cache.clear()
+    principal_cache.reset_stats()
+    token_cache.reset_stats()
+    # The storage backend captures media_dir, which tests point at tmp_path.
+    get_storage.cache_clear()
+    yield
+    for cache in caches:
+        cache.clear()
+    get_storage.cache_clear()
@@ -0,0 +1,173 @@
+"""A local stand-in for the Paystack API, for tests and benchmarks.
+
+Runs a real HTTP/1.1 keep-alive server on a free localhost port, so client
+connection reuse, timeouts and retries behave as they would over the network.
+"""
+import json
+import re
+import socket
+import threading
+import time
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+from uuid import uuid4
+
+
+class PaystackStub:
+    def __init__(self, secret_key: str = "sk_test_stub", latency_seconds: float = 0.0) -> None:
+        self.secret_key = secret_key
+        self.latency_seconds = latency_seconds
+        self.transactions: dict[str, dict] = {}
+        self.subaccounts: list[dict] = []
+        self.requests = 0
+        self.connections = 0
+        self._failures: list[int] = []
+        self._dropped_responses = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), _handler_for(self))
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def fail_next(self, count: int, status_code: int = 503) -> None:
+        """Answer the next ``count`` requests with ``status_code`` (0 drops the connection)."""
+        with self._lock:
+            self._failures.extend([status_code] * count)
+
+    def drop_next_responses(self, count: int) -> None:
+        """Handle the next ``count`` requests, then close the connection without answering."""
+        with self._lock:
+            self._dropped_responses += count
+
+    def _drop_response(self) -> bool:
+        with self._lock:
+            if not self._dropped_responses:
+                return False
+            self._dropped_responses -= 1
+            return True
+
+    def mark_paid(self, reference: str) -> None:
+        self.transactions[reference]["status"] = "success"
+
+    def __enter__(self) -> "PaystackStub":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *_exc) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _next_failure(self) -> int | None:
+        with self._lock:
+            self.requests += 1
+            return self._failures.pop(0) if self._failures else None
+
+    def _route(self, method: str, path: str, body: dict) -> tuple[int, dict]:
+        if method == "POST" and path == "/transaction/initialize":
+            reference = body.get("reference") or uuid4().hex
+            if reference in self.transactions:
+                return 400, {"status": False, "message": "Duplicate Transaction Reference"}
+            access_code = uuid4().hex[:12]
+            self.transactions[reference] = {**body, "reference": reference, "status": "abandoned"}
+            return 200, {
+                "status": True,
+                "message": "Authorization URL created",
+                "data": {
+                    "authorization_url": f"{self.base_url}/checkout/{access_code}",
+                    "access_code": access_code,
+                    "reference": reference,
+                },
+            }
+        verify = re.fullmatch(r"/transaction/verify/(?P<reference>[^/]+)", path)
+        if method == "GET" and verify:
+            transaction = self.transactions.get(verify["reference"])
+            if transaction is None:
+                return 400, {"status": False, "message": "Transaction reference not found"}
+            return 200, {"status": True, "message": "Verification successful", "data": transaction}
+        if method == "POST" and path == "/subaccount":
+            subaccount = {
+                **body,
+                "subaccount_code": f"ACCT_{uuid4().hex[:10]}",
+                "createdAt": datetime.now(timezone.utc).isoformat(),
+            }
+            self.subaccounts.append(subaccount)
+            return 201, {"status": True, "message": "Subaccount created", "data": subaccount}
+        listing = urlsplit(path)
+        if method == "GET" and listing.path == "/subaccount":
+            query = {key: values[0] for key, values in parse_qs(listing.query).items()}
+            per_page, page = int(query.get("perPage", 50)), int(query.get("page", 1))
+            created = [
+                subaccount
+                for subaccount in self.subaccounts
+                if "from" not in query or datetime.fromisoformat(subaccount["createdAt"]) >= _aware(query["from"])
+            ]
+            data = created[(page - 1) * per_page : page * per_page]
+            return 200, {"status": True, "message": "Subaccounts retrieved", "data": data}
+        return 404, {"status": False, "message": "Not found"}
+
+
+def _aware(timestamp: str) -> datetime:
+    parsed = datetime.fromisoformat(timestamp)
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def _handler_for(stub: PaystackStub) -> type[BaseHTTPRequestHandler]:
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def setup(self) -> None:
+            super().setup()
+            # Headers and body go out in separate writes; without this, Nagle plus
+            # delayed ACKs add ~40 ms to every keep-alive response.
+            self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            with stub._lock:
+                stub.connections += 1
+
+        def log_message(self, *_args) -> None:
+            pass
+
+        def _handle(self, method: str) -> None:
+            length = int(self.headers.get("content-length") or 0)
+            raw = self.rfile.read(length) if length else b""
+            if stub.latency_seconds:
+                time.sleep(stub.latency_seconds)
+
+            failure = stub._next_failure()
+            if failure == 0:
+                self.close_connection = True
+                self.connection.close()
+                return
+            if failure is not None:
+                status_code, body = failure, {"status": False, "message": "Injected failure"}
+            elif self.headers.get("authorization") != f"Bearer {stub.secret_key}":
+                status_code, body = 401, {"status": False, "message": "Invalid key"}
+            else:
+                status_code, body = stub._route(method, self.path, json.loads(raw) if raw else {})
+                if stub._drop_response():
+                    self.close_connection = True
+                    self.connection.close()
+                    return
+
+            payload = json.dumps(body).encode()
+            self.send_response(status_code)
+            self.send_header("content-type", "application/json")
+            self.send_header("content-length", str(len(payload)))
+            try:
+                self.end_headers()
+                self.wfile.write(payload)
+            except (BrokenPipeError, ConnectionResetError):
+                # The client gave up on the call (cancelled or timed out).
+                self.close_connection = True
+
+        def do_GET(self) -> None:
+            self._handle("GET")
+
+        def do_POST(self) -> None:
+            self._handle("POST")
+
+    return Handler
@@ -0,0 +1,96 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("fastapi")
+pytest.importorskip("sqlmodel")
+pytest.importorskip("aiosqlite")
+pytest.importorskip("greenlet")
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel import Session, SQLModel, create_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.api.v1.business import get_business_endpoint_async
+from app.api.v1.delivery import DeliveryZoneResponse, list_delivery_zones_endpoint_async
+from app.api.v1.products import ProductResponse, list_products_endpoint_async
+from app.core.auth import get_current_business_id_async
+from app.core.db import get_async_session, to_async_url
+from app.models.business import Business
+from app.models.delivery_zone import DeliveryZone
+from app.models.product import Product
+from app.models.user import User
+from app.services.auth_service import get_principal_async
+
+
+def _seed(database_path) -> None:
+    engine = create_engine(f"sqlite:///{database_path}")
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        session.add(Business(id=1, name="Biz One", store_code="BIZ1"))
+        session.add(Business(id=2, name="Biz Two", store_code="BIZ2"))
+        session.add(User(id=1, business_id=1, email="one@example.com", password_hash="x"))
+        session.add(Product(business_id=1, name="Cake", base_price_kobo=100000))
+        session.add(Product(business_id=1, name="Old Cake", base_price_kobo=1000, is_active=False))
+        session.add(Product(business_id=2, name="Bread", base_price_kobo=50000))
+        session.add(DeliveryZone(business_id=1, name="Island", fee_kobo=250000))
+        session.commit()
+    engine.dispose()
+
+
+def test_to_async_url_maps_sync_drivers() -> None:
+    assert to_async_url("sqlite:///./app.db") == "sqlite+aiosqlite:///./app.db"
+    assert (
+        to_async_url("postgresql://user:pw@db.example.com/app?sslmode=require&channel_binding=require")
+        == "postgresql+asyncpg://user:pw@db.example.com/app?ssl=require"
+    )
+
+
+def test_async_read_endpoints_are_tenant_scoped(tmp_path) -> None:
+    database_path = tmp_path / "reads.db"
+    _seed(database_path)
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{database_path}")
+
+    async def override_get_async_session():
+        async with AsyncSession(async_engine, expire_on_commit=False) as session:
+            yield session
+
+    async def business_one() -> int:
+        return 1
+
+    reads = FastAPI()
+    reads.add_api_route("/products", list_products_endpoint_async, response_model=list[ProductResponse])
+    reads.add_api_route(
+        "/delivery-zones",
+        list_delivery_zones_endpoint_async,
+        response_model=list[DeliveryZoneResponse],
+    )
+    reads.add_api_route("/business", get_business_endpoint_async)
+    reads.dependency_overrides[get_async_session] = override_get_async_session
+    reads.dependency_overrides[get_current_business_id_async] = business_one
+
+    with TestClient(reads) as client:
+        products = client.get("/products").json()
+        assert [product["name"] for product in products] == ["Cake"]
+        assert client.get("/delivery-zones").json()[0]["fee_kobo"] == 250000
+        assert client.get("/business").json()["store_code"] == "BIZ1"
+
+    asyncio.run(async_engine.dispose())
+
+
+def test_get_principal_async_loads_user_and_business(tmp_path) -> None:
+    database_path = tmp_path / "principal.db"
+    _seed(database_path)
+
+    async def load():
+        async_engine = create_async_engine(f"sqlite+aiosqlite:///{database_path}")
+        async with AsyncSession(async_engine, expire_on_commit=False) as session:
+            principal = await get_principal_async(session, user_id=1)
+        await async_engine.dispose()
+        return principal
+
+    principal = asyncio.run(load())
+    assert principal.business_id == 1
+    assert principal.store_code == "BIZ1"
@@ -10,7 +10,8 @@ from sqlmodel import Session
 
 from app.core.db import get_session
 from app.main import app
-from tests.db_test_utils import create_test_engine
+from app.services.auth_service import principal_cache
+from tests.db_test_utils import QueryCounter, create_test_engine
 
 
 def test_register_login_me_flow_and_error_shape() -> None:
@@ -57,3 +58,47 @@ def test_register_login_me_flow_and_error_shape() -> None:
         assert me_json["business"]["store_code"] == "BLESSING"
 
     app.dependency_overrides.clear()
+
+
+def test_principal_cache_skips_queries_and_invalidates_on_business_rename() -> None:
+    engine = create_test_engine()
+
+    def override_get_session():
+        with Session(engine) as session:
+            yield session
+
+    app.dependency_overrides[get_session] = override_get_session
+
+    with TestClient(app) as client:
+        client.post(
+            "/api/v1/auth/register",
+            json={
+                "business_name": "Blessing Cakes",
+                "store_code": "BLESSING",
+                "email": "owner@example.com",
+                "password": "secret123",
+            },
+        )
+        login_response = client.post(
+            "/api/v1/auth/login",
+            json={"email": "owner@example.com", "password": "secret123"},
+        )
+        headers = {"Authorization": f"Bearer {login_response.json()['access_token']}"}
+
+        with QueryCounter(engine) as cold:
+            assert client.get("/api/v1/me", headers=headers).status_code == 200
+        with QueryCounter(engine) as warm:
+            assert client.get("/api/v1/me", headers=headers).status_code == 200
+
+        assert cold.count == 2
+        assert warm.count == 0
+        assert principal_cache.stats()["hits"] == 1
+        assert principal_cache.stats()["misses"] == 1
+
+        rename_response = client.patch("/api/v1/business", json={"name": "Blessing Bakes"}, headers=headers)
+        assert rename_response.status_code == 200
+
+        me_response = client.get("/api/v1/me", headers=headers)
+        assert me_response.json()["business"]["name"] == "Blessing Bakes"
+
+    app.dependency_overrides.clear()
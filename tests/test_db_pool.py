@@ -0,0 +1,60 @@
+import pytest
+
+pytest.importorskip("sqlalchemy")
+pytest.importorskip("sqlmodel")
+
+from sqlalchemy import exc
+from sqlalchemy.pool import StaticPool
+
+from app.core.config import get_settings
+from app.core.db import create_db_engine
+from app.core.db_pool import InstrumentedQueuePool, PoolStats
+
+
+def test_sqlite_memory_url_uses_static_pool() -> None:
+    engine = create_db_engine("sqlite://", get_settings())
+    assert isinstance(engine.pool, StaticPool)
+
+
+def test_pool_settings_applied_and_stats_track_checkouts_and_timeouts(tmp_path) -> None:
+    settings = get_settings().model_copy(
+        update={"db_pool_size": 1, "db_max_overflow": 0, "db_pool_timeout_seconds": 0.05}
+    )
+    stats = PoolStats()
+    engine = create_db_engine(f"sqlite:///{tmp_path / 'pool.db'}", settings, stats=stats)
+    assert isinstance(engine.pool, InstrumentedQueuePool)
+    assert engine.pool.size() == 1
+
+    held = engine.connect()
+    assert stats.snapshot(engine.pool)["checked_out"] == 1
+
+    with pytest.raises(exc.TimeoutError):
+        engine.connect()
+
+    held.close()
+    with engine.connect():
+        pass
+
+    snapshot = stats.snapshot(engine.pool)
+    assert snapshot["checked_out"] == 0
+    assert snapshot["checkouts"] == 2
+    assert snapshot["timeouts"] == 1
+    assert snapshot["peak_checked_out"] == 1
+    assert sum(snapshot["wait_histogram"].values()) == 2
+
+    engine.dispose()
+    with engine.connect():
+        pass
+    assert stats.snapshot(engine.pool)["checkouts"] == 3
+
+
+def test_db_pool_health_endpoint_reports_stats() -> None:
+    pytest.importorskip("fastapi")
+    from fastapi.testclient import TestClient
+
+    from app.main import app
+
+    with TestClient(app) as client:
+        response = client.get("/api/v1/health/db-pool")
+        assert response.status_code == 200
+        assert "checked_out" in response.json()["sync"]
@@ -89,3 +89,27 @@ def test_delivery_zone_tenant_scoping() -> None:
         assert list_res.json() == []
 
     app.dependency_overrides.clear()
+
+
+def test_delivery_zones_etag_invalidated_by_update() -> None:
+    engine = _test_engine()
+    _seed_business(engine, business_id=1, name="Biz One", store_code="BIZ1")
+
+    def override_get_session():
+        with Session(engine) as session:
+            yield session
+
+    app.dependency_overrides[get_session] = override_get_session
+    app.dependency_overrides[get_current_business_id] = lambda: 1
+
+    with TestClient(app) as client:
+        zone_id = client.post("/api/v1/delivery-zones", json={"name": "Island", "fee_naira": 2500}).json()["id"]
+        etag = client.get("/api/v1/delivery-zones").headers["etag"]
+        assert client.get("/api/v1/delivery-zones", headers={"If-None-Match": etag}).status_code == 304
+
+        client.patch(f"/api/v1/delivery-zones/{zone_id}", json={"fee_naira": 3000})
+        refreshed = client.get("/api/v1/delivery-zones", headers={"If-None-Match": etag})
+        assert refreshed.status_code == 200
+        assert refreshed.json()[0]["fee_kobo"] == 300000
+
+    app.dependency_overrides.clear()
@@ -0,0 +1,109 @@
+import io
+import os
+import time
+
+import pytest
+
+pytest.importorskip("fastapi")
+pytest.importorskip("sqlmodel")
+pytest.importorskip("PIL")
+
+from fastapi.testclient import TestClient
+from PIL import Image
+from sqlmodel import Session
+
+from app.core.auth import get_current_business_id
+from app.core.config import get_settings
+from app.core.db import get_session
+from app.main import app
+from app.models.business import Business
+from app.services import product_service
+from app.services.image_derivative_service import derivative_path, render_derivatives
+from tests.db_test_utils import create_test_engine
+
+
+def _image_bytes(size: tuple[int, int], mode: str, image_format: str) -> bytes:
+    buffer = io.BytesIO()
+    Image.new(mode, size, (200, 30, 30, 128) if mode == "RGBA" else (200, 30, 30)).save(buffer, format=image_format)
+    return buffer.getvalue()
+
+
+def test_render_derivatives_resizes_and_is_idempotent(tmp_path) -> None:
+    source = tmp_path / "photo.png"
+    source.write_bytes(_image_bytes((2000, 1000), "RGBA", "PNG"))
+
+    assert render_derivatives(str(source)) == ["thumb", "medium", "webp"]
+    with Image.open(derivative_path(source, "thumb")) as thumb:
+        assert thumb.size == (320, 160)
+        assert thumb.format == "JPEG"
+    with Image.open(derivative_path(source, "webp")) as webp:
+        assert webp.size == (1024, 512)
+        assert webp.mode == "RGBA"
+
+    mtimes = {variant: derivative_path(source, variant).stat().st_mtime_ns for variant in ("thumb", "medium", "webp")}
+    assert render_derivatives(str(source)) == []
+    assert mtimes == {variant: derivative_path(source, variant).stat().st_mtime_ns for variant in mtimes}
+
+    derivative_path(source, "medium").unlink()
+    later = time.time() + 5
+    os.utime(source, (later, later))
+    assert render_derivatives(str(source)) == ["thumb", "medium", "webp"]
+    assert not list((tmp_path / "derived").glob(".derive-*"))
+
+
+def test_uploaded_image_variants_appear_in_product_listing(tmp_path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(get_settings(), "media_dir", str(tmp_path))
+    futures = []
+    schedule = product_service.schedule_derivatives
+
+    def capture_schedule(*args, **kwargs):
+        futures.append(schedule(*args, **kwargs))
+        return futures[-1]
+
+    monkeypatch.setattr(product_service, "schedule_derivatives", capture_schedule)
+
+    engine = create_test_engine()
+    with Session(engine) as session:
+        session.add(Business(id=1, name="Biz One", store_code="BIZ1"))
+        session.commit()
+
+    def override_get_session():
+        with Session(engine) as session:
+            yield session
+
+    app.dependency_overrides[get_session] = override_get_session
+    app.dependency_overrides[get_current_business_id] = lambda: 1
+
+    with TestClient(app) as client:
+        jpeg = _image_bytes((1600, 1200), "RGB", "JPEG")
+        upload = client.post("/api/v1/uploads/product-image", files={"file": ("cake.jpg", jpeg, "image/jpeg")})
+        image_url = upload.json()["image_url"]
+        client.post("/api/v1/products", json={"name": "Cake", "base_price_naira": 1000, "image_url": image_url})
+        client.get("/api/v1/products")
+
+        assert futures[0].result(timeout=60) == ["thumb", "medium", "webp"]
+        deadline = time.monotonic() + 5
+        variants = {}
+        while not variants and time.monotonic() < deadline:
+            variants = client.get("/api/v1/products").json()[0]["image_variants"]
+            time.sleep(0.05)
+
+        stem = image_url.rsplit("/", 1)[1].split(".")[0]
+        assert variants == {
+            "thumb": f"/media/products/derived/{stem}_thumb.jpg",
+            "medium": f"/media/products/derived/{stem}_medium.jpg",
+            "webp": f"/media/products/derived/{stem}_webp.webp",
+        }
+
+        # The same photo again is rendered zero more times: its alias only gets links.
+        [blob_thumb] = (tmp_path / "blobs").rglob("derived/*_thumb.jpg")
+        rendered_at = blob_thumb.stat().st_mtime_ns
+        again = client.post("/api/v1/uploads/product-image", files={"file": ("cake.jpg", jpeg, "image/jpeg")})
+        assert futures[1].result(timeout=60) == ["thumb", "medium", "webp"]
+        again_stem = again.json()["image_url"].rsplit("/", 1)[1].split(".")[0]
+        again_thumb = tmp_path / "products" / "derived" / f"{again_stem}_thumb.jpg"
+        assert blob_thumb.stat().st_mtime_ns == rendered_at
+        assert os.path.samefile(again_thumb, blob_thumb)
+        assert len(list((tmp_path / "blobs").rglob("derived/*"))) == 3
+
+    app.dependency_overrides.clear()
@@ -0,0 +1,113 @@
+import gzip
+
+import pytest
+
+pytest.importorskip("fastapi")
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.core.media_files import IMMUTABLE_CACHE_CONTROL, REVALIDATE_CACHE_CONTROL, MediaFiles
+
+SHA = "ab" + "0" * 62
+ALIAS = "0123456789abcdef0123456789abcdef"
+
+
+def _client(tmp_path, **options) -> TestClient:
+    app = FastAPI()
+    app.mount("/media", MediaFiles(directory=str(tmp_path), **options), name="media")
+    return TestClient(app)
+
+
+def _write(path, data: bytes):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(data)
+    return path
+
+
+def test_content_addressed_paths_are_immutable_with_strong_etags(tmp_path) -> None:
+    _write(tmp_path / "blobs" / "ab" / f"{SHA}.png", b"png-bytes")
+    _write(tmp_path / "products" / f"{ALIAS}.png", b"png-bytes")
+    _write(tmp_path / "products" / "derived" / f"{ALIAS}_thumb.jpg", b"jpg-bytes")
+    _write(tmp_path / "products" / "logo.png", b"logo")
+
+    with _client(tmp_path) as client:
+        alias = client.get(f"/media/products/{ALIAS}.png")
+        assert alias.headers["cache-control"] == IMMUTABLE_CACHE_CONTROL
+        assert not alias.headers["etag"].startswith("W/")
+        assert client.get(f"/media/products/derived/{ALIAS}_thumb.jpg").headers["cache-control"] == IMMUTABLE_CACHE_CONTROL
+        assert client.get("/media/products/logo.png").headers["cache-control"] == REVALIDATE_CACHE_CONTROL
+
+        not_modified = client.get(f"/media/products/{ALIAS}.png", headers={"If-None-Match": alias.headers["etag"]})
+        assert not_modified.status_code == 304
+        assert not_modified.content == b""
+
+
+def test_blobs_are_only_reachable_through_an_alias(tmp_path) -> None:
+    _write(tmp_path / "blobs" / "ab" / f"{SHA}.png", b"png-bytes")
+    _write(tmp_path / "blobs" / ".upload-spool.part", b"half an upload")
+    _write(tmp_path / "products" / f"{ALIAS}.png", b"png-bytes")
+
+    with _client(tmp_path) as client:
+        assert client.get(f"/media/blobs/ab/{SHA}.png").status_code == 404
+        assert client.get("/media/blobs/.upload-spool.part").status_code == 404
+        assert client.get(f"/media/products/../blobs/ab/{SHA}.png").status_code == 404
+        assert client.get(f"/media/products/{ALIAS}.png").content == b"png-bytes"
+
+
+def test_range_requests_and_if_range(tmp_path) -> None:
+    _write(tmp_path / "receipts" / f"{ALIAS}.pdf", bytes(range(256)))
+
+    with _client(tmp_path) as client:
+        full = client.get(f"/media/receipts/{ALIAS}.pdf")
+        assert full.headers["accept-ranges"] == "bytes"
+
+        partial = client.get(f"/media/receipts/{ALIAS}.pdf", headers={"Range": "bytes=10-19"})
+        assert partial.status_code == 206
+        assert partial.headers["content-range"] == "bytes 10-19/256"
+        assert partial.content == bytes(range(10, 20))
+
+        stale = client.get(
+            f"/media/receipts/{ALIAS}.pdf",
+            headers={"Range": "bytes=10-19", "If-Range": '"some-older-version"'},
+        )
+        assert stale.status_code == 200
+        assert len(stale.content) == 256
+
+
+def test_precompressed_sidecars_for_compressible_types_only(tmp_path) -> None:
+    svg = b"<svg xmlns='http://www.w3.org/2000/svg'>" + b"<g/>" * 200 + b"</svg>"
+    _write(tmp_path / "products" / "badge.svg", svg)
+    _write(tmp_path / "products" / "badge.svg.gz", gzip.compress(svg))
+    _write(tmp_path / "products" / f"{ALIAS}.png", b"png-bytes")
+    _write(tmp_path / "products" / f"{ALIAS}.png.gz", gzip.compress(b"png-bytes"))
+
+    with _client(tmp_path) as client:
+        compressed = client.get("/media/products/badge.svg", headers={"Accept-Encoding": "gzip"})
+        assert compressed.headers["content-encoding"] == "gzip"
+        assert compressed.headers["content-type"].startswith("image/svg+xml")
+        assert compressed.headers["vary"] == "Accept-Encoding"
+        assert compressed.content == svg
+
+        identity = client.get("/media/products/badge.svg", headers={"Accept-Encoding": "identity"})
+        assert "content-encoding" not in identity.headers
+        assert identity.headers["etag"] != compressed.headers["etag"]
+
+        image = client.get(f"/media/products/{ALIAS}.png", headers={"Accept-Encoding": "gzip"})
+        assert "content-encoding" not in image.headers
+        assert image.content == b"png-bytes"
+
+
+def test_accel_redirect_hands_the_body_to_the_proxy(tmp_path) -> None:
+    _write(tmp_path / "products" / f"{ALIAS}.png", b"png-bytes")
+
+    with _client(tmp_path, accel_redirect_prefix="/_media/") as client:
+        response = client.get(f"/media/products/{ALIAS}.png")
+        assert response.status_code == 200
+        assert response.headers["x-accel-redirect"] == f"/_media/products/{ALIAS}.png"
+        assert response.headers["content-type"] == "image/png"
+        assert response.headers["cache-control"] == IMMUTABLE_CACHE_CONTROL
+        assert response.content == b""
+
+        missing = client.get("/media/products/missing.png")
+        assert missing.status_code == 404
@@ -0,0 +1,37 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+hypothesis = pytest.importorskip("hypothesis")
+
+from hypothesis import given, strategies as st
+from hypothesis.extra.numpy import arrays
+
+from app.services.money import MAX_BATCH_TOTAL_KOBO, calc_fees_kobo_batch, calc_platform_fee_kobo
+
+totals_kobo = st.one_of(
+    st.integers(min_value=0, max_value=10**9),
+    st.integers(min_value=0, max_value=MAX_BATCH_TOTAL_KOBO),
+)
+
+
+@given(arrays(np.int64, st.integers(min_value=0, max_value=200), elements=totals_kobo))
+def test_batch_fees_match_scalar_bit_for_bit(totals) -> None:
+    fees, payouts = calc_fees_kobo_batch(totals)
+
+    assert fees.dtype == np.int64
+    assert payouts.dtype == np.int64
+    assert fees.tolist() == [calc_platform_fee_kobo(int(total)) for total in totals]
+    assert (fees + payouts).tolist() == totals.tolist()
+
+
+def test_batch_fees_edges_and_rejections() -> None:
+    fees, payouts = calc_fees_kobo_batch(np.array([0, 1, 101, 200, 1800000, MAX_BATCH_TOTAL_KOBO], dtype=np.int64))
+    assert fees.tolist() == [0, 1, 2, 3, 27000, calc_platform_fee_kobo(int(MAX_BATCH_TOTAL_KOBO))]
+    assert payouts[-1] == MAX_BATCH_TOTAL_KOBO - fees[-1]
+
+    with pytest.raises(ValueError):
+        calc_fees_kobo_batch(np.array([-1]))
+    with pytest.raises(ValueError):
+        calc_fees_kobo_batch(np.array([MAX_BATCH_TOTAL_KOBO + 1], dtype=np.int64))
+    with pytest.raises(ValueError):
+        calc_fees_kobo_batch(np.array([1.5]))
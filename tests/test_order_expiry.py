@@ -0,0 +1,126 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+pytest.importorskip("sqlmodel")
+
+from sqlalchemy import insert
+from sqlmodel import Session, select
+
+from app.models.business import Business
+from app.models.customer import Customer
+from app.models.order import Order
+from app.services.order_expiry_service import OrderExpirySweeper, SweeperStats, sweep_expired_orders
+from tests.db_test_utils import QueryCounter, create_test_engine
+
+NOW = datetime(2026, 10, 18, 12, 0, tzinfo=timezone.utc)
+
+
+def _seed_orders(engine, expiries: list[tuple[str, datetime]]) -> None:
+    with Session(engine) as session:
+        session.add(Business(id=1, name="Biz One", store_code="BIZ1"))
+        session.add(Customer(id=1, business_id=1, channel_type="telegram", channel_user_id="tg-1"))
+        session.commit()
+        session.execute(
+            insert(Order),
+            [
+                {
+                    "business_id": 1,
+                    "customer_id": 1,
+                    "channel_type": "telegram",
+                    "status": status,
+                    "subtotal_kobo": 100,
+                    "delivery_fee_kobo": 0,
+                    "total_kobo": 100,
+                    "platform_fee_kobo": 2,
+                    "business_payout_kobo": 98,
+                    "expires_at": expires_at,
+                    "created_at": expires_at - timedelta(hours=1),
+                }
+                for status, expires_at in expiries
+            ],
+        )
+        session.commit()
+
+
+def _statuses(engine) -> list[str]:
+    with Session(engine) as session:
+        return list(session.exec(select(Order.status).order_by(Order.id)).all())
+
+
+def test_sweep_expires_overdue_reservations_in_bounded_batches() -> None:
+    engine = create_test_engine()
+    overdue = [("reserved", NOW - timedelta(minutes=minutes)) for minutes in range(25, 0, -1)]
+    _seed_orders(
+        engine,
+        overdue + [("reserved", NOW + timedelta(minutes=5)), ("paid", NOW - timedelta(hours=2))],
+    )
+
+    with Session(engine) as session, QueryCounter(engine) as counter:
+        result = sweep_expired_orders(session, holder="a", batch_size=10, max_batches=2, lease_seconds=60, now=NOW)
+    assert (result.swept, result.batches, result.lag_seconds) == (20, 2, 25 * 60)
+    # Per batch: lease renewal, overdue select, update, unused payment cleanup;
+    # the first renewal misses and inserts the lease row inside a savepoint
+    # (three more statements).
+    assert counter.count == 2 * 4 + 3
+
+    with Session(engine) as session:
+        result = sweep_expired_orders(session, holder="a", batch_size=10, max_batches=2, lease_seconds=60, now=NOW)
+    assert (result.swept, result.batches, result.lag_seconds) == (5, 1, 5 * 60)
+
+    assert _statuses(engine) == ["expired"] * 25 + ["reserved", "paid"]
+
+
+def test_only_the_lease_holder_sweeps_until_the_lease_lapses() -> None:
+    engine = create_test_engine()
+    _seed_orders(engine, [("reserved", NOW - timedelta(minutes=1))])
+
+    with Session(engine) as session:
+        assert sweep_expired_orders(
+            session, holder="a", batch_size=10, max_batches=1, lease_seconds=60, clock=lambda: NOW
+        )
+        assert (
+            sweep_expired_orders(session, holder="b", batch_size=10, max_batches=1, lease_seconds=60, clock=lambda: NOW)
+            is None
+        )
+        later = NOW + timedelta(seconds=61)
+        taken_over = sweep_expired_orders(
+            session, holder="b", batch_size=10, max_batches=1, lease_seconds=60, clock=lambda: later
+        )
+    assert taken_over is not None and taken_over.swept == 0 and taken_over.lag_seconds is None
+
+    stats = SweeperStats()
+    first = OrderExpirySweeper(lambda: Session(engine), 30, 10, 1, 60, stats=stats)
+    second = OrderExpirySweeper(lambda: Session(engine), 30, 10, 1, 60, stats=stats)
+    assert first.run_once() is not None
+    assert second.run_once() is None
+    first._release()
+    assert second.run_once() is not None
+    assert stats.snapshot()["runs"] == 2
+    assert stats.snapshot()["lease_denied"] == 1
+
+
+def test_a_sweep_longer_than_its_lease_keeps_renewing_it() -> None:
+    engine = create_test_engine()
+    _seed_orders(engine, [("reserved", NOW - timedelta(minutes=minutes)) for minutes in range(3, 0, -1)])
+    # Every batch takes 20 seconds of a 30 second lease.
+    ticks = iter(NOW + timedelta(seconds=20 * batch) for batch in range(10))
+
+    with Session(engine) as session:
+        result = sweep_expired_orders(
+            session, holder="a", batch_size=1, max_batches=3, lease_seconds=30, now=NOW, clock=lambda: next(ticks)
+        )
+        assert (result.swept, result.batches) == (3, 3)
+        # The last batch renewed at NOW+40s, so the lease is still held well after NOW+30s.
+        assert (
+            sweep_expired_orders(
+                session,
+                holder="b",
+                batch_size=1,
+                max_batches=1,
+                lease_seconds=30,
+                clock=lambda: NOW + timedelta(seconds=45),
+            )
+            is None
+        )
+    assert _statuses(engine) == ["expired"] * 3
@@ -0,0 +1,137 @@
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+pytest.importorskip("fastapi")
+pytest.importorskip("sqlmodel")
+
+from fastapi.testclient import TestClient
+from sqlalchemy import func
+from sqlmodel import Session, SQLModel, create_engine, select
+
+from app.core.auth import get_current_business_id
+from app.core.db import get_session
+from app.main import app
+from app.models.business import Business
+from app.models.customer import Customer
+from app.models.order import Order
+from app.models.order_item import OrderItem
+from app.models.product import Product
+from app.services.order_service import reserve_order
+from app.services.pricing_service import CartLine
+from tests.db_test_utils import QueryCounter, create_test_engine
+
+
+def test_reserve_writes_order_and_items_without_refresh() -> None:
+    engine = create_test_engine()
+    with Session(engine) as session:
+        session.add(Business(id=1, name="Biz One", store_code="BIZ1"))
+        session.add(Product(id=1, business_id=1, name="Cake", base_price_kobo=1800000))
+        session.add(Product(id=2, business_id=1, name="Bread", base_price_kobo=100500))
+        session.commit()
+
+    def override_get_session():
+        with Session(engine) as session:
+            yield session
+
+    app.dependency_overrides[get_session] = override_get_session
+    app.dependency_overrides[get_current_business_id] = lambda: 1
+
+    with TestClient(app) as client:
+        payload = {
+            "channel_type": "telegram",
+            "channel_user_id": "tg-42",
+            "items": [{"product_id": 1, "quantity": 2}, {"product_id": 2, "quantity": 3}],
+        }
+        with QueryCounter(engine) as counter:
+            first = client.post("/api/v1/orders/reserve", json={**payload, "display_name": "Ada"})
+        assert first.status_code == 200
+        # product IN query, customer upsert, order insert, item batch insert.
+        assert counter.count == 4
+        body = first.json()
+        assert body["status"] == "reserved"
+        assert body["total_kobo"] == 2 * 1800000 + 3 * 100500
+        assert body["business_payout_kobo"] == body["total_kobo"] - body["platform_fee_kobo"]
+
+        second = client.post("/api/v1/orders/reserve", json=payload)
+        assert second.status_code == 200
+        assert second.json()["customer_id"] == body["customer_id"]
+        assert second.json()["order_id"] != body["order_id"]
+
+        response = client.post("/api/v1/orders/reserve", json={**payload, "items": [{"product_id": 99, "quantity": 1}]})
+        assert response.status_code == 404
+        response = client.post(
+            "/api/v1/orders/reserve", json={**payload, "items": [{"product_id": 1, "quantity": 10**12}]}
+        )
+        assert response.status_code == 422
+
+        # A snapshot cached before a price change elsewhere is never charged.
+        assert client.get("/api/v1/products").status_code == 200
+        with Session(engine) as session:
+            session.get(Product, 1).base_price_kobo = 2000000
+            session.commit()
+        repriced = client.post("/api/v1/orders/reserve", json={**payload, "items": [{"product_id": 1, "quantity": 1}]})
+        assert repriced.json()["subtotal_kobo"] == 2000000
+
+    app.dependency_overrides.clear()
+
+    with Session(engine) as session:
+        customer = session.exec(select(Customer)).one()
+        assert customer.display_name == "Ada"  # a later anonymous reservation keeps the known name
+        items = session.exec(select(OrderItem).where(OrderItem.order_id == body["order_id"])).all()
+        assert [(item.name_snapshot, item.quantity, item.line_total_kobo) for item in items] == [
+            ("Cake", 2, 3600000),
+            ("Bread", 3, 301500),
+        ]
+        assert session.exec(select(func.count()).select_from(Order)).one() == 3
+
+
+def test_parallel_reservations_across_tenants(tmp_path) -> None:
+    tenants, customers_per_tenant, reservations = 4, 25, 2_000
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'orders.db'}",
+        connect_args={"check_same_thread": False, "timeout": 30},
+    )
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        for business_id in range(1, tenants + 1):
+            session.add(Business(id=business_id, name=f"Biz {business_id}", store_code=f"BIZ{business_id}"))
+            for index in range(5):
+                session.add(Product(business_id=business_id, name=f"Item {index}", base_price_kobo=(index + 1) * 10000))
+        session.commit()
+        product_ids = {
+            business_id: session.exec(select(Product.id).where(Product.business_id == business_id)).all()
+            for business_id in range(1, tenants + 1)
+        }
+
+    def reserve(index: int) -> float:
+        business_id = index % tenants + 1
+        items = [CartLine(product_id=product_id, quantity=index % 3 + 1) for product_id in product_ids[business_id]]
+        started = time.perf_counter()
+        with Session(engine) as session:
+            reserve_order(
+                session,
+                business_id=business_id,
+                channel_type="whatsapp",
+                channel_user_id=f"user-{index % customers_per_tenant}",
+                items=items,
+            )
+        return time.perf_counter() - started
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        latencies = sorted(pool.map(reserve, range(reservations)))
+
+    p50 = statistics.median(latencies) * 1000
+    p99 = latencies[int(len(latencies) * 0.99) - 1] * 1000
+    print(f"\n{reservations} reservations over {tenants} tenants: p50 {p50:.2f} ms, p99 {p99:.2f} ms")
+
+    with Session(engine) as session:
+        assert session.exec(select(func.count()).select_from(Order)).one() == reservations
+        assert session.exec(select(func.count()).select_from(OrderItem)).one() == reservations * 5
+        assert session.exec(select(func.count()).select_from(Customer)).one() == tenants * customers_per_tenant
+        orphaned = session.exec(
+            select(func.count()).select_from(Order).join(Customer).where(Customer.business_id != Order.business_id)
+        ).one()
+        assert orphaned == 0
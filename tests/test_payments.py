@@ -0,0 +1,190 @@
+from datetime import timedelta, timezone
+
+import pytest
+
+pytest.importorskip("fastapi")
+pytest.importorskip("httpx")
+
+from fastapi.testclient import TestClient
+from sqlmodel import Session, select
+
+from app.core.auth import get_current_business_id
+from app.core.config import get_settings
+from app.core.db import get_session
+from app.main import app
+from app.models.business import Business
+from app.models.order import Order
+from app.models.payment import Payment
+from app.models.payout_profile import PayoutProfile
+from app.models.product import Product
+from app.services import paystack_service
+from app.services.order_expiry_service import sweep_expired_orders
+from app.services.payout_service import request_payout_setup_service
+from tests.db_test_utils import create_test_engine
+from tests.paystack_stub import PaystackStub
+
+RESERVE = {"channel_type": "telegram", "channel_user_id": "tg-42", "items": [{"product_id": 1, "quantity": 2}]}
+
+
+@pytest.fixture
+def paying_client(monkeypatch):
+    engine = create_test_engine()
+    with Session(engine) as session:
+        session.add(Business(id=1, name="Biz One", store_code="BIZ1"))
+        session.add(Business(id=2, name="Biz Two", store_code="BIZ2"))
+        session.add(Product(id=1, business_id=1, name="Cake", base_price_kobo=1800000))
+        session.add(Product(id=2, business_id=2, name="Bread", base_price_kobo=100500))
+        session.add(
+            PayoutProfile(
+                business_id=1,
+                bank_name="058",
+                account_number="0123456789",
+                account_name="Biz One",
+                paystack_subaccount_code="ACCT_biz1",
+                status="active",
+            )
+        )
+        session.commit()
+
+    def override_get_session():
+        with Session(engine) as session:
+            yield session
+
+    with PaystackStub() as stub:
+        settings = get_settings()
+        monkeypatch.setattr(settings, "paystack_base_url", stub.base_url)
+        monkeypatch.setattr(settings, "paystack_secret_key", stub.secret_key)
+        monkeypatch.setattr(paystack_service, "_client", None)
+        app.dependency_overrides[get_session] = override_get_session
+        app.dependency_overrides[get_current_business_id] = lambda: 1
+        with TestClient(app) as client:
+            yield client, engine, stub
+        app.dependency_overrides.clear()
+
+
+def _payments(engine, order_id: int) -> list[Payment]:
+    with Session(engine) as session:
+        return list(session.exec(select(Payment).where(Payment.order_id == order_id)).all())
+
+
+def _order_status(engine, order_id: int) -> str:
+    with Session(engine) as session:
+        return session.get(Order, order_id).status
+
+
+def test_pay_initializes_split_transaction_synchronously(paying_client) -> None:
+    client, engine, stub = paying_client
+    order = client.post("/api/v1/orders/reserve", json=RESERVE).json()
+    assert _payments(engine, order["order_id"]) == []
+
+    response = client.post(f"/api/v1/orders/{order['order_id']}/pay")
+    assert response.status_code == 200
+    link = response.json()
+    assert link["preinitialized"] is False
+    assert link["authorization_url"].startswith(stub.base_url)
+
+    sent = stub.transactions[link["reference"]]
+    assert sent["amount"] == order["total_kobo"]
+    assert sent["subaccount"] == "ACCT_biz1"
+    assert sent["transaction_charge"] == order["platform_fee_kobo"]
+    assert _order_status(engine, order["order_id"]) == "payment_pending"
+
+    # Asking again returns the same link without another provider call.
+    again = client.post(f"/api/v1/orders/{order['order_id']}/pay").json()
+    assert again["reference"] == link["reference"]
+    assert stub.requests == 1
+
+    assert client.post("/api/v1/orders/999/pay").status_code == 404
+    app.dependency_overrides[get_current_business_id] = lambda: 2
+    assert client.post(f"/api/v1/orders/{order['order_id']}/pay").status_code == 404
+    bread = client.post("/api/v1/orders/reserve", json={**RESERVE, "items": [{"product_id": 2, "quantity": 1}]})
+    assert client.post(f"/api/v1/orders/{bread.json()['order_id']}/pay").status_code == 409  # no payout profile
+
+
+def test_new_bank_details_do_not_interrupt_payouts_until_active(paying_client) -> None:
+    client, engine, stub = paying_client
+    with Session(engine) as session:
+        profile = request_payout_setup_service(session, 1, "058", "9876543210", "Biz One")
+    assert (profile.status, profile.paystack_subaccount_code) == ("pending", "ACCT_biz1")
+
+    order = client.post("/api/v1/orders/reserve", json=RESERVE).json()
+    link = client.post(f"/api/v1/orders/{order['order_id']}/pay").json()
+    assert stub.transactions[link["reference"]]["subaccount"] == "ACCT_biz1"
+
+
+def test_preinitialized_link_is_answered_without_a_provider_call(paying_client, monkeypatch) -> None:
+    client, engine, stub = paying_client
+    monkeypatch.setattr(get_settings(), "payment_preinit_enabled", True)
+
+    order = client.post("/api/v1/orders/reserve", json=RESERVE).json()
+    [payment] = _payments(engine, order["order_id"])
+    assert payment.status == "initiated"
+    assert _order_status(engine, order["order_id"]) == "reserved"
+    assert stub.requests == 1
+
+    link = client.post(f"/api/v1/orders/{order['order_id']}/pay").json()
+    assert link == {
+        "order_id": order["order_id"],
+        "reference": payment.paystack_reference,
+        "authorization_url": payment.authorization_url,
+        "preinitialized": True,
+    }
+    assert stub.requests == 1
+    assert _order_status(engine, order["order_id"]) == "payment_pending"
+
+
+def test_provider_outage_leaves_pay_to_initialize_later(paying_client, monkeypatch) -> None:
+    client, engine, stub = paying_client
+    monkeypatch.setattr(get_settings(), "payment_preinit_enabled", True)
+
+    stub.fail_next(1, status_code=503)
+    order = client.post("/api/v1/orders/reserve", json=RESERVE)
+    assert order.status_code == 200
+    assert _payments(engine, order.json()["order_id"]) == []
+
+    link = client.post(f"/api/v1/orders/{order.json()['order_id']}/pay").json()
+    assert link["preinitialized"] is False
+
+
+def test_expiry_drops_unused_preinitialized_payments(paying_client, monkeypatch) -> None:
+    client, engine, _stub = paying_client
+    monkeypatch.setattr(get_settings(), "payment_preinit_enabled", True)
+
+    unused = client.post("/api/v1/orders/reserve", json=RESERVE).json()
+    handed_out = client.post("/api/v1/orders/reserve", json=RESERVE).json()
+    client.post(f"/api/v1/orders/{handed_out['order_id']}/pay")
+
+    with Session(engine) as session:
+        expires_at = session.get(Order, unused["order_id"]).expires_at.replace(tzinfo=timezone.utc)
+        result = sweep_expired_orders(
+            session, holder="test", batch_size=10, max_batches=1, lease_seconds=60, now=expires_at + timedelta(seconds=1)
+        )
+    assert result.swept == 1
+    assert _order_status(engine, unused["order_id"]) == "expired"
+    assert _payments(engine, unused["order_id"]) == []
+    assert len(_payments(engine, handed_out["order_id"])) == 1
+
+
+@pytest.mark.parametrize("preinit", [True, False])
+def test_reservation_expiring_during_pay_is_a_conflict(paying_client, monkeypatch, preinit: bool) -> None:
+    from app.services import payment_service
+
+    client, engine, _stub = paying_client
+    monkeypatch.setattr(get_settings(), "payment_preinit_enabled", preinit)
+    order = client.post("/api/v1/orders/reserve", json=RESERVE).json()
+    load = payment_service._load_payable_order
+
+    def load_then_expire(session, business_id, order_id):
+        loaded = load(session, business_id, order_id)
+        with Session(engine) as sweeper:
+            expires_at = sweeper.get(Order, order_id).expires_at.replace(tzinfo=timezone.utc)
+            sweep_expired_orders(
+                sweeper, holder="test", batch_size=10, max_batches=1, lease_seconds=60, now=expires_at + timedelta(seconds=1)
+            )
+        return loaded
+
+    monkeypatch.setattr(payment_service, "_load_payable_order", load_then_expire)
+    response = client.post(f"/api/v1/orders/{order['order_id']}/pay")
+    assert response.status_code == 409
+    assert _order_status(engine, order["order_id"]) == "expired"
+    assert _payments(engine, order["order_id"]) == []
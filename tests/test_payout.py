@@ -0,0 +1,220 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+pytest.importorskip("fastapi")
+pytest.importorskip("httpx")
+
+from fastapi.testclient import TestClient
+from sqlmodel import Session
+
+from app.core.auth import get_current_business_id
+from app.core.circuit_breaker import CircuitBreaker
+from app.core.config import get_settings
+from app.core.db import get_session
+from app.main import app
+from app.models.business import Business
+from app.models.payout_profile import PayoutProfile
+from app.repositories.payout_repo import claim_due_payout_profiles
+from app.services.payout_service import provision_due_payouts, request_payout_setup_service
+from app.services import paystack_service
+from app.services.paystack_service import PaystackClient
+from tests.db_test_utils import create_test_engine
+from tests.paystack_stub import PaystackStub
+
+SETUP = {"bank_name": "058", "account_number": "0123456789", "account_name": "Biz One Ltd"}
+
+
+@pytest.fixture
+def payout_client(monkeypatch):
+    engine = create_test_engine()
+    with Session(engine) as session:
+        session.add_all(Business(id=index, name=f"Biz {index}", store_code=f"BIZ{index}") for index in range(1, 6))
+        session.commit()
+
+    def override_get_session():
+        with Session(engine) as session:
+            yield session
+
+    app.dependency_overrides[get_session] = override_get_session
+    app.dependency_overrides[get_current_business_id] = lambda: 1
+    with TestClient(app) as client, PaystackStub() as stub:
+        # Requests only record details; these tests run the job themselves.
+        # Set after startup so no background worker attaches to the app's engine.
+        monkeypatch.setattr(get_settings(), "payout_provisioning_enabled", True)
+        yield client, engine, stub
+    app.dependency_overrides.clear()
+
+
+def _provision(engine, stub: PaystackStub, now: datetime, max_attempts: int = 3):
+    async def run():
+        client = PaystackClient(
+            secret_key=stub.secret_key,
+            base_url=stub.base_url,
+            max_retries=0,
+            breaker=CircuitBreaker(failure_threshold=100, reset_timeout_seconds=1, name="Paystack"),
+        )
+        try:
+            return await provision_due_payouts(
+                lambda: Session(engine), client, batch_size=10, lock_seconds=60, max_attempts=max_attempts, now=now
+            )
+        finally:
+            await client.aclose()
+
+    return asyncio.run(run())
+
+
+def test_setup_returns_pending_and_job_activates_in_bulk(payout_client) -> None:
+    client, engine, stub = payout_client
+    assert client.get("/api/v1/payout/status").status_code == 404
+
+    for business_id in range(1, 6):
+        app.dependency_overrides[get_current_business_id] = lambda business_id=business_id: business_id
+        response = client.post("/api/v1/payout/setup", json=SETUP)
+        assert response.status_code == 202
+        assert response.json()["status"] == "pending"
+        assert response.json()["paystack_subaccount_code"] is None
+    assert stub.requests == 0
+
+    result = _provision(engine, stub, now=datetime.now(timezone.utc) + timedelta(seconds=1))
+    assert (result.claimed, result.activated) == (5, 5)
+    assert {subaccount["business_name"] for subaccount in stub.subaccounts} == {f"Biz {index}" for index in range(1, 6)}
+
+    status = client.get("/api/v1/payout/status").json()
+    assert status["status"] == "active"
+    assert status["paystack_subaccount_code"].startswith("ACCT_")
+
+    # Re-submitting the same details keeps the live subaccount.
+    assert client.post("/api/v1/payout/setup", json=SETUP).json()["status"] == "active"
+    assert client.post("/api/v1/payout/setup", json={**SETUP, "account_number": "12345"}).status_code == 422
+
+
+def test_resubmission_keeps_the_live_subaccount_until_the_new_one_is_active(payout_client) -> None:
+    client, engine, stub = payout_client
+    client.post("/api/v1/payout/setup", json=SETUP)
+    now = datetime.now(timezone.utc) + timedelta(seconds=1)
+    assert _provision(engine, stub, now=now).activated == 1
+    live = client.get("/api/v1/payout/status").json()
+
+    # Paystack never sees the account name, so renaming is not a new setup.
+    renamed = client.post("/api/v1/payout/setup", json={**SETUP, "account_name": "Biz One Limited"}).json()
+    assert renamed == {**live, "account_name": "Biz One Limited"}
+    assert _provision(engine, stub, now=now + timedelta(seconds=1)).claimed == 0
+
+    moved = client.post("/api/v1/payout/setup", json={**SETUP, "account_number": "9876543210"}).json()
+    assert (moved["status"], moved["paystack_subaccount_code"]) == ("pending", live["paystack_subaccount_code"])
+    assert _provision(engine, stub, now=now + timedelta(seconds=2)).activated == 1
+    [fresh] = [subaccount for subaccount in stub.subaccounts if subaccount["account_number"] == "9876543210"]
+    status = client.get("/api/v1/payout/status").json()
+    assert (status["status"], status["paystack_subaccount_code"]) == ("active", fresh["subaccount_code"])
+
+
+def test_provider_errors_retry_with_backoff_then_fail(payout_client) -> None:
+    client, engine, stub = payout_client
+    client.post("/api/v1/payout/setup", json=SETUP)
+    now = datetime.now(timezone.utc) + timedelta(seconds=1)
+
+    stub.fail_next(1, status_code=503)
+    assert _provision(engine, stub, now=now).retried == 1
+    status = client.get("/api/v1/payout/status").json()
+    assert (status["status"], status["attempts"], status["last_error"]) == ("pending", 1, "Injected failure")
+
+    assert _provision(engine, stub, now=now + timedelta(seconds=10)).claimed == 0  # backoff not over
+    assert _provision(engine, stub, now=now + timedelta(seconds=31)).activated == 1
+    assert client.get("/api/v1/payout/status").json()["attempts"] == 2
+
+    # A rejected account number is not worth retrying.
+    app.dependency_overrides[get_current_business_id] = lambda: 2
+    client.post("/api/v1/payout/setup", json=SETUP)
+    stub.fail_next(1, status_code=400)
+    assert _provision(engine, stub, now=now + timedelta(seconds=32)).failed == 1
+    assert client.get("/api/v1/payout/status").json()["status"] == "failed"
+
+    # Fixing the details starts over.
+    assert client.post("/api/v1/payout/setup", json=SETUP).json()["status"] == "pending"
+
+
+def test_resubmitting_during_a_provider_call_discards_its_subaccount(payout_client, monkeypatch) -> None:
+    client, engine, stub = payout_client
+    client.post("/api/v1/payout/setup", json=SETUP)
+    create_subaccount = PaystackClient.create_subaccount
+
+    async def create_then_resubmit(self, **kwargs):
+        code = await create_subaccount(self, **kwargs)
+        if kwargs["account_number"] == SETUP["account_number"]:
+            with Session(engine) as session:
+                request_payout_setup_service(session, 1, SETUP["bank_name"], "9876543210", SETUP["account_name"])
+                # Another worker claims the new details before this call returns.
+                [claim] = claim_due_payout_profiles(
+                    session, now=later, locked_until=later + timedelta(seconds=60), limit=1
+                )
+                session.commit()
+            assert claim.attempts == 1
+        return code
+
+    monkeypatch.setattr(PaystackClient, "create_subaccount", create_then_resubmit)
+    now = datetime.now(timezone.utc) + timedelta(seconds=1)
+    later = now + timedelta(seconds=1)
+    assert _provision(engine, stub, now=now).activated == 0
+    status = client.get("/api/v1/payout/status").json()
+    assert (status["status"], status["account_number"], status["paystack_subaccount_code"]) == (
+        "pending",
+        "9876543210",
+        None,
+    )
+
+    # Once the other worker's lock lapses the new details are provisioned.
+    assert _provision(engine, stub, now=later + timedelta(seconds=61)).activated == 1
+    [fresh] = [subaccount for subaccount in stub.subaccounts if subaccount["account_number"] == "9876543210"]
+    assert client.get("/api/v1/payout/status").json()["paystack_subaccount_code"] == fresh["subaccount_code"]
+
+
+def test_retry_after_a_lost_response_reuses_the_created_subaccount(payout_client) -> None:
+    client, engine, stub = payout_client
+    client.post("/api/v1/payout/setup", json=SETUP)
+    now = datetime.now(timezone.utc) + timedelta(seconds=1)
+
+    # Paystack creates the subaccount but the answer never arrives.
+    stub.drop_next_responses(1)
+    assert _provision(engine, stub, now=now).retried == 1
+    [created] = stub.subaccounts
+
+    assert _provision(engine, stub, now=now + timedelta(seconds=31)).activated == 1
+    assert stub.subaccounts == [created]
+    assert client.get("/api/v1/payout/status").json()["paystack_subaccount_code"] == created["subaccount_code"]
+
+
+def test_default_settings_provision_on_the_business_own_requests(payout_client, monkeypatch) -> None:
+    client, engine, stub = payout_client
+    settings = get_settings()
+    monkeypatch.setattr(settings, "payout_provisioning_enabled", False)
+    monkeypatch.setattr(settings, "paystack_base_url", stub.base_url)
+    monkeypatch.setattr(settings, "paystack_secret_key", stub.secret_key)
+    monkeypatch.setattr(settings, "paystack_max_retries", 0)
+    monkeypatch.setattr(paystack_service, "_client", None)
+
+    stub.fail_next(1, status_code=503)
+    pending = client.post("/api/v1/payout/setup", json=SETUP).json()
+    assert (pending["status"], pending["attempts"], pending["last_error"]) == ("pending", 1, "Injected failure")
+    # Still backing off: polling does not call Paystack again.
+    assert client.get("/api/v1/payout/status").json()["attempts"] == 1
+    assert stub.requests == 1
+
+    with Session(engine) as session:
+        profile = session.get(PayoutProfile, 1)
+        profile.next_attempt_at = datetime.now(timezone.utc)
+        session.add(profile)
+        session.commit()
+    status = client.get("/api/v1/payout/status").json()
+    assert (status["status"], status["paystack_subaccount_code"]) == ("active", stub.subaccounts[0]["subaccount_code"])
+
+    # Only the requesting business's profile is provisioned.
+    with Session(engine) as session:
+        request_payout_setup_service(session, 3, **SETUP)
+    app.dependency_overrides[get_current_business_id] = lambda: 2
+    assert client.post("/api/v1/payout/setup", json=SETUP).json()["status"] == "active"
+    assert len(stub.subaccounts) == 2
+    app.dependency_overrides[get_current_business_id] = lambda: 3
+    assert client.get("/api/v1/payout/status").json()["status"] == "active"
+    assert len(stub.subaccounts) == 3
@@ -0,0 +1,120 @@
+import asyncio
+
+import pytest
+
+httpx = pytest.importorskip("httpx")
+
+from app.core.circuit_breaker import CircuitBreaker
+from app.core.errors import ProviderError, ServiceUnavailableError
+from app.services import paystack_service
+from app.services.paystack_service import PaystackClient
+from tests.paystack_stub import PaystackStub
+
+
+@pytest.fixture(autouse=True)
+def _no_backoff(monkeypatch):
+    monkeypatch.setattr(paystack_service, "RETRY_BASE_SECONDS", 0.001)
+
+
+def _client(stub: PaystackStub, failure_threshold: int = 5, max_retries: int = 2) -> PaystackClient:
+    return PaystackClient(
+        secret_key=stub.secret_key,
+        base_url=stub.base_url,
+        max_retries=max_retries,
+        breaker=CircuitBreaker(failure_threshold=failure_threshold, reset_timeout_seconds=0.2, name="Paystack"),
+    )
+
+
+def test_calls_share_one_keep_alive_connection() -> None:
+    async def scenario(stub: PaystackStub) -> None:
+        client = _client(stub)
+        try:
+            for index in range(20):
+                initialized = await client.init_transaction(f"ref-{index}", "buyer@example.com", 500000)
+                assert initialized.reference == f"ref-{index}"
+                assert initialized.authorization_url.startswith(stub.base_url)
+            subaccount = await client.create_subaccount("Biz One", "058", "0123456789", 1.5)
+            assert subaccount.startswith("ACCT_")
+            stub.mark_paid("ref-3")
+            assert (await client.verify_transaction("ref-3"))["status"] == "success"
+        finally:
+            await client.aclose()
+
+    with PaystackStub() as stub:
+        asyncio.run(scenario(stub))
+        assert stub.requests == 22
+        assert stub.connections == 1
+
+
+def test_only_idempotent_calls_retry_server_errors() -> None:
+    async def scenario(stub: PaystackStub) -> None:
+        client = _client(stub)
+        try:
+            await client.init_transaction("ref-1", "buyer@example.com", 500000)
+            stub.fail_next(2, status_code=503)
+            assert (await client.verify_transaction("ref-1"))["reference"] == "ref-1"
+            assert stub.requests == 4
+
+            stub.fail_next(1, status_code=503)
+            with pytest.raises(ProviderError):
+                await client.init_transaction("ref-2", "buyer@example.com", 500000)
+            assert stub.requests == 5
+
+            with pytest.raises(ProviderError) as declined:
+                await client.init_transaction("ref-1", "buyer@example.com", 500000)
+            assert declined.value.message == "Duplicate Transaction Reference"
+        finally:
+            await client.aclose()
+
+    with PaystackStub() as stub:
+        asyncio.run(scenario(stub))
+
+
+def test_breaker_fails_fast_while_degraded_then_recovers() -> None:
+    async def scenario(stub: PaystackStub) -> None:
+        client = _client(stub, failure_threshold=3, max_retries=0)
+        try:
+            stub.fail_next(3, status_code=500)
+            for _ in range(3):
+                with pytest.raises(ProviderError):
+                    await client.verify_transaction("missing")
+            with pytest.raises(ServiceUnavailableError):
+                await client.verify_transaction("missing")
+            assert stub.requests == 3
+
+            await asyncio.sleep(0.25)
+            await client.init_transaction("ref-1", "buyer@example.com", 500000)
+            assert client.breaker.state == "closed"
+        finally:
+            await client.aclose()
+
+    with PaystackStub() as stub:
+        asyncio.run(scenario(stub))
+
+
+def test_cancelled_trial_call_frees_the_half_open_slot() -> None:
+    async def scenario(stub: PaystackStub) -> None:
+        client = _client(stub, failure_threshold=1, max_retries=0)
+        try:
+            stub.fail_next(1, status_code=500)
+            with pytest.raises(ProviderError):
+                await client.verify_transaction("missing")
+            await asyncio.sleep(0.25)
+
+            stub.latency_seconds = 1.0
+            trial = asyncio.create_task(client.init_transaction("ref-1", "buyer@example.com", 500000))
+            await asyncio.sleep(0.1)
+            with pytest.raises(ServiceUnavailableError):
+                await client.init_transaction("ref-2", "buyer@example.com", 500000)
+            trial.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await trial
+
+            stub.latency_seconds = 0.0
+            await client.init_transaction("ref-3", "buyer@example.com", 500000)
+            assert client.breaker.state == "closed"
+        finally:
+            await client.aclose()
+
+    with PaystackStub() as stub:
+        asyncio.run(scenario(stub))
@@ -0,0 +1,78 @@
+import pytest
+
+pytest.importorskip("fastapi")
+pytest.importorskip("sqlmodel")
+
+from fastapi.testclient import TestClient
+from sqlmodel import Session
+
+from app.core.auth import get_current_business_id
+from app.core.db import get_session
+from app.main import app
+from app.models.business import Business
+from app.services.pricing_service import CartLine, quote_cart
+from tests.db_test_utils import QueryCounter, create_test_engine
+
+
+def _seed(engine) -> None:
+    with Session(engine) as session:
+        session.add(Business(id=1, name="Biz One", store_code="BIZ1"))
+        session.add(Business(id=2, name="Biz Two", store_code="BIZ2"))
+        session.commit()
+
+
+def test_quote_totals_fee_and_payout_in_one_product_query() -> None:
+    engine = create_test_engine()
+    _seed(engine)
+
+    def override_get_session():
+        with Session(engine) as session:
+            yield session
+
+    app.dependency_overrides[get_session] = override_get_session
+
+    with TestClient(app) as client:
+        app.dependency_overrides[get_current_business_id] = lambda: 2
+        foreign_id = client.post("/api/v1/products", json={"name": "Foreign", "base_price_naira": 1}).json()["id"]
+
+        app.dependency_overrides[get_current_business_id] = lambda: 1
+        cake = client.post("/api/v1/products", json={"name": "Cake", "base_price_naira": 18000}).json()["id"]
+        bread = client.post("/api/v1/products", json={"name": "Bread", "base_price_naira": 1005}).json()["id"]
+        zone = client.post("/api/v1/delivery-zones", json={"name": "Lekki", "fee_naira": 2500}).json()["id"]
+
+        items = [CartLine(product_id=cake, quantity=2), CartLine(product_id=bread, quantity=3)]
+        with Session(engine) as session, QueryCounter(engine) as counter:
+            quote = quote_cart(session, business_id=1, items=items, delivery_zone_id=zone)
+        # listing versions, product IN query, zone lookup.
+        assert counter.count == 3
+        assert quote.subtotal_kobo == 2 * 1800000 + 3 * 100500
+        assert quote.delivery_fee_kobo == 250000
+        assert quote.total_kobo == 4151500
+        assert quote.platform_fee_kobo == 62273  # ceil(4151500 * 0.015) = ceil(62272.5)
+        assert quote.business_payout_kobo == quote.total_kobo - quote.platform_fee_kobo
+        assert [line.name for line in quote.lines] == ["Cake", "Bread"]
+
+        # Warm the unpaginated listings; the next quote only reads the versions.
+        client.get("/api/v1/products")
+        client.get("/api/v1/delivery-zones")
+        with Session(engine) as session, QueryCounter(engine) as counter:
+            cached = quote_cart(session, business_id=1, items=items, delivery_zone_id=zone)
+        assert counter.count == 1
+        assert cached == quote
+
+        response = client.post(
+            "/api/v1/pricing/quote",
+            json={"items": [{"product_id": cake, "quantity": 1}, {"product_id": foreign_id, "quantity": 1}]},
+        )
+        assert response.status_code == 404
+
+        client.delete(f"/api/v1/products/{bread}")
+        response = client.post("/api/v1/pricing/quote", json={"items": [{"product_id": bread, "quantity": 1}]})
+        assert response.status_code == 404
+
+        response = client.post("/api/v1/pricing/quote", json={"items": [{"product_id": cake, "quantity": 1}]})
+        assert response.status_code == 200
+        assert response.json()["total_kobo"] == 1800000
+        assert response.json()["platform_fee_kobo"] == 27000
+
+    app.dependency_overrides.clear()
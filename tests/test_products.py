@@ -1,5 +1,7 @@
+import asyncio
 from pathlib import Path
 
+import httpx
 import pytest
 
 pytest.importorskip("fastapi")
@@ -9,13 +11,18 @@ pytest.importorskip("passlib")
 pytest.importorskip("sqlalchemy")
 
 from fastapi.testclient import TestClient
-from sqlmodel import Session
+from sqlmodel import Session, select
 
 from app.core.auth import get_current_business_id
 from app.core.db import get_session
 from app.main import app
-from tests.db_test_utils import create_test_engine
+from tests.db_test_utils import QueryCounter, create_test_engine
 from app.models.business import Business
+from app.models.product import Product
+from app.services.listing_cache import ListingCache
+
+
+PNG_BYTES = b"\x89PNG\r\n\x1a\n" + b"\x00" * 64
 
 
 def _test_engine():
@@ -99,17 +106,400 @@ def test_products_tenant_scoping() -> None:
     app.dependency_overrides.clear()
 
 
-def test_upload_product_image_returns_url_and_saves_file() -> None:
+def _use_tmp_media(monkeypatch: pytest.MonkeyPatch, tmp_path: Path):
+    from app.core.config import get_settings
+
+    monkeypatch.setattr(get_settings(), "media_dir", str(tmp_path))
+    engine = _test_engine()
+    _seed_business(engine, business_id=1, name="Biz One", store_code="BIZ1")
+
+    def override_get_session():
+        with Session(engine) as session:
+            yield session
+
+    app.dependency_overrides[get_session] = override_get_session
     app.dependency_overrides[get_current_business_id] = lambda: 1
+    return engine
+
+
+def test_upload_product_image_returns_url_and_saves_file(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    _use_tmp_media(monkeypatch, tmp_path)
 
     with TestClient(app) as client:
-        files = {"file": ("product.png", b"fake-png-binary", "image/png")}
+        files = {"file": ("product.png", PNG_BYTES, "image/png")}
         response = client.post("/api/v1/uploads/product-image", files=files)
         assert response.status_code == 200
         image_url = response.json()["image_url"]
         assert image_url.startswith("/media/products/")
+        assert image_url.endswith(".png")
 
         filename = image_url.rsplit("/", maxsplit=1)[1]
-        file_path = Path("media") / "products" / filename
-        assert file_path.exists()
-        file_path.unlink(missing_ok=True)
+        file_path = tmp_path / "products" / filename
+        assert file_path.read_bytes() == PNG_BYTES
+
+    app.dependency_overrides.clear()
+
+
+def test_upload_product_image_checks_magic_bytes_and_size(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    from app.core.config import get_settings
+
+    monkeypatch.setattr(get_settings(), "max_upload_bytes", 200_000)
+    _use_tmp_media(monkeypatch, tmp_path)
+
+    with TestClient(app) as client:
+        disguised = client.post(
+            "/api/v1/uploads/product-image",
+            files={"file": ("product.png", b"<html>not an image</html>", "image/png")},
+        )
+        assert disguised.status_code == 400
+
+        webp = b"RIFF\x00\x00\x00\x00WEBPVP8 " + b"\x00" * 32
+        renamed = client.post("/api/v1/uploads/product-image", files={"file": ("photo.jpg", webp, "image/jpeg")})
+        assert renamed.status_code == 200
+        assert renamed.json()["image_url"].endswith(".webp")
+
+        oversized = client.post(
+            "/api/v1/uploads/product-image",
+            files={"file": ("big.png", PNG_BYTES + b"\x00" * 300_000, "image/png")},
+        )
+        assert oversized.status_code == 413
+
+        # A chunked body carries no Content-Length, so the limit is enforced while copying.
+        def chunked_body():
+            boundary = b"--upload-boundary"
+            yield boundary + b'\r\nContent-Disposition: form-data; name="file"; filename="big.png"\r\n'
+            yield b"Content-Type: image/png\r\n\r\n" + PNG_BYTES
+            for _ in range(5):
+                yield b"\x00" * 64 * 1024
+            yield b"\r\n" + boundary + b"--\r\n"
+
+        streamed = client.post(
+            "/api/v1/uploads/product-image",
+            content=chunked_body(),
+            headers={"Content-Type": "multipart/form-data; boundary=upload-boundary"},
+        )
+        assert streamed.status_code == 413
+
+    app.dependency_overrides.clear()
+    stored = [path for path in tmp_path.rglob("*") if path.is_file()]
+    assert sorted(path.suffix for path in stored) == [".webp", ".webp"]
+
+
+def test_chunked_upload_stops_reading_past_the_limit(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    from app.core.config import get_settings
+
+    monkeypatch.setattr(get_settings(), "max_upload_bytes", 200_000)
+    _use_tmp_media(monkeypatch, tmp_path)
+    sent = []
+
+    async def chunked_body():
+        boundary = b"--upload-boundary"
+        yield boundary + b'\r\nContent-Disposition: form-data; name="file"; filename="big.png"\r\n'
+        yield b"Content-Type: image/png\r\n\r\n" + PNG_BYTES
+        for _ in range(200):
+            sent.append(64 * 1024)
+            yield b"\x00" * 64 * 1024
+        yield b"\r\n" + boundary + b"--\r\n"
+
+    async def upload() -> httpx.Response:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await client.post(
+                "/api/v1/uploads/product-image",
+                content=chunked_body(),
+                headers={"Content-Type": "multipart/form-data; boundary=upload-boundary"},
+            )
+
+    response = asyncio.run(upload())
+    app.dependency_overrides.clear()
+    assert response.status_code == 413
+    # Reading stopped just past max_upload_bytes + envelope, not at the end of the 12 MiB body.
+    assert sum(sent) < 300_000
+
+
+def test_duplicate_uploads_share_one_blob_behind_distinct_urls(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    from app.models.media_blob import MediaBlob
+    from app.services.media_store_service import release_media
+
+    engine = _use_tmp_media(monkeypatch, tmp_path)
+
+    with TestClient(app) as client:
+        urls = [
+            client.post("/api/v1/uploads/product-image", files={"file": ("a.png", PNG_BYTES, "image/png")}).json()[
+                "image_url"
+            ]
+            for _ in range(2)
+        ]
+    app.dependency_overrides.clear()
+
+    assert urls[0] != urls[1]
+    blobs = list((tmp_path / "blobs").rglob("*.png"))
+    assert len(blobs) == 1
+    assert blobs[0].stat().st_nlink == 3
+    assert not list((tmp_path / "blobs").glob(".upload-*"))
+
+    with Session(engine) as session:
+        assert session.get(MediaBlob, blobs[0].stem).ref_count == 2
+        release_media(session, urls[0].removeprefix("/media/"))
+        assert session.get(MediaBlob, blobs[0].stem).ref_count == 1
+        assert blobs[0].exists()
+
+        release_media(session, urls[1].removeprefix("/media/"))
+        assert session.get(MediaBlob, blobs[0].stem) is None
+    assert [path for path in tmp_path.rglob("*") if path.is_file()] == []
+
+
+def test_replacing_a_product_image_releases_the_old_alias(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    from app.models.media_alias import MediaAlias
+
+    engine = _use_tmp_media(monkeypatch, tmp_path)
+
+    with TestClient(app) as client:
+        old_url, new_url = (
+            client.post("/api/v1/uploads/product-image", files={"file": (name, PNG_BYTES, "image/png")}).json()[
+                "image_url"
+            ]
+            for name in ("old.png", "new.png")
+        )
+        first, second = (
+            client.post(
+                "/api/v1/products", json={"name": name, "base_price_naira": 100, "image_url": old_url}
+            ).json()["id"]
+            for name in ("First", "Second")
+        )
+
+        # Still shown by the second product, so the alias stays.
+        assert client.patch(f"/api/v1/products/{first}", json={"image_url": new_url}).status_code == 200
+        assert (tmp_path / old_url.removeprefix("/media/")).is_file()
+
+        batch = client.patch("/api/v1/products", json={"items": [{"id": second, "image_url": new_url}]})
+        assert batch.status_code == 200
+    app.dependency_overrides.clear()
+
+    assert not (tmp_path / old_url.removeprefix("/media/")).exists()
+    assert (tmp_path / new_url.removeprefix("/media/")).is_file()
+    with Session(engine) as session:
+        assert [alias.public_path for alias in session.exec(select(MediaAlias)).all()] == [
+            new_url.removeprefix("/media/")
+        ]
+
+
+def test_products_keyset_pagination() -> None:
+    engine = _test_engine()
+    _seed_business(engine, business_id=1, name="Biz One", store_code="BIZ1")
+
+    def override_get_session():
+        with Session(engine) as session:
+            yield session
+
+    app.dependency_overrides[get_session] = override_get_session
+    app.dependency_overrides[get_current_business_id] = lambda: 1
+
+    with TestClient(app) as client:
+        for index in range(5):
+            client.post("/api/v1/products", json={"name": f"Cake {index}", "base_price_naira": 1000})
+
+        full_list = client.get("/api/v1/products")
+        assert len(full_list.json()) == 5
+        assert "x-next-cursor" not in full_list.headers
+
+        seen_ids: list[int] = []
+        params: dict[str, str | int] = {"limit": 2}
+        while True:
+            page = client.get("/api/v1/products", params=params)
+            assert page.status_code == 200
+            assert len(page.json()) <= 2
+            seen_ids.extend(product["id"] for product in page.json())
+            next_cursor = page.headers.get("x-next-cursor")
+            if not next_cursor:
+                break
+            params = {"limit": 2, "cursor": next_cursor}
+
+        assert seen_ids == [product["id"] for product in full_list.json()]
+
+        bad_cursor = client.get("/api/v1/products", params={"cursor": "not-a-cursor"})
+        assert bad_cursor.status_code == 400
+        assert bad_cursor.json()["error"]["message"] == "Invalid cursor"
+
+    app.dependency_overrides.clear()
+
+
+def test_products_etag_answers_304_from_cache_and_changes_on_write() -> None:
+    engine = _test_engine()
+    _seed_business(engine, business_id=1, name="Biz One", store_code="BIZ1")
+
+    def override_get_session():
+        with Session(engine) as session:
+            yield session
+
+    app.dependency_overrides[get_session] = override_get_session
+    app.dependency_overrides[get_current_business_id] = lambda: 1
+
+    with TestClient(app) as client:
+        client.post("/api/v1/products", json={"name": "Cake", "base_price_naira": 1000})
+
+        first = client.get("/api/v1/products")
+        etag = first.headers["etag"]
+
+        with QueryCounter(engine) as counter:
+            not_modified = client.get("/api/v1/products", headers={"If-None-Match": etag})
+        assert not_modified.status_code == 304
+        assert not_modified.headers["etag"] == etag
+        assert counter.count == 1  # the shared catalog version
+
+        client.post("/api/v1/products", json={"name": "Bread", "base_price_naira": 500})
+        changed = client.get("/api/v1/products", headers={"If-None-Match": etag})
+        assert changed.status_code == 200
+        assert changed.headers["etag"] != etag
+        assert [product["name"] for product in changed.json()] == ["Bread", "Cake"]
+
+        # Another worker's write: this process's cached pages were never touched,
+        # but the version it bumped in its transaction is shared.
+        etag = changed.headers["etag"]
+        with Session(engine) as other_worker:
+            bread = other_worker.exec(select(Product).where(Product.name == "Bread")).one()
+            bread.is_active = False
+            other_worker.add(bread)
+            ListingCache(maxsize=1, ttl_seconds=60, version_column=Business.catalog_version).invalidate(
+                other_worker, business_id=1
+            )
+            other_worker.commit()
+        after_remote_write = client.get("/api/v1/products", headers={"If-None-Match": etag})
+        assert after_remote_write.status_code == 200
+        assert [product["name"] for product in after_remote_write.json()] == ["Cake"]
+
+    app.dependency_overrides.clear()
+
+
+def test_bulk_import_csv_and_ndjson_reports_row_errors() -> None:
+    engine = _test_engine()
+    _seed_business(engine, business_id=1, name="Biz One", store_code="BIZ1")
+
+    def override_get_session():
+        with Session(engine) as session:
+            yield session
+
+    app.dependency_overrides[get_session] = override_get_session
+    app.dependency_overrides[get_current_business_id] = lambda: 1
+
+    csv_body = (
+        "name,description,base_price_naira\n"
+        'Cake,"Chocolate, large",18000\n'
+        ",Nameless,100\n"
+        "Bread,,12.50\n"
+        'Pie,"Apple\nwith cream",2500\n'
+    )
+    ndjson_body = '{"name": "Juice", "base_price_naira": 700}\n{"name": "Water", "base_price_naira": -1}\nnot json\n'
+
+    with TestClient(app) as client:
+        csv_res = client.post("/api/v1/products/import", content=csv_body, headers={"Content-Type": "text/csv"})
+        assert csv_res.status_code == 200
+        assert csv_res.json() == {
+            "created": 2,
+            "failed": 2,
+            "errors": [
+                {"row": 2, "message": "name is required"},
+                {"row": 3, "message": "base_price_naira must be a whole, non-negative number of naira"},
+            ],
+        }
+
+        ndjson_res = client.post(
+            "/api/v1/products/import",
+            content=ndjson_body,
+            headers={"Content-Type": "application/x-ndjson"},
+        )
+        assert ndjson_res.json()["created"] == 1
+        assert [error["row"] for error in ndjson_res.json()["errors"]] == [2, 3]
+
+        products = {product["name"]: product for product in client.get("/api/v1/products").json()}
+        assert set(products) == {"Cake", "Pie", "Juice"}
+        assert products["Cake"]["base_price_kobo"] == 1800000
+        assert products["Pie"]["description"] == "Apple\nwith cream"
+
+        bad_header = client.post("/api/v1/products/import", content="title\nCake\n", headers={"Content-Type": "text/csv"})
+        assert bad_header.status_code == 400
+
+        huge_price = client.post(
+            "/api/v1/products/import",
+            content='{"name": "Gold", "base_price_naira": 100000000000000000000000}\n{"name": "Tea", "base_price_naira": 5}\n',
+            headers={"Content-Type": "application/x-ndjson"},
+        )
+        assert huge_price.status_code == 200
+        assert huge_price.json()["created"] == 1
+        assert huge_price.json()["errors"][0]["row"] == 1
+
+        not_utf8 = client.post(
+            "/api/v1/products/import",
+            content=b"name,base_price_naira\nCaf\xe9,100\n",
+            headers={"Content-Type": "text/csv"},
+        )
+        assert not_utf8.status_code == 400
+        malformed = client.post(
+            "/api/v1/products/import",
+            content='name,base_price_naira\nMilk,300\n"' + "x" * 200_000 + '",1\n',
+            headers={"Content-Type": "text/csv"},
+        )
+        assert malformed.status_code == 400
+        assert "Milk" not in {product["name"] for product in client.get("/api/v1/products").json()}
+
+    app.dependency_overrides.clear()
+
+
+def test_batch_patch_products_groups_changes_and_keeps_tenant_404() -> None:
+    engine = _test_engine()
+    _seed_business(engine, business_id=1, name="Biz One", store_code="BIZ1")
+    _seed_business(engine, business_id=2, name="Biz Two", store_code="BIZ2")
+
+    def override_get_session():
+        with Session(engine) as session:
+            yield session
+
+    app.dependency_overrides[get_session] = override_get_session
+
+    with TestClient(app) as client:
+        app.dependency_overrides[get_current_business_id] = lambda: 2
+        foreign_id = client.post("/api/v1/products", json={"name": "Foreign", "base_price_naira": 100}).json()["id"]
+
+        app.dependency_overrides[get_current_business_id] = lambda: 1
+        ids = [
+            client.post("/api/v1/products", json={"name": f"Item {n}", "base_price_naira": 1000}).json()["id"]
+            for n in range(4)
+        ]
+
+        cross_tenant = client.patch(
+            "/api/v1/products",
+            json={"items": [{"id": ids[0], "base_price_naira": 1}, {"id": foreign_id, "base_price_naira": 1}]},
+        )
+        assert cross_tenant.status_code == 404
+        assert client.get("/api/v1/products").json()[-1]["base_price_kobo"] == 100000
+
+        with QueryCounter(engine) as counter:
+            res = client.patch(
+                "/api/v1/products",
+                json={
+                    "items": [
+                        {"id": ids[0], "base_price_naira": 1200},
+                        {"id": ids[1], "base_price_naira": 1300},
+                        {"id": ids[2], "price_change_percent": 15},
+                        {"id": ids[3], "is_active": False},
+                    ]
+                },
+            )
+        assert res.status_code == 200
+        # Existence check, one executemany UPDATE, the percent UPDATE, the
+        # is_active UPDATE and the re-select.
+        assert counter.count <= 6
+        prices = {product["id"]: product["base_price_kobo"] for product in res.json()}
+        assert prices == {ids[0]: 120000, ids[1]: 130000, ids[2]: 115000, ids[3]: 100000}
+        assert [product["is_active"] for product in res.json()] == [False, True, True, True]
+
+        listed = client.get("/api/v1/products").json()
+        assert {product["id"] for product in listed} == set(ids[:3])
+
+        hidden = client.patch("/api/v1/products", json={"items": [{"id": ids[3], "name": "Still hidden"}]})
+        assert hidden.status_code == 404
+
+        duplicate = client.patch("/api/v1/products", json={"items": [{"id": ids[0]}, {"id": ids[0]}]})
+        assert duplicate.status_code == 400
+
+    app.dependency_overrides.clear()
@@ -0,0 +1,126 @@
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+pytest.importorskip("sqlalchemy")
+pytest.importorskip("sqlmodel")
+
+from sqlalchemy import insert, text
+
+from app.models.business import Business
+from app.models.customer import Customer
+from app.models.delivery_zone import DeliveryZone
+from app.models.order import Order
+from app.models.product import Product
+from app.repositories.delivery_repo import _active_delivery_zones_statement
+from app.repositories.order_repo import _overdue_reservations_statement
+from app.repositories.product_repo import _active_products_statement
+from tests.db_test_utils import create_test_engine
+
+LISTING_QUERIES = [
+    ("ix_product_business_active_id", _active_products_statement),
+    ("ix_delivery_zone_business_active_id", _active_delivery_zones_statement),
+]
+
+
+def _seed_catalogs(engine) -> None:
+    # Planners pick indexes from statistics, so give them a realistic shape:
+    # several tenants, each with a mix of active and soft-deleted rows.
+    created_at = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    businesses = [
+        {"id": business_id, "name": f"Biz {business_id}", "store_code": f"B{business_id}", "created_at": created_at}
+        for business_id in range(1, 21)
+    ]
+    products = [
+        {
+            "business_id": index % 20 + 1,
+            "name": f"Product {index}",
+            "base_price_kobo": 100,
+            "is_active": index % 3 != 0,
+            "created_at": created_at,
+        }
+        for index in range(4000)
+    ]
+    zones = [
+        {"business_id": index % 20 + 1, "name": f"Zone {index}", "fee_kobo": 100, "is_active": index % 3 != 0}
+        for index in range(1000)
+    ]
+    with engine.begin() as connection:
+        connection.execute(insert(Business).values(currency="NGN"), businesses)
+        connection.execute(insert(Product), products)
+        connection.execute(insert(DeliveryZone), zones)
+        connection.exec_driver_sql("ANALYZE")
+
+
+def _plan_nodes(plan: dict) -> list[dict]:
+    nodes = [plan]
+    for child in plan.get("Plans", []):
+        nodes.extend(_plan_nodes(child))
+    return nodes
+
+
+def _explain(connection, statement) -> tuple[list[str], list[str]]:
+    """Return (indexes used, sort steps) for a statement on the current dialect."""
+    sql = str(statement.compile(connection, compile_kwargs={"literal_binds": True}))
+    if connection.dialect.name == "sqlite":
+        details = [row[3] for row in connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}")]
+        return details, [detail for detail in details if "TEMP B-TREE" in detail]
+
+    # Tiny test tables would otherwise always get a sequential scan.
+    connection.execute(text("SET LOCAL enable_seqscan = off"))
+    plan = connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {sql}").scalar_one()
+    nodes = _plan_nodes((json.loads(plan) if isinstance(plan, str) else plan)[0]["Plan"])
+    used = [f"{node['Node Type']} {node.get('Index Name', '')}" for node in nodes]
+    return used, [node["Node Type"] for node in nodes if node["Node Type"] in ("Sort", "Incremental Sort")]
+
+
+@pytest.mark.parametrize("index_name, statement_factory", LISTING_QUERIES)
+@pytest.mark.parametrize("before_id, limit", [(None, None), (None, 51), (500, 51)])
+def test_listing_queries_range_scan_partial_index_without_sort(index_name, statement_factory, before_id, limit) -> None:
+    engine = create_test_engine()
+    _seed_catalogs(engine)
+
+    with engine.begin() as connection:
+        used, sorts = _explain(connection, statement_factory(7, before_id, limit))
+
+    assert any(index_name in step for step in used), used
+    assert sorts == []
+
+
+def test_expiry_sweep_walks_status_expires_at_index_without_sort() -> None:
+    engine = create_test_engine()
+    _seed_catalogs(engine)
+    created_at = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    statuses = ("reserved", "paid", "expired", "expired")
+    with engine.begin() as connection:
+        connection.execute(
+            insert(Customer),
+            [{"business_id": 1, "channel_type": "telegram", "channel_user_id": "tg-1", "created_at": created_at}],
+        )
+        connection.execute(
+            insert(Order),
+            [
+                {
+                    "business_id": 1,
+                    "customer_id": 1,
+                    "channel_type": "telegram",
+                    "status": statuses[index % len(statuses)],
+                    "subtotal_kobo": 100,
+                    "delivery_fee_kobo": 0,
+                    "total_kobo": 100,
+                    "platform_fee_kobo": 2,
+                    "business_payout_kobo": 98,
+                    "expires_at": created_at + timedelta(minutes=index),
+                    "created_at": created_at,
+                }
+                for index in range(4000)
+            ],
+        )
+        connection.exec_driver_sql("ANALYZE")
+
+    with engine.begin() as connection:
+        used, sorts = _explain(connection, _overdue_reservations_statement(created_at + timedelta(days=1), 500))
+
+    assert any("ix_order_status_expires_at" in step for step in used), used
+    assert sorts == []
@@ -0,0 +1,192 @@
+import threading
+from datetime import datetime, timezone
+
+import pytest
+
+pytest.importorskip("fastapi")
+pytest.importorskip("sqlmodel")
+pytest.importorskip("reportlab")
+
+from fastapi.testclient import TestClient
+from sqlmodel import Session, select
+
+from app.core.auth import get_current_business_id
+from app.core.config import get_settings
+from app.core.db import get_session
+from app.main import app
+from app.models.business import Business
+from app.models.customer import Customer
+from app.models.order import Order
+from app.models.order_item import OrderItem
+from app.models.payment import Payment
+from app.models.receipt import Receipt
+from app.models.webhook_event import WebhookEvent
+from app.services import receipt_service
+from app.services.receipt_service import (
+    ReceiptDocument,
+    ReceiptLine,
+    _business_layout,
+    render_receipt_pdf,
+    schedule_receipt,
+)
+from app.services.webhook_inbox_service import drain_webhook_inbox
+from tests.db_test_utils import create_test_engine
+
+PAID_AT = datetime(2026, 10, 18, 9, 30, tzinfo=timezone.utc)
+
+
+def _document(business_id: int = 1, lines: int = 3) -> ReceiptDocument:
+    return ReceiptDocument(
+        business_id=business_id,
+        business_name="Mama Put Kitchen & Small Chops",
+        store_code="MAMA1",
+        currency="NGN",
+        order_id=42,
+        receipt_number="RCP-MAMA1-00000042",
+        issued_at=PAID_AT,
+        payment_reference="ref-42",
+        lines=tuple(ReceiptLine(f"Jollof rice platter {index}", 2, 250000, 500000) for index in range(lines)),
+        subtotal_kobo=500000 * lines,
+        delivery_fee_kobo=150000,
+        total_kobo=500000 * lines + 150000,
+    )
+
+
+def _seed_order(engine, status: str = "paid", business_id: int = 1) -> int:
+    with Session(engine) as session:
+        if session.get(Business, 1) is None:
+            session.add(Business(id=1, name="Biz One", store_code="BIZ1"))
+            session.add(Business(id=2, name="Biz Two", store_code="BIZ2"))
+            session.add(Customer(id=1, business_id=1, channel_type="telegram", channel_user_id="tg-1"))
+            session.commit()
+        order = Order(
+            business_id=business_id,
+            customer_id=1,
+            channel_type="telegram",
+            status=status,
+            subtotal_kobo=360000,
+            delivery_fee_kobo=50000,
+            total_kobo=410000,
+            platform_fee_kobo=6150,
+            business_payout_kobo=403850,
+        )
+        session.add(order)
+        session.commit()
+        session.add(
+            OrderItem(order_id=order.id, name_snapshot="Cake", unit_price_kobo=180000, quantity=2, line_total_kobo=360000)
+        )
+        session.add(
+            Payment(
+                order_id=order.id,
+                amount_kobo=410000,
+                paystack_reference=f"ref-{order.id}",
+                status="success" if status == "paid" else "initiated",
+                confirmed_at=PAID_AT if status == "paid" else None,
+            )
+        )
+        session.commit()
+        return order.id
+
+
+def _receipts(engine) -> list[Receipt]:
+    with Session(engine) as session:
+        return list(session.exec(select(Receipt)).all())
+
+
+def test_render_is_stable_and_reuses_the_business_layout() -> None:
+    _business_layout.cache_clear()
+
+    first = render_receipt_pdf(_document())
+    assert first.startswith(b"%PDF-")
+    assert render_receipt_pdf(_document()) == first
+    assert _business_layout.cache_info().misses == 1
+    assert _business_layout.cache_info().hits == 1
+
+    # Long orders spill onto further pages instead of running off the bottom.
+    long_order = render_receipt_pdf(_document(lines=80))
+    assert long_order.count(b"/Type /Page\n") > 1
+
+
+def test_receipt_endpoint_renders_once_per_order(tmp_path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(get_settings(), "media_dir", str(tmp_path))
+    engine = create_test_engine()
+    paid = _seed_order(engine)
+    unpaid = _seed_order(engine, status="payment_pending")
+    other_tenant = _seed_order(engine, business_id=2)
+
+    def override_get_session():
+        with Session(engine) as session:
+            yield session
+
+    app.dependency_overrides[get_session] = override_get_session
+    app.dependency_overrides[get_current_business_id] = lambda: 1
+    with TestClient(app) as client:
+        first = client.get(f"/api/v1/receipts/{paid}")
+        assert first.status_code == 200
+        body = first.json()
+        assert body["receipt_number"] == f"RCP-BIZ1-{paid:08d}"
+        assert body["pdf_url"].startswith("/media/receipts/")
+        assert (tmp_path / body["pdf_url"].removeprefix("/media/")).read_bytes().startswith(b"%PDF-")
+
+        assert client.get(f"/api/v1/receipts/{paid}").json() == body
+        assert client.get(f"/api/v1/receipts/{unpaid}").status_code == 404
+        assert client.get(f"/api/v1/receipts/{other_tenant}").status_code == 404
+    app.dependency_overrides.clear()
+
+    assert len(_receipts(engine)) == 1
+
+
+def test_drained_payment_schedules_receipt_off_the_transaction(tmp_path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(get_settings(), "media_dir", str(tmp_path))
+    engine = create_test_engine()
+    order_id = _seed_order(engine, status="payment_pending")
+    with Session(engine) as session:
+        session.add(
+            WebhookEvent(
+                provider="paystack",
+                event_key=f"charge.success:ref-{order_id}",
+                event_type="charge.success",
+                reference=f"ref-{order_id}",
+                payload=f'{{"event":"charge.success","data":{{"reference":"ref-{order_id}","amount":410000}}}}',
+                status="pending",
+                attempts=0,
+                available_at=PAID_AT,
+            )
+        )
+        session.commit()
+
+    saved_on = []
+    save = receipt_service.save_rendered_receipt
+
+    def save_and_note_thread(session, document, pdf_bytes):
+        saved_on.append(threading.current_thread().name)
+        return save(session, document, pdf_bytes)
+
+    monkeypatch.setattr(receipt_service, "save_rendered_receipt", save_and_note_thread)
+    futures = []
+
+    def on_paid(paid_order_id: int) -> None:
+        # The payment is committed before follow-up work runs.
+        with Session(engine) as check:
+            assert check.get(Order, paid_order_id).status == "paid"
+        futures.append(schedule_receipt(lambda: Session(engine), paid_order_id))
+
+    with Session(engine) as session:
+        result = drain_webhook_inbox(
+            session,
+            worker="w1",
+            batch_size=10,
+            lock_seconds=60,
+            max_attempts=3,
+            on_paid=on_paid,
+        )
+    assert result.applied == 1
+
+    assert futures[0].result(timeout=60) == f"RCP-BIZ1-{order_id:08d}"
+    # Stored on its own threads, never on the process pool's result thread.
+    assert [name.split("_")[0] for name in saved_on] == ["receipt-store"]
+    [receipt] = _receipts(engine)
+    assert receipt.order_id == order_id
+    assert (tmp_path / receipt.pdf_url.removeprefix("/media/")).is_file()
+    # Already issued: nothing more to schedule.
+    assert schedule_receipt(lambda: Session(engine), order_id) is None
@@ -0,0 +1,112 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from threading import Event
+
+import pytest
+
+pytest.importorskip("fastapi")
+pytest.importorskip("sqlmodel")
+pytest.importorskip("jose")
+pytest.importorskip("passlib")
+
+from fastapi.testclient import TestClient
+from jose import jwt
+from sqlmodel import Session
+
+from app.core import security
+from app.core.config import get_settings
+from app.core.db import get_session
+from app.core.errors import AuthError, ServiceUnavailableError
+from app.core.executors import BoundedExecutor
+from app.main import app
+from tests.db_test_utils import create_test_engine
+
+
+def test_bounded_executor_fails_fast_when_saturated() -> None:
+    release = Event()
+    executor = BoundedExecutor(ThreadPoolExecutor(max_workers=1), max_workers=1, max_pending=1, name="Test pool")
+
+    first = executor.submit(release.wait)
+    second = executor.submit(release.wait)
+    with pytest.raises(ServiceUnavailableError):
+        executor.submit(release.wait)
+    assert executor.rejected == 1
+
+    release.set()
+    first.result(timeout=5)
+    second.result(timeout=5)
+    assert executor.submit(lambda: "ok").result(timeout=5) == "ok"
+    executor.shutdown()
+
+
+def test_login_returns_503_when_password_pool_is_saturated(monkeypatch: pytest.MonkeyPatch) -> None:
+    engine = create_test_engine()
+
+    def override_get_session():
+        with Session(engine) as session:
+            yield session
+
+    app.dependency_overrides[get_session] = override_get_session
+
+    with TestClient(app) as client:
+        client.post(
+            "/api/v1/auth/register",
+            json={
+                "business_name": "Blessing Cakes",
+                "store_code": "BLESSING",
+                "email": "owner@example.com",
+                "password": "secret123",
+            },
+        )
+
+        release = Event()
+        saturated = BoundedExecutor(ThreadPoolExecutor(max_workers=1), max_workers=1, max_pending=0, name="Password service")
+        blocker = saturated.submit(release.wait)
+        monkeypatch.setattr(security, "get_password_executor", lambda: saturated)
+
+        response = client.post("/api/v1/auth/login", json={"email": "owner@example.com", "password": "secret123"})
+        assert response.status_code == 503
+        assert response.json()["error"]["code"] == "SERVICE_UNAVAILABLE"
+
+        release.set()
+        blocker.result(timeout=5)
+        saturated.shutdown()
+
+    app.dependency_overrides.clear()
+
+
+def test_decode_access_token_serves_repeat_tokens_from_cache() -> None:
+    token = security.create_access_token(user_id=7, business_id=3)
+
+    first = security.decode_access_token(token)
+    second = security.decode_access_token(token)
+
+    assert first == second
+    assert second["business_id"] == 3
+    assert security.token_cache.stats()["hits"] == 1
+
+    second["business_id"] = 99
+    assert security.decode_access_token(token)["business_id"] == 3
+
+
+def test_cached_token_expires_with_the_token() -> None:
+    payload = {"user_id": 7, "business_id": 3, "exp": datetime.now(timezone.utc) + timedelta(seconds=1)}
+    token = jwt.encode(payload, get_settings().jwt_secret, algorithm="HS256")
+
+    assert security.decode_access_token(token)["user_id"] == 7
+    time.sleep(2.1)
+    with pytest.raises(AuthError):
+        security.decode_access_token(token)
+
+
+def test_token_cache_flushed_when_jwt_secret_changes(monkeypatch: pytest.MonkeyPatch) -> None:
+    token = security.create_access_token(user_id=7, business_id=3)
+    security.decode_access_token(token)
+
+    rotated = get_settings().model_copy(update={"jwt_secret": "rotated-secret"})
+    monkeypatch.setattr(security, "get_settings", lambda: rotated)
+
+    with pytest.raises(AuthError):
+        security.decode_access_token(token)
+    assert len(security.token_cache) == 0
@@ -0,0 +1,128 @@
+import base64
+import json
+import socket
+
+import pytest
+
+pytest.importorskip("fastapi")
+pytest.importorskip("sqlmodel")
+pytest.importorskip("boto3")
+moto_server = pytest.importorskip("moto.server")
+requests = pytest.importorskip("requests")
+
+import boto3
+from fastapi.testclient import TestClient
+from sqlmodel import Session, select
+
+from app.core.auth import get_current_business_id
+from app.core.config import get_settings
+from app.core.db import get_session
+from app.main import app
+from app.models.business import Business
+from app.models.media_blob import MediaBlob
+from tests.db_test_utils import create_test_engine
+
+PNG_BYTES = b"\x89PNG\r\n\x1a\n" + b"\x01" * 256
+BUCKET = "trolipay-media"
+
+
+@pytest.fixture
+def s3_endpoint(monkeypatch: pytest.MonkeyPatch):
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+    server = moto_server.ThreadedMotoServer(ip_address="127.0.0.1", port=port, verbose=False)
+    server.start()
+    endpoint = f"http://127.0.0.1:{port}"
+
+    settings = get_settings()
+    monkeypatch.setattr(settings, "storage_backend", "s3")
+    monkeypatch.setattr(settings, "r2_bucket_name", BUCKET)
+    monkeypatch.setattr(settings, "r2_endpoint_url", endpoint)
+    monkeypatch.setattr(settings, "r2_access_key_id", "test")
+    monkeypatch.setattr(settings, "r2_secret_access_key", "test")
+    monkeypatch.setattr(settings, "media_public_base_url", "https://cdn.example.test")
+    monkeypatch.setattr(settings, "max_upload_bytes", 4096)
+    s3 = boto3.client(
+        "s3",
+        endpoint_url=endpoint,
+        aws_access_key_id="test",
+        aws_secret_access_key="test",
+        region_name="us-east-1",
+    )
+    s3.create_bucket(Bucket=BUCKET)
+    yield s3
+    server.stop()
+
+
+def _keys(s3) -> list[str]:
+    return sorted(item["Key"] for item in s3.list_objects_v2(Bucket=BUCKET).get("Contents", []))
+
+
+def test_presigned_direct_upload_is_verified_and_deduplicated(s3_endpoint) -> None:
+    s3 = s3_endpoint
+    engine = create_test_engine()
+    with Session(engine) as session:
+        session.add(Business(id=1, name="Biz One", store_code="BIZ1"))
+        session.add(Business(id=2, name="Biz Two", store_code="BIZ2"))
+        session.commit()
+
+    def override_get_session():
+        with Session(engine) as session:
+            yield session
+
+    app.dependency_overrides[get_session] = override_get_session
+    app.dependency_overrides[get_current_business_id] = lambda: 1
+
+    with TestClient(app) as client:
+        image_urls = []
+        for _ in range(2):
+            presign = client.post("/api/v1/uploads/product-image/presign").json()
+            assert presign["key"].startswith("incoming/1/products/")
+            uploaded = requests.post(presign["url"], data=presign["fields"], files={"file": ("a.png", PNG_BYTES)})
+            assert uploaded.status_code in (200, 204)
+
+            app.dependency_overrides[get_current_business_id] = lambda: 2
+            assert client.post("/api/v1/uploads/product-image/complete", json={"key": presign["key"]}).status_code == 404
+            app.dependency_overrides[get_current_business_id] = lambda: 1
+
+            complete = client.post("/api/v1/uploads/product-image/complete", json={"key": presign["key"]})
+            assert complete.status_code == 200
+            image_urls.append(complete.json()["image_url"])
+
+        assert image_urls[0] != image_urls[1]
+        assert all(url.startswith("https://cdn.example.test/products/") for url in image_urls)
+        keys = _keys(s3)
+        assert [key for key in keys if key.startswith("incoming/")] == []
+        assert len([key for key in keys if key.startswith("blobs/")]) == 1
+        alias_key = image_urls[0].removeprefix("https://cdn.example.test/")
+        assert s3.get_object(Bucket=BUCKET, Key=alias_key)["Body"].read() == PNG_BYTES
+
+        # Type is checked on the stored bytes, not on what the client claimed.
+        presign = client.post("/api/v1/uploads/product-image/presign").json()
+        requests.post(presign["url"], data=presign["fields"], files={"file": ("evil.png", b"<script></script>")})
+        rejected = client.post("/api/v1/uploads/product-image/complete", json={"key": presign["key"]})
+        assert rejected.status_code == 400
+        assert presign["key"] not in _keys(s3)
+
+        # The presigned POST carries a content-length-range condition for real
+        # buckets; completion re-checks the size in case the store ignores it.
+        presign = client.post("/api/v1/uploads/product-image/presign").json()
+        policy = json.loads(base64.b64decode(presign["fields"]["policy"]))
+        assert ["content-length-range", 1, 4096] in policy["conditions"]
+        requests.post(presign["url"], data=presign["fields"], files={"file": ("big.png", PNG_BYTES + b"\x00" * 8192)})
+        too_big = client.post("/api/v1/uploads/product-image/complete", json={"key": presign["key"]})
+        assert too_big.status_code == 413
+        assert presign["key"] not in _keys(s3)
+
+    app.dependency_overrides.clear()
+    with Session(engine) as session:
+        assert list(session.exec(select(MediaBlob.ref_count)).all()) == [2]
+
+
+def test_local_backend_refuses_presigned_uploads() -> None:
+    app.dependency_overrides[get_current_business_id] = lambda: 1
+    with TestClient(app) as client:
+        response = client.post("/api/v1/uploads/product-image/presign")
+        assert response.status_code == 400
+    app.dependency_overrides.clear()
@@ -0,0 +1,286 @@
+import hashlib
+import hmac
+import json
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+pytest.importorskip("fastapi")
+pytest.importorskip("sqlmodel")
+
+from fastapi.testclient import TestClient
+from sqlmodel import Session, select
+
+from app.core.auth import get_current_business_id
+from app.core.config import get_settings
+from app.core.db import get_session
+from app.main import app
+from app.models.business import Business
+from app.models.customer import Customer
+from app.models.order import Order
+from app.models.payment import Payment
+from app.models.payout_profile import PayoutProfile
+from app.models.product import Product
+from app.models.receipt import Receipt
+from app.models.webhook_event import WebhookEvent
+from app.repositories.webhook_event_repo import claim_webhook_events
+from app.services import paystack_service
+from app.services.webhook_inbox_service import drain_webhook_inbox, seed_known_events
+from tests.db_test_utils import QueryCounter, create_test_engine
+from tests.paystack_stub import PaystackStub
+
+SECRET = "sk_test_webhook"
+
+
+def _signed(payload: dict) -> tuple[bytes, dict[str, str]]:
+    body = json.dumps(payload, separators=(",", ":")).encode()
+    signature = hmac.new(SECRET.encode(), body, hashlib.sha512).hexdigest()
+    return body, {"x-paystack-signature": signature, "content-type": "application/json"}
+
+
+def _charge(reference: str, amount_kobo: int, **extra) -> dict:
+    return {"event": "charge.success", "data": {"reference": reference, "amount": amount_kobo, **extra}}
+
+
+def _seed_payment(engine, reference: str, amount_kobo: int) -> int:
+    with Session(engine) as session:
+        if session.get(Business, 1) is None:
+            session.add(Business(id=1, name="Biz One", store_code="BIZ1"))
+            session.add(Customer(id=1, business_id=1, channel_type="telegram", channel_user_id="tg-1"))
+            session.commit()
+        order = Order(
+            business_id=1,
+            customer_id=1,
+            channel_type="telegram",
+            status="payment_pending",
+            subtotal_kobo=amount_kobo,
+            delivery_fee_kobo=0,
+            total_kobo=amount_kobo,
+            platform_fee_kobo=0,
+            business_payout_kobo=amount_kobo,
+        )
+        session.add(order)
+        session.commit()
+        session.add(Payment(order_id=order.id, amount_kobo=amount_kobo, paystack_reference=reference))
+        session.commit()
+        return order.id
+
+
+@pytest.fixture
+def inbox_client(monkeypatch):
+    monkeypatch.setattr(get_settings(), "paystack_secret_key", SECRET)
+    engine = create_test_engine()
+
+    def override_get_session():
+        with Session(engine) as session:
+            yield session
+
+    app.dependency_overrides[get_session] = override_get_session
+    with TestClient(app) as client:
+        # Requests only store events; these tests drain the inbox themselves.
+        # Set after startup so no background workers attach to the app's engine.
+        monkeypatch.setattr(get_settings(), "webhook_inbox_enabled", True)
+        yield client, engine
+    app.dependency_overrides.clear()
+
+
+def test_webhook_verifies_raw_body_and_stores_each_event_once(inbox_client) -> None:
+    client, engine = inbox_client
+    body, headers = _signed(_charge("ref-1", 500000))
+
+    assert client.post("/api/v1/webhooks/paystack", content=body).status_code == 401
+    tampered = body.replace(b"500000", b"500001")
+    assert client.post("/api/v1/webhooks/paystack", content=tampered, headers=headers).status_code == 401
+
+    with QueryCounter(engine) as counter:
+        response = client.post("/api/v1/webhooks/paystack", content=body, headers=headers)
+    assert response.status_code == 200
+    assert response.json() == {"ok": True}
+    assert counter.count == 1  # the conditional insert; no payment or order lookups
+
+    # Paystack redeliveries may be re-serialized; the event/reference key still matches.
+    redelivered, redelivered_headers = _signed(_charge("ref-1", 500000, paid_at="2026-10-18T12:00:00Z"))
+    assert client.post("/api/v1/webhooks/paystack", content=redelivered, headers=redelivered_headers).status_code == 200
+
+    with Session(engine) as session:
+        events = session.exec(select(WebhookEvent)).all()
+    assert [(event.event_key, event.status, event.payload) for event in events] == [
+        ("charge.success:ref-1", "pending", body.decode())
+    ]
+
+
+def test_drain_applies_events_at_least_once_and_idempotently(inbox_client) -> None:
+    client, engine = inbox_client
+    paid_order = _seed_payment(engine, "ref-paid", 500000)
+    _seed_payment(engine, "ref-short", 500000)
+    for payload in (
+        _charge("ref-paid", 500000),
+        _charge("ref-short", 100),
+        _charge("ref-unknown", 700000),
+        {"event": "transfer.success", "data": {"reference": "tr-1"}},
+    ):
+        body, headers = _signed(payload)
+        assert client.post("/api/v1/webhooks/paystack", content=body, headers=headers).status_code == 200
+
+    now = datetime.now(timezone.utc)
+    with Session(engine) as session:
+        result = drain_webhook_inbox(session, worker="w1", batch_size=10, lock_seconds=60, max_attempts=2, now=now)
+    assert (result.claimed, result.applied, result.retried, result.failed) == (4, 1, 1, 1)
+
+    with Session(engine) as session:
+        payment = session.exec(select(Payment).where(Payment.paystack_reference == "ref-paid")).one()
+        assert payment.status == "success"
+        assert payment.confirmed_at is not None
+        assert session.get(Order, paid_order).status == "paid"
+        short = session.exec(select(Payment).where(Payment.paystack_reference == "ref-short")).one()
+        assert short.status == "initiated"
+        events = {event.reference: event for event in session.exec(select(WebhookEvent)).all()}
+    assert len(events) == 4
+    assert events["ref-paid"].status == "done"
+    assert events["tr-1"].status == "done"
+    assert events["ref-short"].status == "failed"
+    assert events["ref-unknown"].status == "pending"
+
+    # The payment for the early event lands; the retry is not due yet, then succeeds.
+    _seed_payment(engine, "ref-unknown", 700000)
+    with Session(engine) as session:
+        assert drain_webhook_inbox(session, "w1", 10, 60, 2, now=now).claimed == 0
+        retry = drain_webhook_inbox(session, "w1", 10, 60, 2, now=now + timedelta(seconds=2))
+    assert (retry.claimed, retry.applied) == (1, 1)
+
+
+def test_lapsed_claim_is_redelivered_to_another_worker(inbox_client) -> None:
+    client, engine = inbox_client
+    order_id = _seed_payment(engine, "ref-1", 500000)
+    body, headers = _signed(_charge("ref-1", 500000))
+    client.post("/api/v1/webhooks/paystack", content=body, headers=headers)
+    now = datetime.now(timezone.utc)
+
+    # w1 claims the event and dies before applying it.
+    with Session(engine) as session:
+        claimed = claim_webhook_events(
+            session, "w1", now=now, locked_until=now + timedelta(seconds=60), limit=10
+        )
+        session.commit()
+    assert len(claimed) == 1
+
+    with Session(engine) as session:
+        assert drain_webhook_inbox(session, "w2", 10, 60, 5, now=now + timedelta(seconds=30)).claimed == 0
+        late = drain_webhook_inbox(session, "w2", 10, 60, 5, now=now + timedelta(seconds=61))
+    assert (late.claimed, late.applied) == (1, 1)
+
+    with Session(engine) as session:
+        event = session.exec(select(WebhookEvent)).one()
+        assert (event.status, event.attempts) == ("done", 2)
+        assert session.get(Order, order_id).status == "paid"
+
+
+def test_known_events_are_acknowledged_without_the_database(inbox_client) -> None:
+    client, engine = inbox_client
+    _seed_payment(engine, "ref-settled", 500000)
+    with Session(engine) as session:
+        payment = session.exec(select(Payment)).one()
+        payment.status = "success"
+        session.add(payment)
+        session.commit()
+        assert seed_known_events(session) == 1
+
+    settled, settled_headers = _signed(_charge("ref-settled", 500000))
+    fresh, fresh_headers = _signed(_charge("ref-fresh", 500000))
+    with QueryCounter(engine) as counter:
+        assert client.post("/api/v1/webhooks/paystack", content=settled, headers=settled_headers).status_code == 200
+    assert counter.count == 0
+
+    with QueryCounter(engine) as counter:
+        for _ in range(3):
+            assert client.post("/api/v1/webhooks/paystack", content=fresh, headers=fresh_headers).status_code == 200
+    assert counter.count == 1  # only the first delivery reaches the inbox
+
+    # The filter sits behind signature verification.
+    forged = {"x-paystack-signature": "0" * 128}
+    assert client.post("/api/v1/webhooks/paystack", content=settled, headers=forged).status_code == 401
+
+    with Session(engine) as session:
+        assert [event.reference for event in session.exec(select(WebhookEvent)).all()] == ["ref-fresh"]
+
+
+def test_default_settings_settle_a_payment_end_to_end(tmp_path, monkeypatch) -> None:
+    pytest.importorskip("reportlab")
+    settings = get_settings()
+    assert settings.webhook_inbox_enabled is False
+    engine = create_test_engine()
+    with Session(engine) as session:
+        session.add(Business(id=1, name="Biz One", store_code="BIZ1"))
+        session.add(Product(id=1, business_id=1, name="Cake", base_price_kobo=1800000))
+        session.add(
+            PayoutProfile(
+                business_id=1,
+                bank_name="058",
+                account_number="0123456789",
+                account_name="Biz One",
+                paystack_subaccount_code="ACCT_biz1",
+                status="active",
+            )
+        )
+        session.commit()
+
+    def override_get_session():
+        with Session(engine) as session:
+            yield session
+
+    with PaystackStub(secret_key=SECRET) as stub:
+        monkeypatch.setattr(settings, "paystack_base_url", stub.base_url)
+        monkeypatch.setattr(settings, "paystack_secret_key", SECRET)
+        monkeypatch.setattr(settings, "media_dir", str(tmp_path))
+        monkeypatch.setattr(paystack_service, "_client", None)
+        app.dependency_overrides[get_session] = override_get_session
+        app.dependency_overrides[get_current_business_id] = lambda: 1
+        with TestClient(app) as client:
+            reserve = {
+                "channel_type": "telegram",
+                "channel_user_id": "tg-42",
+                "items": [{"product_id": 1, "quantity": 1}],
+            }
+            order = client.post("/api/v1/orders/reserve", json=reserve).json()
+            link = client.post(f"/api/v1/orders/{order['order_id']}/pay").json()
+            # Not applicable yet: kept in the inbox, and Paystack is asked to redeliver.
+            early, early_headers = _signed(_charge("ref-not-yet", 500000))
+            assert client.post("/api/v1/webhooks/paystack", content=early, headers=early_headers).status_code == 503
+            body, headers = _signed(_charge(link["reference"], order["total_kobo"]))
+            assert client.post("/api/v1/webhooks/paystack", content=body, headers=headers).status_code == 200
+        app.dependency_overrides.clear()
+
+    with Session(engine) as session:
+        assert session.get(Order, order["order_id"]).status == "paid"
+        assert session.exec(select(Payment)).one().status == "success"
+        events = {event.reference: event.status for event in session.exec(select(WebhookEvent)).all()}
+        assert events == {"ref-not-yet": "pending", link["reference"]: "done"}
+    deadline = time.monotonic() + 60
+    receipt = None
+    while receipt is None and time.monotonic() < deadline:
+        with Session(engine) as session:
+            receipt = session.exec(select(Receipt).where(Receipt.order_id == order["order_id"])).first()
+        time.sleep(0.05)
+    assert receipt is not None and (tmp_path / receipt.pdf_url.removeprefix("/media/")).is_file()
+
+
+def test_events_without_a_reference_are_not_collapsed(inbox_client) -> None:
+    client, engine = inbox_client
+    deliveries = [
+        {"event": "subscription.create", "data": {"id": 11, "status": "active"}},
+        {"event": "subscription.create", "data": {"id": 12, "status": "active"}},
+        {"event": "subscription.create", "data": {"id": 12, "status": "active", "retried": True}},
+        {"event": "customeridentification.failed", "data": {"email": "a@example.com"}},
+        {"event": "customeridentification.failed", "data": {"email": "b@example.com"}},
+    ]
+    for payload in deliveries:
+        body, headers = _signed(payload)
+        assert client.post("/api/v1/webhooks/paystack", content=body, headers=headers).status_code == 200
+
+    with Session(engine) as session:
+        keys = sorted(event.event_key for event in session.exec(select(WebhookEvent)).all())
+    assert len(keys) == 4
+    assert all(key.startswith("customeridentification.failed:sha256:") for key in keys[:2])
+    # The same Paystack id is one event, however it was re-serialized.
+    assert keys[2:] == ["subscription.create:id:11", "subscription.create:id:12"]